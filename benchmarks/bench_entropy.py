@@ -0,0 +1,135 @@
+"""
+Cost of entropy scoring on a 10k-pod k8s_list output.
+
+    python benchmarks/bench_entropy.py [--pods 10000] [--repeat 3]
+
+Scores every base64-like candidate of the serialized list with the previous
+O(n*k) scorer ("legacy"), the histogram scorer without its cache, and the
+current check (distinct-character bound + memoized histogram scorer), then
+times a full redaction pass over the text with the legacy and current checks.
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import sanitize
+from sanitize import BASE64_RE
+
+
+def legacy_entropy(s: str) -> float:
+    probs = [s.count(c) / len(s) for c in set(s)]
+    return -sum(p * math.log2(p) for p in probs)
+
+
+def legacy_high_entropy(val: str) -> bool:
+    return len(val) >= 20 and legacy_entropy(val) > 4.0
+
+
+def make_pod_list(pods: int, seed: int = 0) -> str:
+    rnd = random.Random(seed)
+    hexdigits = "0123456789abcdef"
+    alnum = "bcdfghjklmnpqrstvwxz2456789"
+    b64 = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+    checksums = ["".join(rnd.choice(b64) for _ in range(43)) + "=" for _ in range(20)]
+    images = [
+        f"registry.example.com/team/app-{i}@sha256:{''.join(rnd.choice(hexdigits) for _ in range(64))}"
+        for i in range(20)
+    ]
+    items = []
+    for i in range(pods):
+        rs_hash = "".join(rnd.choice(alnum) for _ in range(10))
+        suffix = "".join(rnd.choice(alnum) for _ in range(5))
+        image = rnd.choice(images)
+        items.append(
+            {
+                "apiVersion": "v1",
+                "kind": "Pod",
+                "metadata": {
+                    "name": f"app-{i % 20}-{rs_hash}-{suffix}",
+                    "namespace": "default",
+                    "labels": {"app": f"app-{i % 20}", "pod-template-hash": rs_hash},
+                    "annotations": {"checksum/config": checksums[i % 20]},
+                    "ownerReferences": [
+                        {
+                            "apiVersion": "apps/v1",
+                            "kind": "ReplicaSet",
+                            "name": f"app-{i % 20}-{rs_hash}",
+                            "uid": "%08x-%04x-%04x-%04x-%012x"
+                            % tuple(rnd.getrandbits(b) for b in (32, 16, 16, 16, 48)),
+                        }
+                    ],
+                },
+                "spec": {"containers": [{"name": "app", "image": image}], "nodeName": f"node-{i % 50}"},
+                "status": {
+                    "phase": "Running",
+                    "podIP": f"10.{i % 256}.{(i // 256) % 256}.{i % 199}",
+                    "containerStatuses": [
+                        {
+                            "name": "app",
+                            "image": image,
+                            "imageID": image,
+                            "containerID": "containerd://" + "".join(rnd.choice(hexdigits) for _ in range(64)),
+                            "ready": True,
+                            "restartCount": 0,
+                        }
+                    ],
+                },
+            }
+        )
+    return json.dumps({"apiVersion": "v1", "kind": "PodList", "items": items}, indent=2, sort_keys=True)
+
+
+def per_call(fn, candidates) -> float:
+    t0 = time.perf_counter()
+    for c in candidates:
+        fn(c)
+    return (time.perf_counter() - t0) / len(candidates) * 1e6
+
+
+def redact_time(text: str, check, repeat: int) -> float:
+    original = sanitize._high_entropy
+    sanitize._high_entropy = check
+    try:
+        best = float("inf")
+        for _ in range(repeat):
+            sanitize._entropy_memo.cache_clear()
+            t0 = time.perf_counter()
+            sanitize._redact(text)
+            best = min(best, time.perf_counter() - t0)
+        return best * 1000
+    finally:
+        sanitize._high_entropy = original
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pods", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    text = make_pod_list(args.pods)
+    candidates = BASE64_RE.findall(text)
+    distinct = len(set(candidates))
+    print(
+        f"{args.pods} pods, {len(text) / 1024 / 1024:.1f} MB JSON, "
+        f"{len(candidates)} candidates ({distinct} distinct), avg {sum(map(len, candidates)) / len(candidates):.0f} chars"
+    )
+
+    uncached = sanitize._entropy
+    sanitize._entropy_memo.cache_clear()
+    print(f"per call   legacy entropy    {per_call(legacy_entropy, candidates):7.2f} us")
+    print(f"per call   histogram entropy {per_call(uncached, candidates):7.2f} us")
+    print(f"per call   current check     {per_call(sanitize._high_entropy, candidates):7.2f} us")
+    print(f"           {sanitize._entropy_memo.cache_info()}")
+
+    print(f"redact     legacy check      {redact_time(text, legacy_high_entropy, args.repeat):7.1f} ms")
+    print(f"redact     current check     {redact_time(text, sanitize._high_entropy, args.repeat):7.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""
+Output bytes and prune time per pruning profile on realistic objects.
+
+    python benchmarks/bench_prune.py [--objects 200] [--repeat 5]
+
+The Deployment and Pod below are shaped like what an API server returns for
+a workload created with `kubectl apply`: defaulted pod-template fields,
+last-applied-configuration, managedFields, conditions, the projected
+service-account volume and the default tolerations. "full" is the pruning
+done before profiles existed.
+"""
+import argparse
+import copy
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from constants import PRUNE_PROFILES
+from sanitize import prune_k8s_object
+from serialize import dumps
+
+
+def _container(name: str, image: str, port: int) -> Dict[str, Any]:
+    probe = {
+        "httpGet": {"path": "/healthz", "port": port, "scheme": "HTTP"},
+        "timeoutSeconds": 1,
+        "periodSeconds": 10,
+        "successThreshold": 1,
+        "failureThreshold": 3,
+    }
+    return {
+        "name": name,
+        "image": image,
+        "imagePullPolicy": "IfNotPresent",
+        "ports": [{"name": "http", "containerPort": port, "protocol": "TCP"}],
+        "env": [{"name": "LOG_LEVEL", "value": "info"}, {"name": "PORT", "value": str(port)}],
+        "resources": {"requests": {"cpu": "100m", "memory": "128Mi"}, "limits": {"memory": "256Mi"}},
+        "livenessProbe": probe,
+        "readinessProbe": dict(probe),
+        "terminationMessagePath": "/dev/termination-log",
+        "terminationMessagePolicy": "File",
+    }
+
+
+def _pod_spec(app: str) -> Dict[str, Any]:
+    return {
+        "containers": [_container(app, f"registry.example.com/team/{app}:1.4.2", 8080)],
+        "restartPolicy": "Always",
+        "terminationGracePeriodSeconds": 30,
+        "dnsPolicy": "ClusterFirst",
+        "serviceAccountName": app,
+        "serviceAccount": app,
+        "securityContext": {},
+        "schedulerName": "default-scheduler",
+    }
+
+
+def _managed_fields(manager: str) -> List[Dict[str, Any]]:
+    return [
+        {
+            "manager": manager,
+            "operation": "Update",
+            "apiVersion": "apps/v1",
+            "time": "2024-05-01T12:00:00Z",
+            "fieldsType": "FieldsV1",
+            "fieldsV1": {
+                "f:metadata": {"f:annotations": {".": {}, "f:kubectl.kubernetes.io/last-applied-configuration": {}}},
+                "f:spec": {"f:replicas": {}, "f:selector": {}, "f:template": {"f:spec": {"f:containers": {}}}},
+            },
+        },
+        {
+            "manager": "kube-controller-manager",
+            "operation": "Update",
+            "apiVersion": "apps/v1",
+            "time": "2024-05-01T12:00:30Z",
+            "fieldsType": "FieldsV1",
+            "fieldsV1": {"f:status": {"f:conditions": {}, "f:readyReplicas": {}, "f:replicas": {}}},
+            "subresource": "status",
+        },
+    ]
+
+
+def make_deployment(i: int) -> Dict[str, Any]:
+    app = f"svc-{i}"
+    labels = {"app.kubernetes.io/name": app, "app.kubernetes.io/part-of": "shop"}
+    applied = {
+        "apiVersion": "apps/v1",
+        "kind": "Deployment",
+        "metadata": {"name": app, "namespace": "shop", "labels": labels},
+        "spec": {"replicas": 3, "selector": {"matchLabels": labels}, "template": {"metadata": {"labels": labels}, "spec": _pod_spec(app)}},
+    }
+    return {
+        "apiVersion": "apps/v1",
+        "kind": "Deployment",
+        "metadata": {
+            "name": app,
+            "namespace": "shop",
+            "uid": f"5e1d2c3b-0000-4000-8000-{i:012d}",
+            "resourceVersion": str(100000 + i),
+            "generation": 4,
+            "creationTimestamp": "2024-05-01T12:00:00Z",
+            "labels": labels,
+            "annotations": {
+                "deployment.kubernetes.io/revision": "4",
+                "kubectl.kubernetes.io/last-applied-configuration": json.dumps(applied, separators=(",", ":")) + "\n",
+            },
+            "managedFields": _managed_fields("kubectl-client-side-apply"),
+        },
+        "spec": {
+            "replicas": 3,
+            "selector": {"matchLabels": labels},
+            "template": {"metadata": {"creationTimestamp": None, "labels": labels}, "spec": _pod_spec(app)},
+            "strategy": {"type": "RollingUpdate", "rollingUpdate": {"maxUnavailable": "25%", "maxSurge": "25%"}},
+            "revisionHistoryLimit": 10,
+            "progressDeadlineSeconds": 600,
+        },
+        "status": {
+            "observedGeneration": 4,
+            "replicas": 3,
+            "updatedReplicas": 3,
+            "readyReplicas": 3,
+            "availableReplicas": 3,
+            "conditions": [
+                {
+                    "type": "Available",
+                    "status": "True",
+                    "lastUpdateTime": "2024-05-01T12:00:30Z",
+                    "lastTransitionTime": "2024-05-01T12:00:30Z",
+                    "reason": "MinimumReplicasAvailable",
+                    "message": "Deployment has minimum availability.",
+                },
+                {
+                    "type": "Progressing",
+                    "status": "True",
+                    "lastUpdateTime": "2024-05-01T12:00:30Z",
+                    "lastTransitionTime": "2024-05-01T12:00:00Z",
+                    "reason": "NewReplicaSetAvailable",
+                    "message": f'ReplicaSet "{app}-7d9f8b6c5" has successfully progressed.',
+                },
+            ],
+        },
+    }
+
+
+def make_pod(i: int) -> Dict[str, Any]:
+    app = f"svc-{i % 20}"
+    spec = _pod_spec(app)
+    spec["containers"][0]["volumeMounts"] = [
+        {"name": f"kube-api-access-{i:05d}", "readOnly": True, "mountPath": "/var/run/secrets/kubernetes.io/serviceaccount"}
+    ]
+    spec.update(
+        {
+            "nodeName": f"node-{i % 12}",
+            "enableServiceLinks": True,
+            "preemptionPolicy": "PreemptLowerPriority",
+            "priority": 0,
+            "tolerations": [
+                {"key": f"node.kubernetes.io/{t}", "operator": "Exists", "effect": "NoExecute", "tolerationSeconds": 300}
+                for t in ("not-ready", "unreachable")
+            ],
+            "volumes": [
+                {
+                    "name": f"kube-api-access-{i:05d}",
+                    "projected": {
+                        "defaultMode": 420,
+                        "sources": [
+                            {"serviceAccountToken": {"expirationSeconds": 3607, "path": "token"}},
+                            {"configMap": {"name": "kube-root-ca.crt", "items": [{"key": "ca.crt", "path": "ca.crt"}]}},
+                            {"downwardAPI": {"items": [{"path": "namespace", "fieldRef": {"apiVersion": "v1", "fieldPath": "metadata.namespace"}}]}},
+                        ],
+                    },
+                }
+            ],
+        }
+    )
+    conditions = [
+        {"type": t, "status": "True", "lastProbeTime": None, "lastTransitionTime": "2024-05-01T12:00:05Z"}
+        for t in ("PodReadyToStartContainers", "Initialized", "Ready", "ContainersReady", "PodScheduled")
+    ]
+    return {
+        "apiVersion": "v1",
+        "kind": "Pod",
+        "metadata": {
+            "name": f"{app}-7d9f8b6c5-{i:05d}",
+            "generateName": f"{app}-7d9f8b6c5-",
+            "namespace": "shop",
+            "uid": f"9a8b7c6d-0000-4000-8000-{i:012d}",
+            "resourceVersion": str(200000 + i),
+            "creationTimestamp": "2024-05-01T12:00:01Z",
+            "labels": {"app.kubernetes.io/name": app, "pod-template-hash": "7d9f8b6c5"},
+            "ownerReferences": [
+                {
+                    "apiVersion": "apps/v1",
+                    "kind": "ReplicaSet",
+                    "name": f"{app}-7d9f8b6c5",
+                    "uid": f"1f2e3d4c-0000-4000-8000-{i % 20:012d}",
+                    "controller": True,
+                    "blockOwnerDeletion": True,
+                }
+            ],
+            "managedFields": _managed_fields("kube-controller-manager"),
+        },
+        "spec": spec,
+        "status": {
+            "phase": "Running",
+            "conditions": conditions,
+            "hostIP": f"10.0.0.{i % 12}",
+            "podIP": f"10.1.{i // 256 % 256}.{i % 256}",
+            "startTime": "2024-05-01T12:00:01Z",
+            "qosClass": "Burstable",
+            "containerStatuses": [
+                {
+                    "name": app,
+                    "state": {"running": {"startedAt": "2024-05-01T12:00:04Z"}},
+                    "lastState": {},
+                    "ready": True,
+                    "restartCount": i % 3,
+                    "image": f"registry.example.com/team/{app}:1.4.2",
+                    "imageID": f"registry.example.com/team/{app}@sha256:{i:064x}",
+                    "containerID": f"containerd://{i:064x}",
+                    "started": True,
+                }
+            ],
+        },
+    }
+
+
+def _decoded(obj: Dict[str, Any]) -> Dict[str, Any]:
+    """Fresh containers throughout, as decoded from an API response."""
+    return json.loads(json.dumps(obj))
+
+
+def bench(objs: List[Dict[str, Any]], profile: str, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        pruned = [prune_k8s_object(o, profile) for o in objs]
+        best = min(best, time.perf_counter() - t0)
+    sizes = {fmt: len(dumps({"items": pruned}, fmt).encode("utf-8")) for fmt in ("json", "compact")}
+    return sizes, best / len(objs)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--objects", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for kind, make in (("Deployment", make_deployment), ("Pod", make_pod)):
+        objs = [_decoded(make(i)) for i in range(args.objects)]
+        before = copy.deepcopy(objs)
+        raw = len(dumps({"items": objs}, "json").encode("utf-8"))
+        print(f"{kind} x{args.objects}: unpruned {raw / args.objects:.0f} B/object (json)")
+        full = None
+        for profile in reversed(PRUNE_PROFILES):
+            sizes, per_obj = bench(objs, profile, args.repeat)
+            full = full or sizes
+            print(
+                f"  {profile:9s} json {sizes['json'] / args.objects:6.0f} B/object ({1 - sizes['json'] / full['json']:4.0%} less)"
+                f"   compact {sizes['compact'] / args.objects:6.0f} B/object ({1 - sizes['compact'] / full['compact']:4.0%} less)"
+                f"   {per_obj * 1e6:6.1f} us/object"
+            )
+        assert objs == before, "pruning modified its input"
+
+
+if __name__ == "__main__":
+    main()
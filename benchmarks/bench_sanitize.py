@@ -0,0 +1,96 @@
+"""
+Throughput of sanitize_output() on pod-log-sized inputs, in MB/s.
+
+    python benchmarks/bench_sanitize.py [--mb 4] [--repeat 5]
+
+"legacy" is the previous multi-pass implementation (one substitution per
+pattern over the full text, truncation last), kept here for comparison.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import sanitize
+from sanitize import BASE64_RE, MAX_LINES, REDACT_PATTERNS, _entropy, sanitize_output
+
+
+def legacy_sanitize_output(tool_name: str, raw: str) -> str:
+    text = raw
+    for regex, label in REDACT_PATTERNS:
+        text = regex.sub(f"[REDACTED: {label}]", text)
+
+    def redact_entropy(match):
+        val = match.group(0)
+        if _entropy(val) > 4.0:
+            return "[REDACTED: high-entropy]"
+        return val
+
+    text = BASE64_RE.sub(redact_entropy, text)
+    lines = text.splitlines()
+    if len(lines) > MAX_LINES:
+        lines = lines[:MAX_LINES]
+        lines.append("\n[Output truncated]")
+    return "\n".join(lines)
+
+
+def make_log(size_mb: float, seed: int = 0) -> str:
+    rnd = random.Random(seed)
+    alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+    templates = [
+        '2024-05-01T12:{m:02d}:{s:02d}.123Z INFO  http "GET /api/v1/items/{n} HTTP/1.1" 200 {n} "-" "kube-probe/1.29"',
+        "2024-05-01T12:{m:02d}:{s:02d}.456Z DEBUG worker-{n} processed batch id={n} in {n}ms (queue depth {m})",
+        "2024-05-01T12:{m:02d}:{s:02d}.789Z WARN  retrying connection to db-{m}.svc.cluster.local:5432 attempt={s}",
+        "2024-05-01T12:{m:02d}:{s:02d}.000Z INFO  request_id={hex} user=alice@example.com path=/healthz",
+    ]
+    secrets = [
+        "2024-05-01T12:{m:02d}:{s:02d}.111Z DEBUG auth header Bearer {b64}",
+        "2024-05-01T12:{m:02d}:{s:02d}.222Z ERROR bad config: password={b64}",
+        "2024-05-01T12:{m:02d}:{s:02d}.333Z TRACE payload {b64}{b64}",
+    ]
+    target = int(size_mb * 1024 * 1024)
+    lines, size = [], 0
+    while size < target:
+        tpl = rnd.choice(secrets) if rnd.random() < 0.02 else rnd.choice(templates)
+        line = tpl.format(
+            m=rnd.randrange(60),
+            s=rnd.randrange(60),
+            n=rnd.randrange(100000),
+            hex="%032x" % rnd.getrandbits(128),
+            b64="".join(rnd.choice(alphabet) for _ in range(32)),
+        )
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines)
+
+
+def bench(fn, text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn("k8s_pod_logs", text)
+        best = min(best, time.perf_counter() - t0)
+    return len(text.encode("utf-8")) / (1024 * 1024) / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mb", type=float, default=4.0, help="input size in MB")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    text = make_log(args.mb)
+    print(f"input: {args.mb:.1f} MB, {text.count(chr(10)) + 1} lines, MAX_LINES={MAX_LINES}")
+    for label, max_lines in (("truncated (default MAX_LINES)", MAX_LINES), ("full text (no truncation)", 10**9)):
+        sanitize.MAX_LINES = max_lines
+        globals()["MAX_LINES"] = max_lines
+        legacy = bench(legacy_sanitize_output, text, args.repeat)
+        current = bench(sanitize_output, text, args.repeat)
+        print(f"{label:32s} legacy {legacy:9.1f} MB/s   current {current:9.1f} MB/s   x{current / legacy:.1f}")
+
+
+if __name__ == "__main__":
+    main()
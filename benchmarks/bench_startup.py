@@ -0,0 +1,95 @@
+"""
+Server startup latency over the real MCP stdio transport.
+
+    python benchmarks/bench_startup.py [--runs 5] [--settle 2.0] [--target-ms 1000]
+
+Spawns `python server.py` repeatedly against an in-process fake API server
+and reports median times from spawn to the `initialize` reply, to the
+`list_tools` reply, and for the first k8s_get (issued --settle seconds after
+the handshake) with background pre-warm on and off. Also times a bare
+`import server`. Exits 1 when the median time to `initialize` exceeds
+--target-ms, so the startup budget is tracked alongside the other benchmarks.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_apiserver import Cluster, start, write_kubeconfig
+
+
+def time_import(runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "import server"], cwd=ROOT, check=True)
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1000
+
+
+async def one_session(env: Dict[str, str], settle: float) -> Dict[str, float]:
+    from mcp.client.session import ClientSession
+    from mcp.client.stdio import StdioServerParameters, stdio_client
+
+    params = StdioServerParameters(command=sys.executable, args=[os.path.join(ROOT, "server.py")], env=env, cwd=ROOT)
+    t0 = time.perf_counter()
+    with open(os.devnull, "w") as errlog:
+        async with stdio_client(params, errlog=errlog) as (read_stream, write_stream):
+            async with ClientSession(read_stream, write_stream) as session:
+                await session.initialize()
+                t_init = time.perf_counter() - t0
+                await session.list_tools()
+                t_list = time.perf_counter() - t0
+                await asyncio.sleep(settle)
+                t1 = time.perf_counter()
+                result = await session.call_tool(
+                    "k8s_get", {"namespace": "bench", "group": "", "version": "v1", "plural": "pods", "name": "pod-00000"}
+                )
+                t_call = time.perf_counter() - t1
+                assert not result.content[0].text.startswith(("ERROR", "BLOCKED")), result.content[0].text
+    return {"initialize_ms": t_init * 1000, "list_tools_ms": t_list * 1000, "first_call_ms": t_call * 1000}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--settle", type=float, default=2.0, help="seconds between handshake and first tool call")
+    parser.add_argument("--target-ms", type=float, default=1000.0, help="budget for spawn -> initialize (median)")
+    args = parser.parse_args()
+
+    httpd = start(Cluster(pods=100, crds=5, log_mb=1))
+    with tempfile.TemporaryDirectory(prefix="mcp-k8s-startup-") as tmp:
+        kubeconfig = os.path.join(tmp, "kubeconfig")
+        write_kubeconfig(kubeconfig, httpd.server_address[1])
+        base = {**os.environ, "KUBECONFIG": kubeconfig, "MCP_K8S_DISCOVERY_CACHE_DIR": os.path.join(tmp, "discovery")}
+
+        print(f"import server: {time_import(args.runs):.0f} ms (median of {args.runs})")
+        medians: Dict[str, Dict[str, float]] = {}
+        for label, prewarm in (("prewarm", "true"), ("no prewarm", "false")):
+            runs: List[Dict[str, float]] = [
+                asyncio.run(one_session({**base, "MCP_K8S_PREWARM": prewarm}, args.settle)) for _ in range(args.runs)
+            ]
+            medians[label] = {k: statistics.median(r[k] for r in runs) for k in runs[0]}
+    httpd.shutdown()
+
+    print(f"{'':12} {'initialize_ms':>14} {'list_tools_ms':>14} {'first_call_ms':>14}")
+    for label, m in medians.items():
+        print(f"{label:12} {m['initialize_ms']:14.0f} {m['list_tools_ms']:14.0f} {m['first_call_ms']:14.0f}")
+
+    init = medians["prewarm"]["initialize_ms"]
+    if init > args.target_ms:
+        print(f"FAIL: initialize took {init:.0f} ms, target {args.target_ms:.0f} ms")
+        sys.exit(1)
+    print(f"OK: initialize {init:.0f} ms <= target {args.target_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+"""
+End-to-end tool benchmarks against the local fake API server.
+
+    python benchmarks/bench_tools.py [--mode inproc|stdio|both] [--iterations 50] [--concurrency 1]
+        [--transport client|async] [--only list_pods,get_pod] [--json out.json]
+        [--compare baseline.json --tolerance 0.25]
+        [--pods 10000] [--crds 100] [--log-mb 1024] [--grep-mb 64]
+
+Starts benchmarks/fake_apiserver.py in a child process, points a temporary
+kubeconfig (and an empty discovery cache) at it, and drives each scenario
+through server.call_tool() in this process ("inproc") and/or through a
+`python server.py` child over the real MCP stdio transport ("stdio").
+For every scenario it reports p50/p95/p99 latency, calls per second, mean
+output bytes, peak RSS of the process serving the tools, and the number of
+BLOCKED/ERROR answers (which should be 0).
+
+--json writes the results; --compare checks them against an earlier --json
+file and exits 1 when a scenario's p50 or p95 got slower by more than
+--tolerance (and by more than 1 ms). Identical concurrent reads are
+coalesced by the server, so scenarios vary their target per iteration.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_apiserver import add_scale_args
+
+Scenario = Tuple[str, str, Callable[[int], Dict[str, Any]]]
+
+
+def scenarios(args: argparse.Namespace) -> List[Scenario]:
+    ns = args.namespace
+    pods = {"namespace": ns, "group": "", "version": "v1", "plural": "pods"}
+    apps = {"namespace": ns, "group": "apps", "version": "v1"}
+
+    def pod(i: int) -> str:
+        return f"pod-{i % args.pods:05d}"
+
+    def widgets(i: int) -> Dict[str, Any]:
+        return {"namespace": ns, "group": f"crd{i % args.crds}.bench.example.com", "version": "v1", "plural": "widgets"}
+
+    grep_bytes = int(min(args.grep_mb, args.log_mb) * 1024 * 1024)
+    return [
+        ("list_pods", "k8s_list", lambda i: {**pods, "limit": 500}),
+        ("list_pods_summary", "k8s_list", lambda i: {**pods, "limit": 500, "output": "summary"}),
+        ("list_pods_fields", "k8s_list", lambda i: {**pods, "limit": 500, "fields": ["metadata.name", "status.phase"]}),
+        ("get_pod", "k8s_get", lambda i: {**pods, "name": pod(i)}),
+        (
+            "batch_get_20",
+            "k8s_batch_get",
+            lambda i: {"targets": [{**pods, "name": pod(i * 20 + k)} for k in range(20)]},
+        ),
+        ("list_widgets", "k8s_list", lambda i: {**widgets(i), "limit": 100}),
+        ("get_widget", "k8s_get", lambda i: {**widgets(i), "name": "widget-0"}),
+        ("list_events", "k8s_list_events", lambda i: {"namespace": ns, "involved_name": pod(i)}),
+        ("events_aggregate", "k8s_list_events", lambda i: {"namespace": ns, "aggregate": True}),
+        ("pod_logs", "k8s_pod_logs", lambda i: {"namespace": ns, "pod": pod(i), "container": "app"}),
+        # No line matches: scans all of --grep-mb
+        (
+            "pod_logs_grep",
+            "k8s_pod_logs_grep",
+            lambda i: {"namespace": ns, "pod": pod(i), "container": "app", "pattern": "panic", "limit_bytes": grep_bytes},
+        ),
+        (
+            "workload_logs",
+            "k8s_workload_logs",
+            lambda i: {"namespace": ns, "kind": "Deployment", "name": f"deploy-{i % args.deployments}", "container": "app"},
+        ),
+        (
+            "patch_scale",
+            "k8s_patch",
+            lambda i: {**apps, "plural": "deployments", "name": f"deploy-{i % args.deployments}", "approved": True,
+                       "action": "scale", "replicas": 3, "reason": "benchmark"},
+        ),
+        ("delete_pod", "k8s_delete", lambda i: {**pods, "name": pod(i), "approved": True}),
+    ]
+
+
+# -----------------------------
+# Peak RSS (Linux /proc; 0 elsewhere)
+# -----------------------------
+def _reset_peak_rss(pid: int) -> None:
+    try:
+        with open(f"/proc/{pid}/clear_refs", "w") as f:
+            f.write("5")  # resets VmHWM
+    except OSError:
+        pass
+
+
+def _peak_rss_mb(pid: int) -> float:
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def _server_child_pid() -> Optional[int]:
+    """pid of the `server.py` child started by the stdio client."""
+    me = str(os.getpid())
+    for entry in os.listdir("/proc") if os.path.isdir("/proc") else []:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                ppid = f.read().rsplit(")", 1)[1].split()[1]
+            with open(f"/proc/{entry}/cmdline", "rb") as f:
+                cmdline = f.read()
+        except OSError:
+            continue
+        if ppid == me and b"server.py" in cmdline:
+            return int(entry)
+    return None
+
+
+# -----------------------------
+# Measurement
+# -----------------------------
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def run_scenario(
+    call: Callable[[str, Dict[str, Any]], Any], scenario: Scenario, iterations: int, concurrency: int, pid: int
+) -> Dict[str, Any]:
+    name, tool, make_args = scenario
+    await call(tool, make_args(iterations))  # warm-up (discovery, connections)
+
+    latencies: List[float] = []
+    sizes: List[int] = []
+    failures = 0
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        nonlocal failures
+        async with sem:
+            t0 = time.perf_counter()
+            text = await call(tool, make_args(i))
+            latencies.append(time.perf_counter() - t0)
+        sizes.append(len(text.encode("utf-8")))
+        if text.startswith(("BLOCKED:", "ERROR:")):
+            failures += 1
+
+    _reset_peak_rss(pid)
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(iterations)))
+    wall = time.perf_counter() - start
+    return {
+        "scenario": name,
+        "tool": tool,
+        "calls": iterations,
+        "p50_ms": _percentile(latencies, 50) * 1000,
+        "p95_ms": _percentile(latencies, 95) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+        "calls_per_s": iterations / wall if wall else 0.0,
+        "out_bytes": sum(sizes) / len(sizes),
+        "peak_rss_mb": _peak_rss_mb(pid),
+        "failures": failures,
+    }
+
+
+async def bench_inproc(selected: List[Scenario], args: argparse.Namespace) -> List[Dict[str, Any]]:
+    import server  # after the environment points at the fake API server
+
+    async def call(tool: str, arguments: Dict[str, Any]) -> str:
+        return (await server.call_tool(tool, arguments))[0].text
+
+    return [await run_scenario(call, s, args.iterations, args.concurrency, os.getpid()) for s in selected]
+
+
+async def bench_stdio(selected: List[Scenario], args: argparse.Namespace) -> List[Dict[str, Any]]:
+    from mcp.client.session import ClientSession
+    from mcp.client.stdio import StdioServerParameters, stdio_client
+
+    params = StdioServerParameters(
+        command=sys.executable, args=[os.path.join(ROOT, "server.py")], env=dict(os.environ), cwd=ROOT
+    )
+    with open(os.devnull, "w") as errlog:
+        async with stdio_client(params, errlog=errlog) as (read_stream, write_stream):
+            async with ClientSession(read_stream, write_stream) as session:
+                await session.initialize()
+                pid = _server_child_pid() or 0
+
+                async def call(tool: str, arguments: Dict[str, Any]) -> str:
+                    return (await session.call_tool(tool, arguments)).content[0].text
+
+                return [await run_scenario(call, s, args.iterations, args.concurrency, pid) for s in selected]
+
+
+# -----------------------------
+# Reporting
+# -----------------------------
+COLUMNS = (
+    ("scenario", "{:<18}"),
+    ("p50_ms", "{:>9.2f}"),
+    ("p95_ms", "{:>9.2f}"),
+    ("p99_ms", "{:>9.2f}"),
+    ("calls_per_s", "{:>11.1f}"),
+    ("out_bytes", "{:>11.0f}"),
+    ("peak_rss_mb", "{:>11.1f}"),
+    ("failures", "{:>8}"),
+)
+
+
+def print_table(mode: str, results: List[Dict[str, Any]]) -> None:
+    print(f"\n[{mode}]")
+    print(" ".join(f"{c:>{len(fmt.format(0 if c != 'scenario' else ''))}}" for c, fmt in COLUMNS))
+    for r in results:
+        print(" ".join(fmt.format(r[c]) for c, fmt in COLUMNS))
+
+
+def compare(results: Dict[str, List[Dict[str, Any]]], baseline_path: str, tolerance: float) -> List[str]:
+    with open(baseline_path) as f:
+        baseline = json.load(f)["results"]
+    regressions = []
+    for mode, rows in results.items():
+        before = {r["scenario"]: r for r in baseline.get(mode, [])}
+        for r in rows:
+            old = before.get(r["scenario"])
+            if old is None:
+                continue
+            for key in ("p50_ms", "p95_ms"):
+                if r[key] > old[key] * (1 + tolerance) and r[key] - old[key] > 1.0:
+                    regressions.append(f"{mode}/{r['scenario']} {key}: {old[key]:.2f} -> {r[key]:.2f} ms")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=("inproc", "stdio", "both"), default="both")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--transport", choices=("client", "async"), default="client", help="MCP_K8S_READ_TRANSPORT")
+    parser.add_argument("--only", help="comma-separated scenario names")
+    parser.add_argument("--grep-mb", type=float, default=64, help="log bytes k8s_pod_logs_grep scans per call")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="baseline written by an earlier --json run")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    add_scale_args(parser)
+    args = parser.parse_args()
+
+    selected = scenarios(args)
+    if args.only:
+        wanted = set(args.only.split(","))
+        selected = [s for s in selected if s[0] in wanted]
+
+    with tempfile.TemporaryDirectory(prefix="mcp-k8s-bench-") as tmp:
+        kubeconfig = os.path.join(tmp, "kubeconfig")
+        fake = subprocess.Popen(
+            [
+                sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_apiserver.py"),
+                "--port", "0", "--kubeconfig", kubeconfig,
+                "--namespace", args.namespace, "--pods", str(args.pods), "--deployments", str(args.deployments),
+                "--events", str(args.events), "--crds", str(args.crds), "--crd-objects", str(args.crd_objects),
+                "--log-mb", str(args.log_mb),
+            ],
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        try:
+            print(fake.stdout.readline().strip())
+            os.environ.update(
+                {
+                    "KUBECONFIG": kubeconfig,
+                    "MCP_K8S_DISCOVERY_CACHE_DIR": os.path.join(tmp, "discovery"),
+                    "MCP_K8S_READ_TRANSPORT": args.transport,
+                }
+            )
+            results: Dict[str, List[Dict[str, Any]]] = {}
+            if args.mode in ("inproc", "both"):
+                results["inproc"] = asyncio.run(bench_inproc(selected, args))
+                print_table("inproc", results["inproc"])
+            if args.mode in ("stdio", "both"):
+                results["stdio"] = asyncio.run(bench_stdio(selected, args))
+                print_table("stdio", results["stdio"])
+        finally:
+            fake.terminate()
+            fake.wait()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,457 @@
+"""
+Local stand-in for the Kubernetes API server, serving synthetic data at scale.
+
+    python benchmarks/fake_apiserver.py [--port 18080] [--pods 10000] [--crds 100] [--log-mb 1024]
+        [--kubeconfig /tmp/bench-kubeconfig]
+
+Serves what the tools use: discovery (/version, /api, /apis and every group
+version), list/get of pods, deployments, replicasets and events (lists also
+as metadata-only PartialObjectMetadataList), list/get of one namespaced
+custom resource per CRD group, DELETE of pods, PATCH of
+deployments, and pod logs streamed with chunked encoding (limitBytes and
+tailLines honoured). Objects are generated once at startup and never change:
+writes answer as the API would but leave the data untouched, so runs are
+repeatable. Responses are cached by URL, so the server stays cheap next to
+the client it is measuring.
+
+Pods are named pod-00000 ...; pod i belongs to Deployment deploy-<i % deployments>
+through ReplicaSet rs-<i % deployments>. Custom resources are widgets.crd<i>.bench.example.com,
+objects widget-0 ... All objects live in one namespace (--namespace, default "bench").
+"""
+import argparse
+import base64
+import functools
+import json
+import random
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+CRD_GROUP = "crd{}.bench.example.com"
+LOG_BLOCK_LINES = 2000
+
+
+class Cluster:
+    def __init__(
+        self,
+        namespace: str = "bench",
+        pods: int = 10000,
+        deployments: int = 50,
+        events: int = 2000,
+        crds: int = 100,
+        crd_objects: int = 20,
+        log_mb: float = 1024,
+        seed: int = 0,
+    ):
+        rnd = random.Random(seed)
+        self.namespace = namespace
+        self.crds = crds
+        self.log_bytes = int(log_mb * 1024 * 1024)
+        self.deployments = [self._deployment(d) for d in range(deployments)]
+        self.replicasets = [self._replicaset(d) for d in range(deployments)]
+        self.pods = [self._pod(i, i % max(1, deployments), rnd) for i in range(pods)]
+        self.events = [self._event(i, pods, rnd) for i in range(events)]
+        self.widgets = [self._widget(i) for i in range(crd_objects)]
+        self.pod_index = {p["metadata"]["name"]: p for p in self.pods}
+        self._log_block = self._make_log_block(rnd, timestamps=False)
+        self._log_block_ts = self._make_log_block(rnd, timestamps=True)
+
+    # -----------------------------
+    # Synthetic objects
+    # -----------------------------
+    def _meta(self, name: str, uid: str, labels: Dict[str, str], owner: Optional[Tuple[str, str, str]] = None):
+        md: Dict[str, Any] = {
+            "name": name,
+            "namespace": self.namespace,
+            "uid": uid,
+            "resourceVersion": "1000",
+            "creationTimestamp": "2024-05-01T12:00:00Z",
+            "labels": labels,
+            "annotations": {"kubectl.kubernetes.io/last-applied-configuration": json.dumps({"metadata": {"name": name}})},
+            "managedFields": [
+                {
+                    "manager": "kube-controller-manager",
+                    "operation": "Update",
+                    "apiVersion": "v1",
+                    "time": "2024-05-01T12:00:00Z",
+                    "fieldsType": "FieldsV1",
+                    "fieldsV1": {"f:metadata": {"f:labels": {k: {} for k in labels}}, "f:spec": {"f:containers": {}}},
+                }
+            ],
+        }
+        if owner:
+            kind, owner_name, owner_uid = owner
+            md["ownerReferences"] = [
+                {"apiVersion": "apps/v1", "kind": kind, "name": owner_name, "uid": owner_uid, "controller": True}
+            ]
+        return md
+
+    def _deployment(self, d: int) -> Dict[str, Any]:
+        labels = {"app": f"deploy-{d}"}
+        return {
+            "apiVersion": "apps/v1",
+            "kind": "Deployment",
+            "metadata": self._meta(f"deploy-{d}", f"uid-deploy-{d}", labels),
+            "spec": {
+                "replicas": 3,
+                "selector": {"matchLabels": labels},
+                "template": {"metadata": {"labels": labels}, "spec": {"containers": [{"name": "app", "image": "nginx:1.25"}]}},
+            },
+            "status": {"replicas": 3, "readyReplicas": 3, "availableReplicas": 3, "updatedReplicas": 3},
+        }
+
+    def _replicaset(self, d: int) -> Dict[str, Any]:
+        labels = {"app": f"deploy-{d}"}
+        return {
+            "apiVersion": "apps/v1",
+            "kind": "ReplicaSet",
+            "metadata": self._meta(f"rs-{d}", f"uid-rs-{d}", labels, ("Deployment", f"deploy-{d}", f"uid-deploy-{d}")),
+            "spec": {"replicas": 3, "selector": {"matchLabels": labels}},
+            "status": {"replicas": 3, "readyReplicas": 3},
+        }
+
+    def _pod(self, i: int, d: int, rnd: random.Random) -> Dict[str, Any]:
+        name = f"pod-{i:05d}"
+        return {
+            "apiVersion": "v1",
+            "kind": "Pod",
+            "metadata": self._meta(name, f"uid-pod-{i}", {"app": f"deploy-{d}"}, ("ReplicaSet", f"rs-{d}", f"uid-rs-{d}")),
+            "spec": {
+                "nodeName": f"node-{i % 100}",
+                "containers": [
+                    {
+                        "name": "app",
+                        "image": f"registry.example.com/team/app:{rnd.randrange(100)}",
+                        "env": [
+                            {"name": "LOG_LEVEL", "value": "info"},
+                            {"name": "DB_PASSWORD", "value": "%032x" % rnd.getrandbits(128)},
+                        ],
+                        "resources": {"requests": {"cpu": "100m", "memory": "128Mi"}},
+                        "volumeMounts": [{"name": "kube-api-access", "mountPath": "/var/run/secrets/kubernetes.io"}],
+                    },
+                    {"name": "sidecar", "image": "registry.example.com/proxy:1.0"},
+                ],
+            },
+            "status": {
+                "phase": "Running",
+                "podIP": f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}",
+                "startTime": "2024-05-01T12:00:05Z",
+                "conditions": [{"type": t, "status": "True"} for t in ("Initialized", "Ready", "ContainersReady", "PodScheduled")],
+                "containerStatuses": [
+                    {"name": c, "ready": True, "restartCount": rnd.randrange(3), "state": {"running": {}}}
+                    for c in ("app", "sidecar")
+                ],
+            },
+        }
+
+    def _event(self, i: int, pods: int, rnd: random.Random) -> Dict[str, Any]:
+        reason, type_ = rnd.choice([("BackOff", "Warning"), ("Pulled", "Normal"), ("Unhealthy", "Warning"), ("Started", "Normal")])
+        minute = i % 60
+        return {
+            "apiVersion": "v1",
+            "kind": "Event",
+            "metadata": self._meta(f"event-{i}", f"uid-event-{i}", {}),
+            "type": type_,
+            "reason": reason,
+            "message": f"{reason} for container app (attempt {rnd.randrange(10)})",
+            "count": rnd.randrange(1, 20),
+            "involvedObject": {"kind": "Pod", "name": f"pod-{rnd.randrange(max(1, pods)):05d}", "namespace": self.namespace},
+            "firstTimestamp": f"2024-05-01T11:{minute:02d}:00Z",
+            "lastTimestamp": f"2024-05-01T12:{minute:02d}:00Z",
+        }
+
+    def _widget(self, i: int) -> Dict[str, Any]:
+        return {
+            "kind": "Widget",
+            "metadata": self._meta(f"widget-{i}", f"uid-widget-{i}", {"tier": "bench"}),
+            "spec": {"size": i, "color": "blue"},
+        }
+
+    def _make_log_block(self, rnd: random.Random, timestamps: bool) -> bytes:
+        lines = []
+        for n in range(LOG_BLOCK_LINES):
+            ts = f"2024-05-01T12:{n // 60 % 60:02d}:{n % 60:02d}.{n:06d}Z "
+            if rnd.random() < 0.02:
+                msg = f"ERROR request failed password={'%024x' % rnd.getrandbits(96)}"
+            else:
+                msg = f'INFO "GET /api/items/{rnd.randrange(100000)} HTTP/1.1" 200 {rnd.randrange(5000)} latency={rnd.randrange(500)}ms'
+            lines.append((ts if timestamps else "") + msg + "\n")
+        return "".join(lines).encode("utf-8")
+
+    # -----------------------------
+    # Discovery
+    # -----------------------------
+    def _resources(self, api_version: str) -> Optional[List[Dict[str, Any]]]:
+        def res(name, kind, verbs=("get", "list")):
+            return {"name": name, "singularName": kind.lower(), "namespaced": True, "kind": kind, "verbs": list(verbs)}
+
+        if api_version == "v1":
+            return [
+                res("pods", "Pod", ("get", "list", "delete")),
+                {"name": "pods/log", "singularName": "", "namespaced": True, "kind": "Pod", "verbs": ["get"]},
+                res("events", "Event"),
+            ]
+        if api_version == "apps/v1":
+            return [res("deployments", "Deployment", ("get", "list", "patch")), res("replicasets", "ReplicaSet")]
+        group, _, version = api_version.partition("/")
+        if version == "v1" and group.startswith("crd") and group.endswith(".bench.example.com"):
+            idx = group[3 : -len(".bench.example.com")]
+            if idx.isdigit() and int(idx) < self.crds:
+                return [res("widgets", "Widget")]
+        return None
+
+    def _groups(self) -> Dict[str, Any]:
+        names = ["apps"] + [CRD_GROUP.format(i) for i in range(self.crds)]
+        groups = [
+            {"name": n, "versions": [{"groupVersion": f"{n}/v1", "version": "v1"}], "preferredVersion": {"groupVersion": f"{n}/v1", "version": "v1"}}
+            for n in names
+        ]
+        return {"kind": "APIGroupList", "apiVersion": "v1", "groups": groups}
+
+    # -----------------------------
+    # Read routing
+    # -----------------------------
+    def _collection(self, api_version: str, plural: str) -> Optional[List[Dict[str, Any]]]:
+        return {
+            ("v1", "pods"): self.pods,
+            ("v1", "events"): self.events,
+            ("apps/v1", "deployments"): self.deployments,
+            ("apps/v1", "replicasets"): self.replicasets,
+        }.get((api_version, plural), self.widgets if plural == "widgets" and self._resources(api_version) else None)
+
+    def get(self, path: str, query: str) -> Tuple[int, Any]:
+        """(status, JSON body) for a read; pod logs are served by the handler."""
+        q = parse_qs(query)
+        if path == "/version":
+            return 200, {"major": "1", "minor": "30", "gitVersion": "v1.30.0"}
+        if path == "/api":
+            return 200, {"kind": "APIVersions", "versions": ["v1"]}
+        if path == "/apis":
+            return 200, self._groups()
+
+        parts = path.strip("/").split("/")
+        if parts[0] == "api":
+            api_version, rest = "v1", parts[2:]
+        elif parts[0] == "apis" and len(parts) >= 3:
+            api_version, rest = f"{parts[1]}/{parts[2]}", parts[3:]
+        else:
+            return _status(404, "NotFound", f"the server could not find the requested resource ({path})")
+
+        if not rest:
+            resources = self._resources(api_version)
+            if resources is None:
+                return _status(404, "NotFound", f"{api_version} not found")
+            return 200, {"kind": "APIResourceList", "groupVersion": api_version, "resources": resources}
+
+        if len(rest) < 3 or rest[0] != "namespaces" or rest[1] != self.namespace:
+            return _status(404, "NotFound", "not found")
+        plural, name = rest[2], rest[3] if len(rest) > 3 else None
+        items = self._collection(api_version, plural)
+        if items is None:
+            return _status(404, "NotFound", f"the server could not find the requested resource ({plural})")
+        if name is None:
+            return 200, self._list(api_version, plural, items, q)
+        obj = next((o for o in items if o["metadata"]["name"] == name), None)
+        if obj is None:
+            return _status(404, "NotFound", f'{plural} "{name}" not found')
+        return 200, obj
+
+    def _list(self, api_version: str, plural: str, items: List[Dict[str, Any]], q: Dict[str, List[str]]):
+        selector = (q.get("labelSelector") or [""])[0]
+        if selector:
+            terms = [t.split("=", 1) for t in selector.split(",") if "=" in t]
+            items = [o for o in items if all(o["metadata"]["labels"].get(k) == v for k, v in terms)]
+        field_selector = (q.get("fieldSelector") or [""])[0]
+        if field_selector:
+            for key, value in (t.split("=", 1) for t in field_selector.split(",") if "=" in t):
+                items = [o for o in items if _field(o, key) == value]
+
+        start = int(base64.b64decode((q.get("continue") or ["MA=="])[0]).decode() or 0)
+        limit = int((q.get("limit") or ["0"])[0]) or len(items)
+        page = items[start : start + limit]
+        md: Dict[str, Any] = {"resourceVersion": "1000"}
+        if start + limit < len(items):
+            md["continue"] = base64.b64encode(str(start + limit).encode()).decode()
+            md["remainingItemCount"] = len(items) - start - limit
+        kind = page[0]["kind"] if page else "Object"
+        # The REST API omits apiVersion/kind on list items
+        return {
+            "kind": f"{kind}List",
+            "apiVersion": api_version,
+            "metadata": md,
+            "items": [{k: v for k, v in o.items() if k not in ("apiVersion", "kind")} for o in page],
+        }
+
+    def log_stream(self, query: str):
+        """Chunks of the pod log, honouring tailLines and limitBytes."""
+        q = parse_qs(query)
+        block = self._log_block_ts if (q.get("timestamps") or [""])[0].lower() == "true" else self._log_block
+        remaining = self.log_bytes
+        if q.get("tailLines"):
+            tail = b"".join(block.splitlines(keepends=True)[-int(q["tailLines"][0]) :])
+            remaining, block = min(len(tail), remaining), tail
+        if q.get("limitBytes"):
+            remaining = min(remaining, int(q["limitBytes"][0]))
+        while remaining > 0:
+            chunk = block[:remaining]
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _field(obj: Dict[str, Any], path: str) -> Any:
+    for key in path.split("."):
+        obj = obj.get(key) if isinstance(obj, dict) else None
+    return obj
+
+
+def _status(code: int, reason: str, message: str) -> Tuple[int, Dict[str, Any]]:
+    return code, {"kind": "Status", "apiVersion": "v1", "status": "Failure", "message": message, "reason": reason, "code": code}
+
+
+def _metadata_list(body: Dict[str, Any]) -> Dict[str, Any]:
+    """A list as PartialObjectMetadataList (Accept: ...;as=PartialObjectMetadataList)."""
+    return {
+        "kind": "PartialObjectMetadataList",
+        "apiVersion": "meta.k8s.io/v1",
+        "metadata": body["metadata"],
+        "items": [{"metadata": o["metadata"]} for o in body["items"]],
+    }
+
+
+# -----------------------------
+# HTTP layer
+# -----------------------------
+def make_handler(cluster: Cluster):
+    @functools.lru_cache(maxsize=4096)
+    def cached_get(path: str, query: str, metadata_only: bool = False) -> Tuple[int, bytes]:
+        status, body = cluster.get(path, query)
+        if metadata_only and status == 200 and isinstance(body.get("items"), list):
+            body = _metadata_list(body)
+        return status, json.dumps(body, separators=(",", ":")).encode("utf-8")
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like the real API server
+        disable_nagle_algorithm = True  # headers and body are separate writes
+
+        def _send(self, status: int, body: bytes) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _drain(self) -> bytes:
+            return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if "watch=" in url.query:
+                # Watches are not simulated: an empty stream that ends at once
+                return self._send(200, b"")
+            if url.path.endswith("/log") and url.path.startswith(f"/api/v1/namespaces/{cluster.namespace}/pods/"):
+                if url.path.split("/")[-2] not in cluster.pod_index:
+                    return self._send(*cached_get("/api/v1/namespaces/-/pods/-", ""))
+                return self._stream_log(url.query)
+            metadata_only = "as=PartialObjectMetadataList" in (self.headers.get("Accept") or "")
+            self._send(*cached_get(url.path, url.query, metadata_only))
+
+        def _stream_log(self, query: str) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            try:
+                for chunk in cluster.log_stream(query):
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                self.wfile.write(b"0\r\n\r\n")
+            except (BrokenPipeError, ConnectionResetError):
+                self.close_connection = True  # the client stopped reading
+
+        def do_DELETE(self):
+            self._drain()
+            status, body = cluster.get(urlparse(self.path).path, "")
+            if status == 200:
+                body = {"kind": "Status", "apiVersion": "v1", "status": "Success", "details": {"name": body["metadata"]["name"]}}
+            self._send(status, json.dumps(body).encode("utf-8"))
+
+        def do_PATCH(self):
+            patch = json.loads(self._drain() or b"{}")
+            status, body = cluster.get(urlparse(self.path).path, "")
+            if status == 200:
+                body = {**body, "spec": {**body.get("spec", {}), **(patch.get("spec") or {})}}
+            self._send(status, json.dumps(body).encode("utf-8"))
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients drop pooled connections and stop reading logs early
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+def start(cluster: Cluster, port: int = 0) -> ThreadingHTTPServer:
+    """Serve `cluster` on 127.0.0.1:<port> from a daemon thread."""
+    httpd = _Server(("127.0.0.1", port), make_handler(cluster))
+    threading.Thread(target=httpd.serve_forever, name="fake-apiserver", daemon=True).start()
+    return httpd
+
+
+def write_kubeconfig(path: str, port: int) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "apiVersion": "v1",
+                "kind": "Config",
+                "clusters": [{"name": "bench", "cluster": {"server": f"http://127.0.0.1:{port}"}}],
+                "users": [{"name": "bench", "user": {"token": "bench-token"}}],
+                "contexts": [{"name": "bench", "context": {"cluster": "bench", "user": "bench"}}],
+                "current-context": "bench",
+            },
+            f,
+        )
+
+
+def add_scale_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--namespace", default="bench")
+    parser.add_argument("--pods", type=int, default=10000)
+    parser.add_argument("--deployments", type=int, default=50)
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--crds", type=int, default=100, help="CRD groups, one namespaced kind each")
+    parser.add_argument("--crd-objects", type=int, default=20, help="objects per CRD")
+    parser.add_argument("--log-mb", type=float, default=1024, help="size of every pod's log")
+
+
+def cluster_from_args(args: argparse.Namespace) -> Cluster:
+    return Cluster(args.namespace, args.pods, args.deployments, args.events, args.crds, args.crd_objects, args.log_mb)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=18080, help="0 picks a free port")
+    parser.add_argument("--kubeconfig", help="write a kubeconfig pointing at this server")
+    add_scale_args(parser)
+    args = parser.parse_args()
+
+    httpd = start(cluster_from_args(args), args.port)
+    port = httpd.server_address[1]
+    if args.kubeconfig:
+        write_kubeconfig(args.kubeconfig, port)
+    print(f"listening on http://127.0.0.1:{port}", flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        httpd.shutdown()
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# -----------------------------
+# List change tracking (k8s_list changes_since)
+# -----------------------------
+# A cursor stands for what the caller has been shown of one collection: a
+# digest of name -> metadata.resourceVersion. The next poll compares the
+# collection's current digest with it and reports only the difference, as
+# watch-style ADDED / MODIFIED / DELETED events. Changes not reported (past
+# the caller's limit) stay out of the new cursor, so the poll after that
+# reports them.
+Digest = Dict[str, str]
+
+ADDED = "ADDED"
+MODIFIED = "MODIFIED"
+DELETED = "DELETED"
+
+
+def digest_of(items: Iterable[Dict[str, Any]]) -> Digest:
+    digest = {}
+    for item in items:
+        md = item.get("metadata") or {}
+        name = md.get("name")
+        if name:
+            digest[name] = md.get("resourceVersion") or ""
+    return digest
+
+
+def changed(before: Digest, now: Digest) -> List[Tuple[str, str]]:
+    """(name, ADDED | MODIFIED | DELETED) for every difference, ordered by name."""
+    out = []
+    for name, rv in now.items():
+        old = before.get(name)
+        if old is None:
+            out.append((name, ADDED))
+        elif old != rv:
+            out.append((name, MODIFIED))
+    out.extend((name, DELETED) for name in before if name not in now)
+    out.sort()
+    return out
+
+
+def advance(before: Digest, shown: Dict[str, Optional[str]]) -> Digest:
+    """`before` with the changes the caller was shown applied (None = deleted)."""
+    after = dict(before)
+    for name, rv in shown.items():
+        if rv is None:
+            after.pop(name, None)
+        else:
+            after[name] = rv
+    return after
@@ -0,0 +1,24 @@
+from typing import Dict, Tuple
+
+# -----------------------------
+# Shared argument vocabularies
+# -----------------------------
+# Values that gate.py validates and the modules that implement them act on.
+# Kept here, with no internal imports, so the policy module does not depend
+# on the output and I/O layers.
+
+# Pruning profiles for returned objects, most aggressive first (sanitize.py)
+PRUNE_PROFILES = ("minimal", "standard", "full")
+
+# k8s_pod_logs_grep `level` values, most severe first (log_stream.py)
+LOG_LEVELS = ("fatal", "error", "warn", "info", "debug")
+
+# Workloads whose pods k8s_workload_logs reads together (workloads.py)
+WORKLOAD_KINDS: Dict[str, Tuple[str, str, str]] = {
+    # kind -> (group, version, plural)
+    "Deployment": ("apps", "v1", "deployments"),
+    "StatefulSet": ("apps", "v1", "statefulsets"),
+    "DaemonSet": ("apps", "v1", "daemonsets"),
+    "ReplicaSet": ("apps", "v1", "replicasets"),
+    "Job": ("batch", "v1", "jobs"),
+}
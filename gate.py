@@ -1,8 +1,17 @@
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass
 from typing import Optional, Mapping, Any
 
+import metrics
+from constants import LOG_LEVELS, PRUNE_PROFILES, WORKLOAD_KINDS
+
+try:
+    from re import _parser as _sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover
+    import sre_parse as _sre_parse
+
 
 # -----------------------------
 # Hard forbidden resources
@@ -36,6 +45,54 @@ SCALE_MIN_REPLICAS = 0
 SCALE_MAX_REPLICAS = 100
 
 
+# -----------------------------
+# List paging policy
+# -----------------------------
+# Upper bound on objects returned by one k8s_list page
+LIST_MAX_LIMIT = 500
+
+# -----------------------------
+# Pod log bounds
+# -----------------------------
+# Upper bound on raw log bytes one k8s_pod_logs call may read
+LOG_MAX_LIMIT_BYTES = 10 * 1024 * 1024
+
+# k8s_pod_logs_grep scans far more than it returns; the pattern runs on
+# every scanned line, so it is kept short and free of nested quantifiers
+LOG_GREP_MAX_SCAN_BYTES = 1024 * 1024 * 1024
+LOG_GREP_MAX_PATTERN_LEN = 256
+LOG_GREP_MAX_CONTEXT = 10
+LOG_GREP_MAX_MATCHES = 200
+
+# k8s_workload_logs: workloads whose pods may be read together are
+# constants.WORKLOAD_KINDS
+WORKLOAD_LOG_MAX_PODS = 50
+
+# -----------------------------
+# Batch reads
+# -----------------------------
+# k8s_batch_get: explicit targets only, each enforced as a single get
+BATCH_GET_MAX_TARGETS = 50
+BATCH_TARGET_KEYS = {"namespace", "group", "version", "plural", "name", "kind"}
+
+# -----------------------------
+# Event filters
+# -----------------------------
+# Values are pushed down into an API field selector, so they must not be
+# able to add selector terms of their own
+EVENT_TYPES = {"Normal", "Warning"}
+_SELECTOR_VALUE_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9._:-]{0,252}")
+
+# -----------------------------
+# Read output views
+# -----------------------------
+# Read output formats/views and projection bounds (pruning profiles are
+# constants.PRUNE_PROFILES)
+OUTPUT_VIEWS = {"json", "compact", "ndjson", "yaml", "summary"}
+MAX_FIELDS = 50
+MAX_FIELD_PATH_LEN = 200
+
+
 # -----------------------------
 # Exceptions
 # -----------------------------
@@ -63,6 +120,10 @@ class InvalidPatchIntent(GateError):
     pass
 
 
+class InvalidArgument(GateError):
+    pass
+
+
 # -----------------------------
 # Request Context
 # -----------------------------
@@ -121,7 +182,7 @@ def validate_scope(ctx: RequestContext) -> None:
         return
 
     # get / delete / logs / patch → object scoped
-    if verb in {"get", "delete", "pod_logs", "patch"}:
+    if verb in {"get", "delete", "pod_logs", "workload_logs", "patch"}:
         if not ctx.namespace or not ctx.name:
             raise MissingScope(f"{verb.upper()} requires namespace and name")
         return
@@ -159,6 +220,158 @@ def _require_int(arguments: Mapping[str, Any], key: str) -> int:
     return val
 
 
+def validate_list_paging(arguments: Mapping[str, Any]) -> None:
+    limit = arguments.get("limit")
+    if limit is not None:
+        if not isinstance(limit, int) or isinstance(limit, bool):
+            raise InvalidArgument("LIST limit must be an integer")
+        if limit < 1 or limit > LIST_MAX_LIMIT:
+            raise InvalidArgument(f"LIST limit must be between 1 and {LIST_MAX_LIMIT}")
+
+    token = arguments.get("continue")
+    if token is not None and (not isinstance(token, str) or not token.strip()):
+        raise InvalidArgument("LIST continue must be a non-empty string")
+
+    cursor = arguments.get("changes_since")
+    if cursor is not None:
+        if not isinstance(cursor, str) or not cursor.strip():
+            raise InvalidArgument("LIST changes_since must be a non-empty string")
+        if token is not None:
+            raise InvalidArgument("LIST changes_since cannot be combined with continue")
+
+
+def validate_view_args(arguments: Mapping[str, Any]) -> None:
+    output = arguments.get("output")
+    if output is not None and output not in OUTPUT_VIEWS:
+        raise InvalidArgument(f"output must be one of {sorted(OUTPUT_VIEWS)}")
+
+    prune = arguments.get("prune")
+    if prune is not None and prune not in PRUNE_PROFILES:
+        raise InvalidArgument(f"prune must be one of {sorted(PRUNE_PROFILES)}")
+
+    fields = arguments.get("fields")
+    if fields is not None:
+        if not isinstance(fields, list) or not fields:
+            raise InvalidArgument("fields must be a non-empty list of field paths")
+        if len(fields) > MAX_FIELDS:
+            raise InvalidArgument(f"fields accepts at most {MAX_FIELDS} paths")
+        for path in fields:
+            if not isinstance(path, str) or not path.strip() or len(path) > MAX_FIELD_PATH_LEN:
+                raise InvalidArgument("fields entries must be non-empty strings (max 200 chars)")
+
+
+def _positive_int(arguments: Mapping[str, Any], key: str, maximum: Optional[int] = None) -> None:
+    val = arguments.get(key)
+    if val is None:
+        return
+    if not isinstance(val, int) or isinstance(val, bool) or val < 1:
+        raise InvalidArgument(f"{key} must be a positive integer")
+    if maximum is not None and val > maximum:
+        raise InvalidArgument(f"{key} must be at most {maximum}")
+
+
+def validate_log_args(arguments: Mapping[str, Any], max_bytes: int = LOG_MAX_LIMIT_BYTES) -> None:
+    _positive_int(arguments, "tail_lines")
+    _positive_int(arguments, "since_seconds")
+    _positive_int(arguments, "limit_bytes", max_bytes)
+    for key in ("timestamps", "previous"):
+        if key in arguments and not isinstance(arguments[key], bool):
+            raise InvalidArgument(f"{key} must be a boolean")
+
+
+def _subpatterns(av: Any):
+    if isinstance(av, _sre_parse.SubPattern):
+        yield av
+    elif isinstance(av, (list, tuple)):
+        for x in av:
+            yield from _subpatterns(x)
+
+
+def _nested_repeat(items: Any, repeated: bool = False) -> bool:
+    """A variable repeat inside a repeat: (a+)+, (a|b*)*, (\\w+\\s?){2,} backtrack exponentially."""
+    for op, av in items:
+        if op in (_sre_parse.MAX_REPEAT, _sre_parse.MIN_REPEAT):
+            lo, hi, body = av
+            if repeated and lo != hi:
+                return True
+            if _nested_repeat(body, repeated or hi > 1):
+                return True
+        elif any(_nested_repeat(sub, repeated) for sub in _subpatterns(av)):
+            return True
+    return False
+
+
+def validate_log_grep_args(arguments: Mapping[str, Any]) -> None:
+    validate_log_args(arguments, LOG_GREP_MAX_SCAN_BYTES)
+    _positive_int(arguments, "max_matches", LOG_GREP_MAX_MATCHES)
+    if "ignore_case" in arguments and not isinstance(arguments["ignore_case"], bool):
+        raise InvalidArgument("ignore_case must be a boolean")
+
+    context = arguments.get("context")
+    if context is not None and (
+        not isinstance(context, int) or isinstance(context, bool) or not 0 <= context <= LOG_GREP_MAX_CONTEXT
+    ):
+        raise InvalidArgument(f"context must be an integer between 0 and {LOG_GREP_MAX_CONTEXT}")
+
+    level = arguments.get("level")
+    if level is not None and level not in LOG_LEVELS:
+        raise InvalidArgument(f"level must be one of {list(LOG_LEVELS)}")
+
+    pattern = arguments.get("pattern")
+    if pattern is not None:
+        if not isinstance(pattern, str) or not pattern or len(pattern) > LOG_GREP_MAX_PATTERN_LEN:
+            raise InvalidArgument(f"pattern must be a non-empty string (max {LOG_GREP_MAX_PATTERN_LEN} chars)")
+        try:
+            re.compile(pattern)
+            parsed = _sre_parse.parse(pattern)
+        except re.error as e:
+            raise InvalidArgument(f"pattern is not a valid regular expression: {e}")
+        if _nested_repeat(parsed):
+            raise InvalidArgument("pattern must not repeat a group that contains a variable repeat, e.g. (a+)+")
+    elif level is None:
+        raise InvalidArgument("pattern or level is required")
+
+
+def validate_batch_targets(arguments: Mapping[str, Any]) -> None:
+    targets = arguments.get("targets")
+    if not isinstance(targets, list) or not targets:
+        raise InvalidArgument("targets must be a non-empty list")
+    if len(targets) > BATCH_GET_MAX_TARGETS:
+        raise InvalidArgument(f"targets accepts at most {BATCH_GET_MAX_TARGETS} entries")
+    for target in targets:
+        if not isinstance(target, dict):
+            raise InvalidArgument("each target must be an object")
+        unknown = set(target) - BATCH_TARGET_KEYS
+        if unknown:
+            # Also keeps selectors out of targets: names must be explicit
+            raise BulkOperationBlocked(f"Unsupported target keys: {sorted(unknown)}")
+        for key in ("namespace", "version", "plural", "name"):
+            if not isinstance(target.get(key), str) or not target[key].strip():
+                raise InvalidArgument(f"each target requires a non-empty '{key}'")
+        if not isinstance(target.get("group", ""), str):
+            raise InvalidArgument("target 'group' must be a string")
+
+
+def validate_event_filters(arguments: Mapping[str, Any]) -> None:
+    for key in ("involved_kind", "involved_name"):
+        val = arguments.get(key)
+        if val is not None and (not isinstance(val, str) or not _SELECTOR_VALUE_RE.fullmatch(val)):
+            raise InvalidArgument(f"{key} must be a Kubernetes kind or object name")
+    if arguments.get("type") is not None and arguments["type"] not in EVENT_TYPES:
+        raise InvalidArgument(f"type must be one of {sorted(EVENT_TYPES)}")
+    _positive_int(arguments, "since_seconds")
+    if "aggregate" in arguments and not isinstance(arguments["aggregate"], bool):
+        raise InvalidArgument("aggregate must be a boolean")
+
+
+def validate_workload_logs(ctx: RequestContext) -> None:
+    if ctx.kind not in WORKLOAD_KINDS:
+        raise InvalidArgument(f"kind must be one of {list(WORKLOAD_KINDS)}")
+    arguments = ctx.arguments or {}
+    validate_log_args(arguments)
+    _positive_int(arguments, "max_pods", WORKLOAD_LOG_MAX_PODS)
+
+
 def validate_patch_intent(ctx: RequestContext) -> None:
     """
     Validate Phase 4 intent-only patch input.
@@ -208,8 +421,16 @@ def validate_patch_intent(ctx: RequestContext) -> None:
 def enforce(ctx: RequestContext) -> None:
     """
     Single fail-closed enforcement point.
-    Called exactly once per tool invocation.
+    Called once per tool invocation, before any Kubernetes access. A
+    k8s_batch_get call is also enforced once per target, as the get that
+    target stands for; per-target checks add to the batch check and never
+    replace it.
     """
+    with metrics.phase("gate"):
+        _enforce(ctx)
+
+
+def _enforce(ctx: RequestContext) -> None:
     validate_allowed_action(ctx)
 
     # Hard blocks
@@ -225,6 +446,33 @@ def enforce(ctx: RequestContext) -> None:
     if ctx.arguments:
         block_bulk_args(ctx.arguments)
 
+    # List paging bounds
+    if ctx.verb == "list" and ctx.arguments:
+        validate_list_paging(ctx.arguments)
+
+    # Projection / view arguments on object reads
+    if ctx.verb in {"list", "get", "events", "batch_get"} and ctx.arguments:
+        validate_view_args(ctx.arguments)
+
+    # Batch target shape (each target is then enforced as its own get)
+    if ctx.verb == "batch_get":
+        validate_batch_targets(ctx.arguments or {})
+
+    # Event filters
+    if ctx.verb == "events" and ctx.arguments:
+        validate_event_filters(ctx.arguments)
+
+    # Pod log read bounds
+    if ctx.verb == "pod_logs" and ctx.arguments:
+        if ctx.tool_name == "k8s_pod_logs_grep":
+            validate_log_grep_args(ctx.arguments)
+        else:
+            validate_log_args(ctx.arguments)
+
+    # Workload log fan-out bounds
+    if ctx.verb == "workload_logs":
+        validate_workload_logs(ctx)
+
     # Patch-specific policy
     if ctx.verb == "patch":
         validate_patch_intent(ctx)
\ No newline at end of file
@@ -0,0 +1,150 @@
+import asyncio
+import contextlib
+import ipaddress
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Iterator, Optional
+
+import uvicorn
+from mcp.server.lowlevel import Server
+from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+from mcp.server.transport_security import TransportSecuritySettings
+from sse_starlette.sse import AppStatus
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+import sessions
+import settings
+
+logger = logging.getLogger("mcp-k8s-agent")
+
+MCP_PATH = "/mcp"
+
+# After the drain, results are still on their way to the response streams;
+# they get this long to be written before the streams (including idle GET
+# event streams, which never end on their own) are closed
+_FLUSH_SECONDS = 1.0
+
+
+# -----------------------------
+# Streamable HTTP transport
+# -----------------------------
+# One process serves many MCP sessions: every session runs on the same event
+# loop and shares the API clients, connection pool, I/O executor and caches.
+# Each session is still limited to SESSION_MAX_INFLIGHT concurrent calls
+# (sessions.slot). On SIGTERM/SIGINT new requests get 503, running tool
+# calls get HTTP_DRAIN_SECONDS to finish, then sessions are closed.
+_draining = False
+
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def _security_settings(host: str) -> Optional[TransportSecuritySettings]:
+    """DNS-rebinding protection for loopback binds (a browser page could otherwise reach the server)."""
+    if not _is_loopback(host):
+        return None
+    return TransportSecuritySettings(
+        enable_dns_rebinding_protection=True,
+        allowed_hosts=["127.0.0.1:*", "localhost:*", "[::1]:*"],
+        allowed_origins=["http://127.0.0.1:*", "http://localhost:*", "http://[::1]:*"],
+    )
+
+
+class _MCPEndpoint:
+    """ASGI endpoint for MCP_PATH; refuses new requests while draining."""
+
+    def __init__(self, manager: StreamableHTTPSessionManager):
+        self.manager = manager
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        if _draining:
+            await PlainTextResponse("Server is shutting down", status_code=503)(scope, receive, send)
+            return
+        await self.manager.handle_request(scope, receive, send)
+
+
+async def _healthz(_request: Any) -> PlainTextResponse:
+    if _draining:
+        return PlainTextResponse("draining", status_code=503)
+    return PlainTextResponse("ok")
+
+
+def build_app(server: Server, host: str) -> Starlette:
+    manager = StreamableHTTPSessionManager(
+        app=server,
+        security_settings=_security_settings(host),
+        session_idle_timeout=settings.HTTP_SESSION_IDLE_SECONDS,
+        max_sessions=settings.HTTP_MAX_SESSIONS,
+    )
+
+    @asynccontextmanager
+    async def lifespan(_app: Starlette) -> AsyncIterator[None]:
+        async with manager.run():
+            yield
+
+    return Starlette(
+        routes=[
+            Route(MCP_PATH, endpoint=_MCPEndpoint(manager)),
+            Route("/healthz", endpoint=_healthz),
+        ],
+        lifespan=lifespan,
+    )
+
+
+class _DrainingServer(uvicorn.Server):
+    @contextlib.contextmanager
+    def capture_signals(self) -> Iterator[None]:
+        # uvicorn re-raises a captured SIGTERM/SIGINT once serve() is done,
+        # which kills the process before server.main() can close the API
+        # clients and write the final metrics; the drain already handled it
+        with super().capture_signals():
+            try:
+                yield
+            finally:
+                self._captured_signals.clear()
+
+    async def shutdown(self, sockets: Any = None) -> None:
+        global _draining
+        _draining = True
+        for listener in self.servers:
+            listener.close()
+        if not self.force_exit and sessions.inflight():
+            logger.info("draining %d running tool call(s)", sessions.inflight())
+            left = await sessions.drain(settings.HTTP_DRAIN_SECONDS)
+            if left:
+                logger.warning("drain timed out; cancelling %d tool call(s)", left)
+            await asyncio.sleep(_FLUSH_SECONDS)
+        # Responses are streamed as SSE; let sse-starlette end the streams now
+        AppStatus.should_exit = True
+        self.config.timeout_graceful_shutdown = _FLUSH_SECONDS
+        await super().shutdown(sockets)
+
+
+async def serve(server: Server, host: str, port: int) -> None:
+    """Serve `server` over streamable HTTP at http://host:port/mcp until signalled."""
+    global _draining
+    _draining = False
+    # By default sse-starlette closes every response stream on SIGTERM, which
+    # would drop the results of calls still being drained
+    AppStatus.disable_automatic_graceful_drain()
+    AppStatus.should_exit = False
+    config = uvicorn.Config(
+        build_app(server, host),
+        host=host,
+        port=port,
+        log_config=None,
+        lifespan="on",
+        timeout_graceful_shutdown=_FLUSH_SECONDS,
+    )
+    if not _is_loopback(host):
+        logger.warning("HTTP transport on %s has no authentication; put it behind an authenticating proxy", host)
+    logger.info("serving MCP over streamable HTTP at http://%s:%d%s", host, port, MCP_PATH)
+    await _DrainingServer(config).serve()
@@ -0,0 +1,271 @@
+import json
+import time
+import logging
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import settings
+from k8s_resource import load_dynamic_client, get_resource
+from k8s_executor import run_blocking
+
+logger = logging.getLogger("mcp-k8s-agent")
+
+HTTP_GONE = 410
+
+
+# -----------------------------
+# Watch-backed informer cache (opt-in)
+# -----------------------------
+# On first read of a (namespace, api_version, plural) collection, LIST it once
+# and keep an in-memory store current with a WATCH running on a dedicated
+# daemon thread. k8s_list / k8s_get are then answered from the store while it
+# is fresh (see INFORMER_MAX_STALENESS_SECONDS); otherwise callers fall back
+# to a direct API read. Watches stop after INFORMER_IDLE_SECONDS without
+# reads (checked between WATCH requests, so an idle watch can run for up to
+# one more INFORMER_WATCH_TIMEOUT_SECONDS), and the total number of cached
+# objects is capped: checked after each initial LIST and whenever a watch
+# event adds an object.
+InformerKey = Tuple[str, str, str]
+
+
+class _Informer:
+    def __init__(self, key: InformerKey):
+        self.key = key
+        self.lock = threading.Lock()
+        self.store: Dict[str, Dict[str, Any]] = {}
+        self.list_kind = ""
+        self.resource_version: Optional[str] = None
+        self.synced_at = 0.0
+        self.last_access = time.monotonic()
+        self.ready = threading.Event()
+        self.stopped = threading.Event()
+        self.watcher = None
+
+    # --- store maintenance (watch thread) ---
+
+    def relist(self) -> None:
+        namespace, api_version, plural = self.key
+        resource = get_resource(load_dynamic_client(), api_version, plural)
+        payload = json.loads(resource.get(namespace=namespace, serialize=False).data)
+
+        items = payload.get("items") or []
+        if len(items) > settings.INFORMER_MAX_OBJECTS:
+            raise _TooLarge(len(items))
+
+        kind = resource.kind
+        store = {}
+        for raw in items:
+            name = (raw.get("metadata") or {}).get("name")
+            if name:
+                # LIST items omit apiVersion/kind; WATCH objects carry them
+                raw.setdefault("apiVersion", payload.get("apiVersion") or api_version)
+                raw.setdefault("kind", kind)
+                store[name] = raw
+
+        with self.lock:
+            self.store = store
+            self.list_kind = payload.get("kind") or f"{kind}List"
+            self.resource_version = (payload.get("metadata") or {}).get("resourceVersion")
+            self.synced_at = time.monotonic()
+
+    def _apply(self, event: Dict[str, Any]) -> None:
+        raw = event.get("raw_object") or {}
+        md = raw.get("metadata") or {}
+        etype = event.get("type")
+        grew = False
+        with self.lock:
+            if etype in {"ADDED", "MODIFIED"} and md.get("name"):
+                grew = md["name"] not in self.store
+                self.store[md["name"]] = raw
+            elif etype == "DELETED" and md.get("name"):
+                self.store.pop(md["name"], None)
+            if md.get("resourceVersion"):
+                self.resource_version = md["resourceVersion"]
+            self.synced_at = time.monotonic()
+        if grew:
+            # May evict this informer too; run() then sees it stopped
+            _registry.enforce_cap()
+
+    def run(self) -> None:
+        namespace, api_version, plural = self.key
+        backoff = 1.0
+        while not self.stopped.is_set():
+            if time.monotonic() - self.last_access > settings.INFORMER_IDLE_SECONDS:
+                logger.info("informer idle, stopping watch: %s", "/".join(self.key))
+                break
+            try:
+                from kubernetes import watch
+
+                resource = get_resource(load_dynamic_client(), api_version, plural)
+                self.watcher = watch.Watch()
+                for event in resource.watch(
+                    namespace=namespace,
+                    resource_version=self.resource_version,
+                    timeout=settings.INFORMER_WATCH_TIMEOUT_SECONDS,
+                    watcher=self.watcher,
+                    allow_watch_bookmarks=True,
+                ):
+                    self._apply(event)
+                    if self.stopped.is_set():
+                        break
+                # A clean timeout means the store was current up to now
+                with self.lock:
+                    self.synced_at = time.monotonic()
+                backoff = 1.0
+            except Exception as e:
+                if getattr(e, "status", None) == HTTP_GONE:
+                    # resourceVersion too old: start over from a fresh LIST
+                    try:
+                        self.relist()
+                        continue
+                    except Exception as relist_error:
+                        e = relist_error
+                logger.warning("informer watch failed for %s: %s", "/".join(self.key), e)
+                self.stopped.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+        _registry.discard(self)
+
+    # --- reads (event loop) ---
+
+    def fresh(self) -> bool:
+        if not self.ready.is_set() or self.stopped.is_set():
+            return False
+        return time.monotonic() - self.synced_at <= settings.INFORMER_MAX_STALENESS_SECONDS
+
+    def snapshot(self) -> Dict[str, Any]:
+        _, api_version, _ = self.key
+        with self.lock:
+            items = [self.store[name] for name in sorted(self.store)]
+            return {
+                "apiVersion": api_version,
+                "kind": self.list_kind,
+                "metadata": {"resourceVersion": self.resource_version},
+                "items": items,
+            }
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            return self.store.get(name)
+
+    def size(self) -> int:
+        with self.lock:
+            return len(self.store)
+
+    def stop(self) -> None:
+        self.stopped.set()
+        if self.watcher is not None:
+            self.watcher.stop()
+
+
+class _TooLarge(Exception):
+    pass
+
+
+class _Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.informers: Dict[InformerKey, _Informer] = {}
+        # Collections too large to cache, with the time they were measured
+        self.too_large: Dict[InformerKey, float] = {}
+
+    def discard(self, inf: _Informer) -> None:
+        inf.stop()
+        with self.lock:
+            if self.informers.get(inf.key) is inf:
+                del self.informers[inf.key]
+
+    def total_objects(self) -> int:
+        with self.lock:
+            informers = list(self.informers.values())
+        return sum(inf.size() for inf in informers)
+
+    def enforce_cap(self) -> None:
+        """Stop least-recently-read informers until under the object cap."""
+        while self.total_objects() > settings.INFORMER_MAX_OBJECTS:
+            with self.lock:
+                if not self.informers:
+                    return
+                victim = min(self.informers.values(), key=lambda i: i.last_access)
+                if victim.size() > settings.INFORMER_MAX_OBJECTS:
+                    # Grew past the cap on its own: not worth watching again soon
+                    self.too_large[victim.key] = time.monotonic()
+            logger.info("informer cache over cap, evicting %s", "/".join(victim.key))
+            self.discard(victim)
+
+    def stop_all(self) -> None:
+        with self.lock:
+            informers = list(self.informers.values())
+            self.informers.clear()
+        for inf in informers:
+            inf.stop()
+
+
+_registry = _Registry()
+
+
+async def _informer_for(tool_name: str, key: InformerKey) -> Optional[_Informer]:
+    now = time.monotonic()
+    with _registry.lock:
+        inf = _registry.informers.get(key)
+        if inf is None:
+            measured = _registry.too_large.get(key)
+            if measured is not None and now - measured < settings.INFORMER_IDLE_SECONDS:
+                return None
+            inf = _Informer(key)
+            _registry.informers[key] = inf
+            created = True
+        else:
+            created = False
+    inf.last_access = now
+
+    if not created:
+        return inf if inf.fresh() else None
+
+    try:
+        await run_blocking(tool_name, inf.relist)
+    except _TooLarge:
+        with _registry.lock:
+            _registry.too_large[key] = now
+        _registry.discard(inf)
+        return None
+    except Exception as e:
+        logger.warning("informer list failed for %s: %s", "/".join(key), e)
+        _registry.discard(inf)
+        return None
+
+    inf.ready.set()
+    threading.Thread(target=inf.run, name=f"informer-{'/'.join(key)}", daemon=True).start()
+    _registry.enforce_cap()
+    return inf if inf.fresh() else None
+
+
+def enabled() -> bool:
+    return settings.INFORMERS_ENABLED
+
+
+async def read_list(tool_name: str, namespace: str, api_version: str, plural: str) -> Optional[Dict[str, Any]]:
+    """Collection from the informer store, or None if the caller must read the API."""
+    inf = await _informer_for(tool_name, (namespace, api_version, plural))
+    return inf.snapshot() if inf else None
+
+
+async def read_object(
+    tool_name: str, namespace: str, name: str, api_version: str, plural: str
+) -> Optional[Dict[str, Any]]:
+    """Object from the informer store, or None if the caller must read the API."""
+    inf = await _informer_for(tool_name, (namespace, api_version, plural))
+    return inf.get(name) if inf else None
+
+
+def stats() -> Dict[str, int]:
+    with _registry.lock:
+        informers = list(_registry.informers.values())
+    return {
+        "informers": len(informers),
+        "objects": sum(inf.size() for inf in informers),
+    }
+
+
+def stop_informers() -> None:
+    """Stop all watches. Called once from server shutdown."""
+    _registry.stop_all()
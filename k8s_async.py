@@ -0,0 +1,168 @@
+import ssl
+import asyncio
+import logging
+import importlib.util
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import metrics
+import settings
+from k8s_executor import run_blocking
+from k8s_resource import get_api_client
+
+try:
+    import httpx
+except ImportError:  # optional dependency
+    httpx = None
+
+logger = logging.getLogger("mcp-k8s-agent")
+# httpx logs every request at INFO
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+# -----------------------------
+# Native async read transport
+# -----------------------------
+# Speaks the REST paths from k8s_resource.resource_path() over one shared
+# httpx.AsyncClient (HTTP/2 when `h2` is installed), so in-flight reads share
+# the event loop instead of holding a thread each. Selected with
+# MCP_K8S_READ_TRANSPORT=async; the kubernetes-client path stays the default.
+class K8sApiError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(f"({status}) {message}")
+        self.status = status
+
+
+_client: Optional["httpx.AsyncClient"] = None
+_client_key: Optional[Tuple[int, int]] = None
+# Concurrency bucket (k8s_executor) for this module's own blocking calls:
+# kubeconfig reloads, credential refresh hooks, reading TLS files
+_IO_BUCKET = "k8s_async"
+_warned = False
+
+
+def enabled() -> bool:
+    global _warned
+    if settings.READ_TRANSPORT != "async":
+        return False
+    if httpx is None:
+        if not _warned:
+            logger.warning("MCP_K8S_READ_TRANSPORT=async requires httpx; using kubernetes client")
+            _warned = True
+        return False
+    return True
+
+
+def _ssl_context(cfg) -> Any:
+    if not cfg.verify_ssl:
+        return False
+    ctx = ssl.create_default_context(cafile=cfg.ssl_ca_cert)
+    if cfg.cert_file:
+        ctx.load_cert_chain(cfg.cert_file, cfg.key_file)
+    return ctx
+
+
+def _new_client(cfg) -> "httpx.AsyncClient":
+    with metrics.phase("client"):
+        return httpx.AsyncClient(
+            base_url=cfg.host,
+            verify=_ssl_context(cfg),
+            http2=importlib.util.find_spec("h2") is not None,
+            limits=httpx.Limits(
+                max_connections=settings.K8S_POOL_MAXSIZE,
+                max_keepalive_connections=settings.K8S_POOL_MAXSIZE,
+            ),
+            timeout=httpx.Timeout(settings.ASYNC_TIMEOUT_SECONDS),
+        )
+
+
+async def _get_client() -> Tuple["httpx.AsyncClient", Any]:
+    """Shared AsyncClient, rebuilt when the kubeconfig or event loop changes."""
+    global _client, _client_key
+    # get_api_client() may reload the kubeconfig; keep it off the event loop
+    api_client = await run_blocking(_IO_BUCKET, get_api_client)
+    cfg = api_client.configuration
+    key = (id(api_client), id(asyncio.get_running_loop()))
+    if _client is None or _client_key != key:
+        new = await run_blocking(_IO_BUCKET, _new_client, cfg)
+        if _client_key == key:  # another caller rebuilt it meanwhile
+            await new.aclose()
+            return _client, cfg
+        old, old_key = _client, _client_key
+        _client, _client_key = new, key
+        # A client of a retired config is closed; one from a closed loop
+        # cannot be, and its connections are dropped with it
+        if old is not None and old_key is not None and old_key[1] == key[1]:
+            await old.aclose()
+    return _client, cfg
+
+
+async def _headers(cfg, accept: str) -> Dict[str, str]:
+    headers = {"Accept": accept}
+    # auth_settings() runs the kubeconfig refresh hook for expiring tokens,
+    # which can exec a credential plugin
+    auth = await run_blocking(_IO_BUCKET, cfg.auth_settings)
+    bearer = auth.get("BearerToken")
+    if bearer and bearer.get("value"):
+        headers["Authorization"] = bearer["value"]
+    return headers
+
+
+def _raise_for_status(resp: "httpx.Response") -> None:
+    if resp.is_success:
+        return
+    message = resp.reason_phrase
+    try:
+        message = resp.json().get("message") or message
+    except ValueError:
+        pass
+    raise K8sApiError(resp.status_code, message)
+
+
+def _query(params: Optional[Dict[str, Any]]) -> List[Tuple[str, str]]:
+    out = []
+    for k, v in (params or {}).items():
+        if v is None:
+            continue
+        if isinstance(v, bool):
+            v = "true" if v else "false"
+        out.append((k, str(v)))
+    return out
+
+
+async def get_json(path: str, params: Optional[Dict[str, Any]] = None, accept: str = "application/json") -> Dict[str, Any]:
+    client, cfg = await _get_client()
+    headers = await _headers(cfg, accept)
+    with metrics.phase("api"):
+        resp = await client.get(path, params=_query(params), headers=headers)
+        _raise_for_status(resp)
+        return resp.json()
+
+
+async def get_text(path: str, params: Optional[Dict[str, Any]] = None) -> str:
+    client, cfg = await _get_client()
+    headers = await _headers(cfg, "*/*")
+    with metrics.phase("api"):
+        resp = await client.get(path, params=_query(params), headers=headers)
+        _raise_for_status(resp)
+        return resp.text
+
+
+async def stream_bytes(path: str, params: Optional[Dict[str, Any]] = None, accept: str = "*/*") -> AsyncIterator[bytes]:
+    """Response body in chunks as it arrives; closing the generator drops the request."""
+    client, cfg = await _get_client()
+    headers = await _headers(cfg, accept)
+    async with client.stream("GET", path, params=_query(params), headers=headers) as resp:
+        if not resp.is_success:
+            await resp.aread()
+            _raise_for_status(resp)
+        async for chunk in resp.aiter_bytes():
+            yield chunk
+
+
+async def close() -> None:
+    """Release pooled connections. Called once from server shutdown."""
+    global _client, _client_key
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+        _client_key = None
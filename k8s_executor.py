@@ -0,0 +1,82 @@
+import time
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+import metrics
+import settings
+
+
+# -----------------------------
+# Blocking Kubernetes I/O pool
+# -----------------------------
+# The kubernetes client is synchronous. Tool coroutines hand every blocking
+# call to this pool so the event loop keeps serving other MCP requests, and a
+# per-tool semaphore stops one tool (e.g. slow log reads) from taking every
+# worker.
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+_semaphores: Dict[str, asyncio.Semaphore] = {}
+_semaphores_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.K8S_IO_WORKERS,
+                thread_name_prefix="k8s-io",
+            )
+        return _executor
+
+
+def _semaphore(tool_name: str) -> asyncio.Semaphore:
+    global _semaphores_loop
+    loop = asyncio.get_running_loop()
+    if _semaphores_loop is not loop:
+        # Semaphores bind to the loop they are first awaited on
+        _semaphores.clear()
+        _semaphores_loop = loop
+
+    sem = _semaphores.get(tool_name)
+    if sem is None:
+        limit = settings.TOOL_CONCURRENCY.get(tool_name, settings.TOOL_CONCURRENCY_DEFAULT)
+        sem = asyncio.Semaphore(max(1, limit))
+        _semaphores[tool_name] = sem
+    return sem
+
+
+async def run_blocking(tool_name: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a blocking Kubernetes call on the I/O pool, bounded by the tool's
+    concurrency limit. Context variables are carried into the worker thread.
+    """
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+
+    def call() -> Any:
+        # Waiting for a free worker counts as queueing, like the semaphore
+        ctx.run(metrics.record, "queue", time.perf_counter() - submitted)
+        return ctx.run(fn, *args, **kwargs)
+
+    sem = _semaphore(tool_name)
+    with metrics.phase("queue"):
+        await sem.acquire()
+    try:
+        submitted = time.perf_counter()
+        return await loop.run_in_executor(_get_executor(), call)
+    finally:
+        sem.release()
+
+
+def shutdown_executor() -> None:
+    """Stop the I/O pool. Called once from server shutdown."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
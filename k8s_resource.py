@@ -1,7 +1,29 @@
+from __future__ import annotations
+
+import os
 import json
-from typing import Optional
-from kubernetes import client, config
-from kubernetes.dynamic import DynamicClient
+import time
+import hashlib
+import logging
+import tempfile
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+import metrics
+import settings
+from gate import FORBIDDEN_KINDS, FORBIDDEN_PLURALS, ForbiddenKind
+
+if TYPE_CHECKING:
+    from kubernetes import client
+    from kubernetes.dynamic import DynamicClient, LazyDiscoverer
+    from kubernetes.dynamic.resource import Resource
+
+logger = logging.getLogger("mcp-k8s-agent")
+
+# The kubernetes package (about a second of imports, mostly generated
+# models) is imported on first use, not at module load, so the server can
+# answer initialize/list_tools before it is loaded; see prewarm().
 
 
 # Fallback: plural -> kind (covers built-ins + common resources)
@@ -38,32 +60,389 @@ PLURAL_TO_KIND = {
 }
 
 
-def load_dynamic_client() -> DynamicClient:
+# -----------------------------
+# Process-wide client registry
+# -----------------------------
+# One ApiClient (and its urllib3 pool) + one DynamicClient per process.
+# Rebuilt only when the kubeconfig files change on disk; token expiry is
+# handled by the refresh hook installed by load_kube_config().
+_lock = threading.Lock()
+_api_client: Optional[client.ApiClient] = None
+_dynamic: Optional[DynamicClient] = None
+_stamp: Optional[Tuple] = None
+_checked_at = 0.0
+_retired: List[client.ApiClient] = []
+
+
+def _kubeconfig_paths() -> List[str]:
+    raw = os.environ.get("KUBECONFIG") or "~/.kube/config"
+    # os.pathsep is what kube_config.ENV_KUBECONFIG_PATH_SEPARATOR is
+    return [os.path.expanduser(p) for p in raw.split(os.pathsep) if p]
+
+
+def _kubeconfig_stamp() -> Tuple:
+    stamp = []
+    for path in _kubeconfig_paths():
+        try:
+            st = os.stat(path)
+            stamp.append((path, st.st_mtime_ns, st.st_size))
+        except OSError:
+            stamp.append((path, None, None))
+    return tuple(stamp)
+
+
+def _build_api_client() -> client.ApiClient:
+    from kubernetes import client, config
+
+    cfg = client.Configuration()
     # Uses local kubeconfig (same as existing code)
-    config.load_kube_config()
-    return DynamicClient(client.ApiClient())
+    config.load_kube_config(client_configuration=cfg)
+    cfg.connection_pool_maxsize = settings.K8S_POOL_MAXSIZE
+    return client.ApiClient(configuration=cfg)
+
+
+def _refresh_if_stale() -> None:
+    """Caller must hold _lock."""
+    global _api_client, _dynamic, _stamp, _checked_at
+
+    now = time.monotonic()
+    if _api_client is not None and now - _checked_at < settings.KUBECONFIG_RECHECK_SECONDS:
+        return
+    _checked_at = now
+
+    stamp = _kubeconfig_stamp()
+    if _api_client is not None and stamp == _stamp:
+        return
+
+    api_client = _build_api_client()
+    if _api_client is not None:
+        # In-flight calls may still hold the old pool; close it at shutdown.
+        _retired.append(_api_client)
+    _api_client = api_client
+    _dynamic = None
+    _stamp = stamp
+
+
+def get_api_client() -> client.ApiClient:
+    with metrics.phase("client"), _lock:
+        _refresh_if_stale()
+        return _api_client
+
+
+class _DeferredDiscoverer:
+    """
+    Postpones LazyDiscoverer construction (which fetches /version, /api and
+    /apis) until something actually touches dyn.resources. The discovery
+    index below resolves resources without it, so it is only built on fallback.
+    """
+
+    def __init__(self, dyn: DynamicClient, cache_file: Optional[str]):
+        self._dyn = dyn
+        self._cache_file = cache_file
+        self._inner: Optional[LazyDiscoverer] = None
+        self._inner_lock = threading.Lock()
+
+    def __getattr__(self, name: str):
+        with self._inner_lock:
+            if self._inner is None:
+                from kubernetes.dynamic import LazyDiscoverer
+
+                self._inner = LazyDiscoverer(self._dyn, self._cache_file)
+        return getattr(self._inner, name)
+
+
+def load_dynamic_client() -> DynamicClient:
+    global _dynamic
+    with metrics.phase("client"), _lock:
+        _refresh_if_stale()
+        if _dynamic is None:
+            from kubernetes.dynamic import DynamicClient
+
+            _dynamic = DynamicClient(_api_client, discoverer=_DeferredDiscoverer)
+        return _dynamic
+
+
+def core_v1_api() -> client.CoreV1Api:
+    from kubernetes.client import CoreV1Api
+
+    return CoreV1Api(get_api_client())
+
+
+def close_clients() -> None:
+    """Release pooled connections. Called once from server shutdown."""
+    global _api_client, _dynamic, _stamp
+    with _lock:
+        for api_client in _retired + ([_api_client] if _api_client else []):
+            try:
+                api_client.close()
+            except Exception:
+                pass
+        _retired.clear()
+        _api_client = None
+        _dynamic = None
+        _stamp = None
 
 
 def api_version_of(group: str, version: str) -> str:
     return f"{group}/{version}" if group else version
 
 
+def _path_segment(val: str, what: str) -> str:
+    val = (val or "").strip()
+    if not val or val in {".", ".."} or "/" in val:
+        raise ValueError(f"Invalid {what}: '{val}'")
+    return quote(val, safe="")
+
+
+def resource_path(
+    group: str,
+    version: str,
+    namespace: str,
+    plural: str,
+    name: Optional[str] = None,
+    subresource: Optional[str] = None,
+) -> str:
+    """
+    REST path for a namespaced resource, e.g.
+    /apis/apps/v1/namespaces/default/deployments/web
+    """
+    group = (group or "").strip()
+    base = f"/apis/{_path_segment(group, 'group')}/" if group else "/api/"
+    path = (
+        f"{base}{_path_segment(version, 'version')}"
+        f"/namespaces/{_path_segment(namespace, 'namespace')}"
+        f"/{_path_segment(plural.lower(), 'plural')}"
+    )
+    if name:
+        path += f"/{_path_segment(name, 'name')}"
+    if subresource:
+        path += f"/{_path_segment(subresource, 'subresource')}"
+    return path
+
+
+# -----------------------------
+# Discovery index
+# -----------------------------
+# (api_version, plural) -> raw APIResource dict, plus an alias table keyed
+# by (api_version, kind/singular/short name). Filled one group-version at a
+# time (a single GET of /api/v1 or /apis/<group>/<version>), refreshed on TTL
+# expiry or on a miss, and persisted per cluster so cold starts skip discovery.
+_index_lock = threading.Lock()
+_index_host: Optional[str] = None
+_by_plural: Dict[Tuple[str, str], Dict[str, Any]] = {}
+_by_alias: Dict[Tuple[str, str], str] = {}
+_fetched_at: Dict[str, float] = {}
+_resolved: Dict[Tuple[str, str], Resource] = {}
+_stats = {"hits": 0, "misses": 0, "refreshes": 0, "errors": 0}
+
+
+def _discovery_cache_path(host: str) -> str:
+    digest = hashlib.sha1(host.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(os.path.expanduser(settings.DISCOVERY_CACHE_DIR), f"discovery-{digest}.json")
+
+
+def _index_group_version(api_version: str, group_version: Dict[str, Any], fetched_at: float) -> None:
+    """Caller must hold _index_lock."""
+    for key in [k for k in _by_plural if k[0] == api_version]:
+        del _by_plural[key]
+    for key in [k for k in _by_alias if k[0] == api_version]:
+        del _by_alias[key]
+    for key in [k for k in _resolved if k[0] == api_version]:
+        del _resolved[key]
+
+    subresources: Dict[str, Dict[str, Any]] = {}
+    for res in group_version.get("resources", []):
+        if "/" in res.get("name", ""):
+            parent, sub = res["name"].split("/", 1)
+            subresources.setdefault(parent, {})[sub] = res
+
+    for res in group_version.get("resources", []):
+        name = res.get("name", "")
+        if not name or "/" in name:
+            continue
+        entry = dict(res)
+        entry["subresources"] = subresources.get(name)
+        _by_plural[(api_version, name)] = entry
+        aliases = [res.get("kind", ""), res.get("singularName", "")] + list(res.get("shortNames") or [])
+        for alias in aliases:
+            if alias:
+                _by_alias.setdefault((api_version, alias.lower()), name)
+
+    _fetched_at[api_version] = fetched_at
+
+
+def _load_index_file(host: str) -> None:
+    """Caller must hold _index_lock."""
+    try:
+        with open(_discovery_cache_path(host), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return
+    for api_version, item in (data.get("groupVersions") or {}).items():
+        _index_group_version(api_version, item.get("list") or {}, float(item.get("fetchedAt", 0)))
+
+
+def _save_index_file(host: str) -> None:
+    """Caller must hold _index_lock."""
+    group_versions: Dict[str, Dict[str, Any]] = {}
+    for (api_version, _), entry in _by_plural.items():
+        gv = group_versions.setdefault(
+            api_version, {"fetchedAt": _fetched_at.get(api_version, 0), "list": {"resources": []}}
+        )
+        res = {k: v for k, v in entry.items() if k != "subresources"}
+        gv["list"]["resources"].append(res)
+        gv["list"]["resources"].extend((entry.get("subresources") or {}).values())
+
+    path = _discovery_cache_path(host)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".discovery-")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"host": host, "groupVersions": group_versions}, f)
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.debug("discovery cache not written: %s", e)
+
+
+def _fetch_group_version(dyn: DynamicClient, api_version: str) -> Dict[str, Any]:
+    path = f"/apis/{api_version}" if "/" in api_version else f"/api/{api_version}"
+    resp = dyn.request("GET", path, serialize=False)
+    return json.loads(resp.data)
+
+
+def _refresh_group_version(dyn: DynamicClient, api_version: str) -> bool:
+    """Caller must hold _index_lock. Returns False if discovery failed."""
+    try:
+        group_version = _fetch_group_version(dyn, api_version)
+    except Exception as e:
+        _stats["errors"] += 1
+        logger.debug("discovery of %s failed: %s", api_version, e)
+        return False
+    _stats["refreshes"] += 1
+    _index_group_version(api_version, group_version, time.time())
+    _save_index_file(_index_host)
+    return True
+
+
+def _lookup(api_version: str, plural: str) -> Optional[Dict[str, Any]]:
+    """Caller must hold _index_lock."""
+    entry = _by_plural.get((api_version, plural))
+    if entry is None:
+        name = _by_alias.get((api_version, plural.lower()))
+        if name:
+            entry = _by_plural.get((api_version, name))
+    return entry
+
+
+def _use_index_of(host: str) -> None:
+    """Caller must hold _index_lock. Switch the index to `host`'s, loading it from disk."""
+    global _index_host
+    if host != _index_host:
+        _by_plural.clear()
+        _by_alias.clear()
+        _fetched_at.clear()
+        _resolved.clear()
+        _index_host = host
+        _load_index_file(host)
+
+
+def _resolve_indexed(dyn: DynamicClient, api_version: str, plural: str) -> Optional[Resource]:
+    host = dyn.configuration.host
+    with _index_lock:
+        _use_index_of(host)
+
+        cached = _resolved.get((api_version, plural))
+        fetched_at = _fetched_at.get(api_version)
+        fresh = fetched_at is not None and time.time() - fetched_at < settings.DISCOVERY_TTL_SECONDS
+        if fresh and cached is not None and cached.client is dyn:
+            _stats["hits"] += 1
+            return cached
+
+        entry = _lookup(api_version, plural) if fresh else None
+        if entry is None:
+            _stats["misses"] += 1
+            # Refresh on TTL expiry, or on a miss once the entry is old enough
+            # that a newly installed CRD could plausibly be missing from it.
+            recent = fetched_at is not None and time.time() - fetched_at < settings.DISCOVERY_MISS_REFRESH_SECONDS
+            if not recent or not fresh:
+                if not _refresh_group_version(dyn, api_version):
+                    return None
+            entry = _lookup(api_version, plural)
+            if entry is None:
+                return None
+        else:
+            _stats["hits"] += 1
+
+        from kubernetes.dynamic.resource import Resource
+
+        group, _, version = api_version.rpartition("/")
+        fields = {k: v for k, v in entry.items() if k not in {"prefix", "group", "api_version", "client", "preferred"}}
+        resource = Resource(
+            prefix="apis" if group else "api",
+            group=group,
+            api_version=version,
+            client=dyn,
+            **fields,
+        )
+        _resolved[(api_version, plural)] = resource
+        return resource
+
+
+def discovery_stats() -> Dict[str, int]:
+    with _index_lock:
+        stats = dict(_stats)
+        stats["indexed_resources"] = len(_by_plural)
+        stats["indexed_group_versions"] = len(_fetched_at)
+        return stats
+
+
+metrics.register_stats("discovery", "Discovery index", discovery_stats, counters=("hits", "misses", "refreshes", "errors"))
+
+
+def _check_allowed(resource: Any, plural: str) -> Any:
+    """
+    The gate sees the caller's spelling of the resource; short names, kinds
+    and singulars ("cm", "ConfigMap", "secret") only become the real plural
+    here, so the forbidden lists are checked again on what was resolved.
+    """
+    name = (getattr(resource, "name", None) or "").lower()
+    kind = (getattr(resource, "kind", None) or "").lower()
+    if name in FORBIDDEN_PLURALS or kind in FORBIDDEN_KINDS:
+        raise ForbiddenKind(f"Access to plural '{plural}' is forbidden")
+    return resource
+
+
 def get_resource(dyn: DynamicClient, api_version: str, plural: str):
     """
-    Resolve a Kubernetes resource via discovery.
+    Resolve a Kubernetes resource via the discovery index.
     Works with kubernetes client v34.1.0+ (same as your existing helper).
+    Raises gate.ForbiddenKind when it resolves to a forbidden resource.
+    """
+    with metrics.phase("discovery"):
+        resource = _resolve_indexed(dyn, api_version, plural)
+        if resource is not None:
+            return _check_allowed(resource, plural)
+
+        # Fallback: kind lookup
+        kind = PLURAL_TO_KIND.get(plural.lower())
+        if kind:
+            return _check_allowed(dyn.resources.get(api_version=api_version, kind=kind), plural)
+
+    raise ValueError(f"Cannot resolve resource for plural='{plural}' api_version='{api_version}'")
+
+
+# -----------------------------
+# Background pre-warm
+# -----------------------------
+def prewarm() -> None:
+    """
+    Import the kubernetes client, load kubeconfig and the persisted discovery
+    index ahead of the first tool call. Runs on the I/O pool once the MCP
+    handshake is done; failures are left for that first call to report.
     """
-    # Try searching available resources
     try:
-        for resource in dyn.resources.search(api_version=api_version):
-            if resource.name == plural:
-                return resource
-    except Exception:
-        pass
-
-    # Fallback: kind lookup
-    kind = PLURAL_TO_KIND.get(plural.lower())
-    if kind:
-        return dyn.resources.get(api_version=api_version, kind=kind)
-
-    raise ValueError(f"Cannot resolve resource for plural='{plural}' api_version='{api_version}'")
\ No newline at end of file
+        dyn = load_dynamic_client()
+        with _index_lock:
+            _use_index_of(dyn.configuration.host)
+    except Exception as e:
+        logger.debug("pre-warm failed: %s", e)
@@ -0,0 +1,136 @@
+import codecs
+import json
+from typing import Any, AsyncIterable, Callable, Dict, Iterable, Iterator
+
+CHUNK_BYTES = 64 * 1024
+
+# Consumed input is dropped from the buffer once this much has piled up
+_COMPACT_CHARS = 256 * 1024
+
+_WHITESPACE = " \t\n\r"
+
+
+# -----------------------------
+# Streaming list decoding
+# -----------------------------
+# A list response ({"kind": ..., "metadata": ..., "items": [...]}) is decoded
+# as it arrives: each element of "items" is handed out as soon as it is
+# complete, the other top-level keys are kept in `envelope`. The caller can
+# shrink every item (prune, project) before the next one is read, so the
+# whole raw collection is never held at once; only the current item and
+# the undecoded tail of the input are buffered.
+class ListDecoder:
+    def __init__(self):
+        self.envelope: Dict[str, Any] = {}
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._decode = json.JSONDecoder().raw_decode
+        self._buf = ""
+        self._pos = 0
+        self._state = "start"  # start, key, colon, value, items, done
+        self._key = ""
+        self._closed = False
+
+    def feed(self, chunk: bytes) -> Iterator[Dict[str, Any]]:
+        """Consume one chunk; yields the list items completed by it."""
+        if self._pos > _COMPACT_CHARS:
+            self._buf, self._pos = self._buf[self._pos :], 0
+        self._buf += self._text.decode(chunk)
+        return self._parse()
+
+    def close(self) -> Iterator[Dict[str, Any]]:
+        """End of input; yields what is left and checks the body was complete."""
+        self._buf += self._text.decode(b"", final=True)
+        self._closed = True
+        yield from self._parse()
+        if self._state != "done":
+            raise ValueError("Truncated or malformed list response")
+
+    def _skip(self) -> bool:
+        """Advance past whitespace; False if the buffer ran out."""
+        buf, pos = self._buf, self._pos
+        while pos < len(buf) and buf[pos] in _WHITESPACE:
+            pos += 1
+        self._pos = pos
+        return pos < len(buf)
+
+    def _value(self) -> Any:
+        """Decode the JSON value at the cursor, or raise EOFError if it may be incomplete."""
+        try:
+            value, end = self._decode(self._buf, self._pos)
+        except json.JSONDecodeError:
+            if self._closed:
+                raise ValueError("Malformed list response") from None
+            raise EOFError from None
+        # A number at the very end of the buffer may continue in the next chunk
+        if end == len(self._buf) and not self._closed:
+            raise EOFError
+        self._pos = end
+        return value
+
+    def _expect(self, char: str) -> None:
+        if self._buf[self._pos] != char:
+            raise ValueError(f"Malformed list response: expected '{char}' at offset {self._pos}")
+        self._pos += 1
+
+    def _parse(self) -> Iterator[Dict[str, Any]]:
+        try:
+            while self._state != "done" and self._skip():
+                char = self._buf[self._pos]
+                if self._state == "start":
+                    self._expect("{")
+                    self._state = "key"
+                elif self._state == "key":
+                    if char == "}":
+                        self._pos += 1
+                        self._state = "done"
+                    elif char == ",":
+                        self._pos += 1
+                    else:
+                        self._key = self._value()
+                        self._state = "colon"
+                elif self._state == "colon":
+                    self._expect(":")
+                    self._state = "value"
+                elif self._state == "value":
+                    if self._key == "items" and char == "[":
+                        self._pos += 1
+                        self._state = "items"
+                    else:
+                        self.envelope[self._key] = self._value()
+                        self._state = "key"
+                else:  # items
+                    if char == "]":
+                        self._pos += 1
+                        self._state = "key"
+                    elif char == ",":
+                        self._pos += 1
+                    else:
+                        yield self._value()
+        except EOFError:
+            return
+
+
+def decode_list(chunks: Iterable[bytes], on_item: Callable[[Dict[str, Any], Dict[str, Any]], None]) -> Dict[str, Any]:
+    """
+    Decode a list response from `chunks`, calling on_item(item, envelope) for
+    each item as it arrives; returns the envelope (everything but "items").
+    """
+    decoder = ListDecoder()
+    for chunk in chunks:
+        for item in decoder.feed(chunk):
+            on_item(item, decoder.envelope)
+    for item in decoder.close():
+        on_item(item, decoder.envelope)
+    return decoder.envelope
+
+
+async def decode_list_async(
+    chunks: AsyncIterable[bytes], on_item: Callable[[Dict[str, Any], Dict[str, Any]], None]
+) -> Dict[str, Any]:
+    decoder = ListDecoder()
+    async for chunk in chunks:
+        for item in decoder.feed(chunk):
+            on_item(item, decoder.envelope)
+    for item in decoder.close():
+        on_item(item, decoder.envelope)
+    return decoder.envelope
@@ -0,0 +1,275 @@
+import re
+import contextlib
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+import k8s_async
+import metrics
+import settings
+from constants import LOG_LEVELS
+from k8s_resource import core_v1_api, resource_path
+from sanitize import MAX_LINES, SanitizedText, redact_text
+
+CHUNK_BYTES = 64 * 1024
+LINE_TRUNCATED = " [line truncated]"
+
+
+# -----------------------------
+# Streaming pod-log pipeline
+# -----------------------------
+# Pod logs are read as a byte stream and cut into lines as they arrive; each
+# line is redacted on its own and the read stops as soon as the output holds
+# MAX_LINES lines or the byte budget (limit_bytes) is used up. Memory is
+# bounded by the output itself plus one line (LOG_MAX_LINE_BYTES), however
+# large the container log is.
+class LogBuffer:
+    def __init__(self, budget: int, max_lines: int = MAX_LINES, max_line_bytes: Optional[int] = None):
+        self.budget = budget
+        self.max_lines = max_lines
+        self.max_line_bytes = max_line_bytes or settings.LOG_MAX_LINE_BYTES
+        self.lines: List[str] = []
+        self.truncated = False
+        self._read = 0
+        self._pending = b""
+        self._skipping = False  # inside the remainder of an over-long line
+
+    def _take(self, line: str) -> bool:
+        if len(self.lines) >= self.max_lines:
+            self.truncated = True
+            return False
+        self.lines.append(line)
+        return True
+
+    def _emit(self, batch: List[Tuple[bytes, bool]]) -> bool:
+        """Redact and keep complete lines, given as (raw bytes, was cut)."""
+        texts = [raw.decode("utf-8", errors="replace") for raw, _ in batch]
+        # One redaction pass over the whole batch: when it changes nothing, no
+        # single line needs redacting (matches never span a newline)
+        block = "\n".join(texts)
+        with metrics.phase("sanitize"):
+            clean = redact_text(block) == block
+            lines = [
+                (line if clean else redact_text(line), cut)
+                for text, (_, cut) in zip(texts, batch)
+                for line in text.splitlines() or [""]
+            ]
+        for line, cut in lines:
+            if not self._take(line + LINE_TRUNCATED if cut else line):
+                return False
+        return True
+
+    def feed(self, chunk: bytes) -> bool:
+        """Consume one chunk; False once no more input is wanted."""
+        if self._read + len(chunk) > self.budget:
+            chunk = chunk[: self.budget - self._read]
+        self._read += len(chunk)
+
+        parts = chunk.split(b"\n")
+        batch = []
+        for i, part in enumerate(parts):
+            complete = i < len(parts) - 1
+            if self._skipping:
+                self._skipping = not complete
+                continue
+            if self._pending:
+                part, self._pending = self._pending + part, b""
+            if len(part) > self.max_line_bytes:
+                batch.append((part[: self.max_line_bytes], True))
+                self._skipping = not complete
+            elif complete:
+                batch.append((part, False))
+            else:
+                self._pending = part
+        if batch and not self._emit(batch):
+            return False
+
+        if self._read >= self.budget:
+            # The API stops at limitBytes too; the partial last line is kept
+            self.truncated = True
+            self.finish()
+            return False
+        return True
+
+    def finish(self) -> None:
+        if self._pending:
+            line, self._pending = self._pending, b""
+            self._emit([(line, False)])
+
+    def result(self) -> SanitizedText:
+        text = "\n".join(self.lines)
+        if self.truncated:
+            text += "\n\n[Output truncated]"
+        return SanitizedText(text)
+
+
+# -----------------------------
+# Log search (k8s_pod_logs_grep)
+# -----------------------------
+# Lines are matched after redaction, so a pattern cannot be used to probe
+# for redacted secrets. Only matches and their context lines are kept.
+# One pattern per constants.LOG_LEVELS entry
+_LEVEL_PATTERNS = {
+    "fatal": r"\b(?:fatal|panic|critical|crit|emerg|emergency)\b|(?:^|\s)F\d{4} \d",
+    "error": r"\b(?:error|severe|exception)\b|(?:^|\s)E\d{4} \d",
+    "warn": r"\b(?:warn|warning)\b|(?:^|\s)W\d{4} \d",
+    "info": r"\binfo\b|(?:^|\s)I\d{4} \d",
+    "debug": r"\b(?:debug|trace)\b",
+}
+
+
+def level_regex(level: str) -> "re.Pattern":
+    """Lines logged at `level` or anything more severe (plain, JSON or klog)."""
+    upto = LOG_LEVELS[: LOG_LEVELS.index(level) + 1]
+    return re.compile("|".join(f"(?:{_LEVEL_PATTERNS[name]})" for name in upto), re.IGNORECASE)
+
+
+def compile_matcher(pattern: Optional[str], level: Optional[str], ignore_case: bool = False) -> Callable[[str], bool]:
+    tests = []
+    if pattern:
+        tests.append(re.compile(pattern, re.IGNORECASE if ignore_case else 0).search)
+    if level:
+        tests.append(level_regex(level).search)
+    if len(tests) == 1:
+        search = tests[0]
+        return lambda line: search(line) is not None
+    return lambda line: all(t(line) is not None for t in tests)
+
+
+# Lines kept free below max_lines for the blank line and the stats trailer
+_GREP_TRAILER_LINES = 2
+
+
+class LogGrep(LogBuffer):
+    """grep -n style output: "N:line" for matches, "N-line" for context, "--" between groups."""
+
+    def __init__(
+        self,
+        budget: int,
+        matcher: Callable[[str], bool],
+        context: int = 0,
+        max_matches: int = 100,
+        max_lines: int = MAX_LINES,
+        max_line_bytes: Optional[int] = None,
+    ):
+        super().__init__(budget, max_lines, max_line_bytes)
+        self.matcher = matcher
+        self.context = context
+        self.max_matches = max_matches
+        self.matches = 0
+        self.lineno = 0
+        self._before: Deque[Tuple[int, str]] = deque(maxlen=context)
+        self._after = 0
+        self._last_out = 0
+        self.full = False  # output reached max_lines; the scan stopped there
+
+    def _fits(self, first: int, count: int) -> bool:
+        """Whether `count` lines from `first` on (plus a "--") leave room for the trailer."""
+        gap = 1 if self.lines and first > self._last_out + 1 else 0
+        if len(self.lines) + gap + count <= self.max_lines - _GREP_TRAILER_LINES:
+            return True
+        self.full = self.truncated = True
+        return False
+
+    def _out(self, lineno: int, sep: str, line: str) -> None:
+        if self.lines and lineno > self._last_out + 1:
+            self.lines.append("--")
+        self.lines.append(f"{lineno}{sep}{line}")
+        self._last_out = lineno
+
+    def _take(self, line: str) -> bool:
+        self.lineno += 1
+        if self.matches < self.max_matches and self.matcher(line):
+            first = self._before[0][0] if self._before else self.lineno
+            if not self._fits(first, len(self._before) + 1):
+                return False
+            self.matches += 1
+            for n, before in self._before:
+                self._out(n, "-", before)
+            self._before.clear()
+            self._out(self.lineno, ":", line)
+            self._after = self.context
+        elif self._after:
+            if not self._fits(self.lineno, 1):
+                return False
+            self._after -= 1
+            self._out(self.lineno, "-", line)
+        elif self.matches < self.max_matches:
+            self._before.append((self.lineno, line))
+
+        if self.matches >= self.max_matches and not self._after:
+            self.truncated = True
+            return False
+        return True
+
+    def result(self) -> SanitizedText:
+        stats = f"{self.matches} matching lines, {self.lineno} lines ({self._read} bytes) scanned"
+        if self.matches >= self.max_matches:
+            stats += "; stopped at max_matches"
+        elif self.full:
+            stats += "; output full, later matches omitted"
+        elif self.truncated:
+            stats += "; stopped at limit_bytes"
+        if not self.lines:
+            return SanitizedText(f"No matching lines ({stats})")
+        return SanitizedText("\n".join(self.lines) + f"\n\n[{stats}]")
+
+
+def _api_params(options: Dict[str, Any], budget: int) -> Dict[str, Any]:
+    return {
+        "container": options.get("container"),
+        "tailLines": options.get("tail_lines"),
+        "sinceSeconds": options.get("since_seconds"),
+        "timestamps": options.get("timestamps"),
+        "previous": options.get("previous"),
+        "limitBytes": budget,
+    }
+
+
+def read_pod_logs(namespace: str, pod: str, options: Dict[str, Any], buf: LogBuffer) -> SanitizedText:
+    """kubernetes-client path (runs on the I/O pool)."""
+    api = core_v1_api()
+    with metrics.phase("api"):
+        return _read_stream(api, namespace, pod, options, buf)
+
+
+def _read_stream(api, namespace: str, pod: str, options: Dict[str, Any], buf: LogBuffer) -> SanitizedText:
+    # Redaction inside buf.feed() is its own phase; what is left is the wire
+    resp = api.read_namespaced_pod_log(
+        name=pod,
+        namespace=namespace,
+        container=options.get("container"),
+        tail_lines=options.get("tail_lines"),
+        since_seconds=options.get("since_seconds"),
+        timestamps=options.get("timestamps"),
+        previous=options.get("previous"),
+        limit_bytes=buf.budget,
+        _preload_content=False,
+    )
+    done = False
+    try:
+        for chunk in resp.stream(CHUNK_BYTES):
+            if not buf.feed(chunk):
+                break
+        else:
+            done = True
+            buf.finish()
+    finally:
+        if done:
+            resp.release_conn()
+        else:
+            # Unread body left on the wire: drop the connection
+            resp.close()
+    return buf.result()
+
+
+async def read_pod_logs_async(namespace: str, pod: str, options: Dict[str, Any], buf: LogBuffer) -> SanitizedText:
+    """Native async transport path."""
+    path = resource_path("", "v1", namespace, "pods", name=pod, subresource="log")
+    with metrics.phase("api"):
+        async with contextlib.aclosing(k8s_async.stream_bytes(path, _api_params(options, buf.budget))) as chunks:
+            async for chunk in chunks:
+                if not buf.feed(chunk):
+                    break
+            else:
+                buf.finish()
+    return buf.result()
@@ -0,0 +1,343 @@
+import os
+import time
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import settings
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:  # optional dependency
+    otel_trace = None
+
+logger = logging.getLogger("mcp-k8s-agent")
+
+
+# -----------------------------
+# Per-call phase accounting
+# -----------------------------
+# Each tool call gets a CallStats in a context variable; phase() blocks add
+# their *exclusive* time (nested phases are subtracted from the enclosing
+# one) to it. Context variables follow the call into asyncio tasks and into
+# I/O pool threads (run_blocking copies the context), so phases inside the
+# kubernetes client are attributed to the right call. Time in no phase is
+# reported as "other". Outside a tool call phase() costs one lookup.
+PHASES = ("gate", "queue", "client", "discovery", "api", "prune", "serialize", "sanitize", "coalesced", "other")
+
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class _Frame:
+    __slots__ = ("child",)
+
+    def __init__(self):
+        self.child = 0.0
+
+
+class CallStats:
+    def __init__(self, tool_name: str):
+        self.tool_name = tool_name
+        self.phases: Dict[str, float] = {}
+        self.outcome = "ok"
+        self.response_bytes = 0
+
+    def add(self, phase_name: str, seconds: float) -> None:
+        self.phases[phase_name] = self.phases.get(phase_name, 0.0) + seconds
+
+
+_call: "contextvars.ContextVar[Optional[CallStats]]" = contextvars.ContextVar("mcp_k8s_call", default=None)
+_frame: "contextvars.ContextVar[Optional[_Frame]]" = contextvars.ContextVar("mcp_k8s_frame", default=None)
+
+
+def _tracer():
+    if otel_trace is None or not settings.TRACING_ENABLED:
+        return None
+    return otel_trace.get_tracer("mcp-k8s-agent")
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    call = _call.get()
+    if call is None:
+        yield
+        return
+
+    parent = _frame.get()
+    frame = _Frame()
+    token = _frame.set(frame)
+    tracer = _tracer()
+    span = tracer.start_as_current_span(name) if tracer else None
+    if span:
+        span.__enter__()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        if span:
+            span.__exit__(None, None, None)
+        _frame.reset(token)
+        if parent is not None:
+            parent.child += elapsed
+        call.add(name, max(0.0, elapsed - frame.child))
+
+
+@contextmanager
+def tool_call(tool_name: str) -> Iterator[CallStats]:
+    """Account one tool call; phases run inside it are attributed to it."""
+    call = CallStats(tool_name)
+    root = _Frame()
+    call_token = _call.set(call)
+    frame_token = _frame.set(root)
+    tracer = _tracer()
+    span = tracer.start_as_current_span(f"tool {tool_name}") if tracer else None
+    current = span.__enter__() if span else None
+    start = time.perf_counter()
+    try:
+        yield call
+    except BaseException:
+        call.outcome = "error"
+        raise
+    finally:
+        total = time.perf_counter() - start
+        call.add("other", max(0.0, total - root.child))
+        if current is not None:
+            current.set_attribute("mcp.tool", tool_name)
+            current.set_attribute("mcp.outcome", call.outcome)
+            current.set_attribute("mcp.response_bytes", call.response_bytes)
+        if span:
+            span.__exit__(None, None, None)
+        _frame.reset(frame_token)
+        _call.reset(call_token)
+        _registry.observe(call, total)
+
+
+def record(name: str, seconds: float) -> None:
+    """Attribute time measured elsewhere (e.g. a pool queue wait) to a phase."""
+    call = _call.get()
+    if call is None:
+        return
+    parent = _frame.get()
+    if parent is not None:
+        parent.child += seconds
+    call.add(name, seconds)
+
+
+def set_response_bytes(size: int) -> None:
+    call = _call.get()
+    if call is not None:
+        call.response_bytes = size
+
+
+def set_outcome(outcome: str) -> None:
+    """'blocked' (policy) or 'error' for the current call."""
+    call = _call.get()
+    if call is not None:
+        call.outcome = outcome
+
+
+# -----------------------------
+# Registry and Prometheus text export
+# -----------------------------
+class _Histogram:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.series: Dict[Tuple[str, ...], List[float]] = {}  # labels -> bucket counts + [sum, count]
+
+    def observe(self, labels: Tuple[str, ...], value: float) -> None:
+        s = self.series.get(labels)
+        if s is None:
+            s = self.series[labels] = [0.0] * (len(self.buckets) + 2)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                s[i] += 1
+        s[-2] += value
+        s[-1] += 1
+
+
+def _escape(value: str) -> str:
+    """Label value escaping of the Prometheus text format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}"
+
+
+def _fmt(v: float) -> str:
+    return str(int(v)) if float(v).is_integer() else repr(v)
+
+
+class _Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls: Dict[Tuple[str, str], int] = {}
+        self.duration = _Histogram(DURATION_BUCKETS)
+        self.phases = _Histogram(DURATION_BUCKETS)
+        self.response_bytes = _Histogram(BYTES_BUCKETS)
+
+    def observe(self, call: CallStats, total: float) -> None:
+        with self.lock:
+            key = (call.tool_name, call.outcome)
+            self.calls[key] = self.calls.get(key, 0) + 1
+            self.duration.observe((call.tool_name,), total)
+            for name, seconds in call.phases.items():
+                self.phases.observe((call.tool_name, name), seconds)
+            self.response_bytes.observe((call.tool_name,), call.response_bytes)
+
+    def _histogram(self, out: List[str], name: str, help_text: str, hist: _Histogram, label_names: Tuple[str, ...]) -> None:
+        out.append(f"# HELP {name} {help_text}")
+        out.append(f"# TYPE {name} histogram")
+        for labels, s in sorted(hist.series.items()):
+            for bound, count in zip(hist.buckets, s):
+                le = 'le="%s"' % _fmt(bound)
+                out.append(f"{name}_bucket{_labels(label_names, labels, le)} {_fmt(count)}")
+            inf = 'le="+Inf"'
+            out.append(f"{name}_bucket{_labels(label_names, labels, inf)} {_fmt(s[-1])}")
+            out.append(f"{name}_sum{_labels(label_names, labels)} {_fmt(s[-2])}")
+            out.append(f"{name}_count{_labels(label_names, labels)} {_fmt(s[-1])}")
+
+    def render(self) -> str:
+        out: List[str] = []
+        with self.lock:
+            out.append("# HELP mcp_k8s_tool_calls_total Tool calls by outcome (ok, blocked, error).")
+            out.append("# TYPE mcp_k8s_tool_calls_total counter")
+            for (tool, outcome), n in sorted(self.calls.items()):
+                out.append(f"mcp_k8s_tool_calls_total{_labels(('tool', 'outcome'), (tool, outcome))} {n}")
+            self._histogram(out, "mcp_k8s_tool_duration_seconds", "Tool call latency.", self.duration, ("tool",))
+            self._histogram(
+                out,
+                "mcp_k8s_tool_phase_seconds",
+                "Time per call spent in each phase (exclusive of nested phases).",
+                self.phases,
+                ("tool", "phase"),
+            )
+            self._histogram(
+                out, "mcp_k8s_tool_response_bytes", "Sanitized response size.", self.response_bytes, ("tool",)
+            )
+        return "\n".join(out) + "\n"
+
+
+_registry = _Registry()
+
+# Counters kept by other modules (caches, coalescing, discovery), read when
+# the export is rendered: (metric prefix, help text, stats(), counter keys)
+_collectors: List[Tuple[str, str, Callable[[], Dict[str, Any]], Tuple[str, ...]]] = []
+
+
+def register_stats(prefix: str, help_text: str, collect: Callable[[], Dict[str, Any]], counters: Tuple[str, ...]) -> None:
+    """
+    Export collect()'s numbers as mcp_k8s_<prefix>_<key>: keys in `counters`
+    as counters (with a _total suffix), the rest as gauges.
+    """
+    _collectors.append((prefix, help_text, collect, counters))
+
+
+def _render_collected() -> str:
+    out: List[str] = []
+    for prefix, help_text, collect, counters in _collectors:
+        for key, value in sorted(collect().items()):
+            if not isinstance(value, (int, float)):
+                continue
+            kind = "counter" if key in counters else "gauge"
+            name = f"mcp_k8s_{prefix}_{key}" + ("_total" if kind == "counter" else "")
+            out.append(f"# HELP {name} {help_text}: {key.replace('_', ' ')}.")
+            out.append(f"# TYPE {name} {kind}")
+            out.append(f"{name} {_fmt(value)}")
+    return "".join(line + "\n" for line in out)
+
+
+def render_prometheus() -> str:
+    return _registry.render() + _render_collected()
+
+
+# -----------------------------
+# Exporters (both opt-in)
+# -----------------------------
+def write_file() -> None:
+    """Rewrite MCP_K8S_METRICS_FILE (from the writer thread, and at exit)."""
+    path = settings.METRICS_FILE
+    if not path:
+        return
+    tmp = f"{path}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(render_prometheus())
+        os.replace(tmp, path)  # scrapers never see a partial file
+    except OSError as e:
+        logger.warning("could not write metrics file %s: %s", path, e)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_response(404)
+            self.end_headers()
+            return
+        body = render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+# The file is written off the event loop, every METRICS_FILE_INTERVAL_SECONDS
+_writer: Optional[threading.Thread] = None
+_writer_stop = threading.Event()
+
+
+def _write_periodically() -> None:
+    while not _writer_stop.wait(settings.METRICS_FILE_INTERVAL_SECONDS):
+        write_file()
+
+
+def start_file_writer() -> None:
+    """Rewrite MCP_K8S_METRICS_FILE periodically on a daemon thread (unset = disabled)."""
+    global _writer
+    if not settings.METRICS_FILE or _writer is not None:
+        return
+    _writer_stop.clear()
+    _writer = threading.Thread(target=_write_periodically, name="metrics-file", daemon=True)
+    _writer.start()
+
+
+_http: Optional[ThreadingHTTPServer] = None
+
+
+def start_http_server() -> None:
+    """Serve /metrics on 127.0.0.1:MCP_K8S_METRICS_PORT (0 = disabled)."""
+    global _http
+    if not settings.METRICS_PORT or _http is not None:
+        return
+    _http = ThreadingHTTPServer(("127.0.0.1", settings.METRICS_PORT), _MetricsHandler)
+    threading.Thread(target=_http.serve_forever, name="metrics-http", daemon=True).start()
+    logger.info("metrics on http://127.0.0.1:%d/metrics", settings.METRICS_PORT)
+
+
+def shutdown() -> None:
+    global _http, _writer
+    if _writer is not None:
+        _writer_stop.set()
+        _writer.join()
+        _writer = None
+    write_file()
+    if _http is not None:
+        _http.shutdown()
+        _http = None
+
+
+def stats() -> Dict[str, Any]:
+    with _registry.lock:
+        return {f"{tool}:{outcome}": n for (tool, outcome), n in _registry.calls.items()}
@@ -0,0 +1,172 @@
+import sys
+import json
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Mapping, Optional, Tuple
+
+import metrics
+import settings
+from k8s_executor import run_blocking
+from k8s_resource import get_api_client
+
+
+# -----------------------------
+# Read-through response cache (opt-in)
+# -----------------------------
+# Finished read-tool outputs (already pruned, projected, redacted and
+# serialized) keyed by (cluster, tool, normalized arguments). Entries are
+# served for RESPONSE_CACHE_TTL_SECONDS; after that they are kept until
+# evicted so a caller can revalidate: if the freshly read object still has
+# the cached metadata.resourceVersion, the stored output is reused instead
+# of being rebuilt. Size is bounded by entry count and total bytes (LRU),
+# and k8s_delete / k8s_patch drop entries for the object they touched.
+Scope = Tuple[str, str, str]  # (namespace, group, plural)
+
+
+class CacheEntry:
+    __slots__ = ("text", "resource_version", "scope", "name", "stored_at")
+
+    def __init__(self, text: str, resource_version: Optional[str], scope: Scope, name: Optional[str]):
+        self.text = text
+        self.resource_version = resource_version
+        self.scope = scope
+        self.name = name
+        self.stored_at = time.monotonic()
+
+    def fresh(self) -> bool:
+        return time.monotonic() - self.stored_at <= settings.RESPONSE_CACHE_TTL_SECONDS
+
+
+class ResponseCache:
+    def __init__(self, max_entries: int, max_bytes: int):
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        # Bumped by every invalidation; a read that started before one must
+        # not store what it fetched
+        self.generation = 0
+        self._stats = {"hits": 0, "misses": 0, "revalidated": 0, "invalidated": 0, "evicted": 0}
+
+    def _drop(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= sys.getsizeof(entry.text)
+
+    def get(self, key: Hashable) -> Optional[CacheEntry]:
+        """Fresh or stale entry; stale ones are only served after revalidation."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def count(self, outcome: str) -> None:
+        with self._lock:
+            self._stats[outcome] += 1
+
+    def put(self, key: Hashable, entry: CacheEntry, generation: int) -> None:
+        size = sys.getsizeof(entry.text)
+        if size > self._max_bytes:
+            return
+        with self._lock:
+            if generation != self.generation:
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = entry
+            self._bytes += size
+            while len(self._entries) > self._max_entries or self._bytes > self._max_bytes:
+                self._drop(next(iter(self._entries)))
+                self._stats["evicted"] += 1
+
+    def invalidate(self, scope: Scope, name: str) -> None:
+        with self._lock:
+            stale = [k for k, e in self._entries.items() if e.scope == scope and e.name in (None, name)]
+            for key in stale:
+                self._drop(key)
+            self.generation += 1
+            self._stats["invalidated"] += len(stale)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            served = self._stats["hits"] + self._stats["revalidated"]
+            lookups = served + self._stats["misses"]
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hit_ratio": round(served / lookups, 3) if lookups else 0.0,
+            }
+
+
+_cache = ResponseCache(settings.RESPONSE_CACHE_MAX_ENTRIES, settings.RESPONSE_CACHE_MAX_BYTES)
+
+
+def enabled() -> bool:
+    return settings.RESPONSE_CACHE_ENABLED
+
+
+def _cluster_host() -> str:
+    return get_api_client().configuration.host
+
+
+async def cache_key(tool_name: str, arguments: Mapping[str, Any]) -> Hashable:
+    """(cluster, tool, arguments) with argument order and whitespace normalized away."""
+    # get_api_client() may reload the kubeconfig; keep it off the event loop
+    host = await run_blocking(tool_name, _cluster_host)
+    return (host, tool_name, json.dumps(arguments, sort_keys=True, separators=(",", ":")))
+
+
+async def read_through(
+    key: Hashable,
+    fetch: Callable[[], Awaitable[Dict[str, Any]]],
+    render: Callable[[Dict[str, Any]], str],
+    scope: Scope,
+    name: Optional[str] = None,
+    revalidate: bool = False,
+) -> str:
+    """
+    Output for `key`: the cached text while fresh; otherwise fetch() the
+    object and, when `revalidate` is set and its resourceVersion is
+    unchanged, keep the cached text instead of calling render().
+    """
+    entry = _cache.get(key)
+    if entry is not None and entry.fresh():
+        _cache.count("hits")
+        return entry.text
+
+    generation = _cache.generation
+    obj = await fetch()
+    rv = (obj.get("metadata") or {}).get("resourceVersion") if revalidate and isinstance(obj, dict) else None
+    if entry is not None and rv and rv == entry.resource_version:
+        _cache.count("revalidated")
+        entry.stored_at = time.monotonic()
+        return entry.text
+
+    _cache.count("misses")
+    text = render(obj)
+    _cache.put(key, CacheEntry(text, rv, scope, name), generation)
+    return text
+
+
+def invalidate(namespace: str, group: str, plural: str, name: str) -> None:
+    """Drop cached reads of one object and of lists that may contain it."""
+    _cache.invalidate(scope_of(namespace, group, plural), name)
+
+
+def scope_of(namespace: str, group: str, plural: str) -> Scope:
+    return (namespace, (group or "").strip(), plural.strip().lower())
+
+
+def stats() -> Dict[str, Any]:
+    return _cache.stats()
+
+
+metrics.register_stats(
+    "response_cache",
+    "Read-through response cache",
+    lambda: stats() if enabled() else {},
+    counters=("hits", "misses", "revalidated", "invalidated", "evicted"),
+)
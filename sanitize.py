@@ -1,6 +1,10 @@
 import re
 import math
-from typing import Dict, Any
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
+
+from constants import PRUNE_PROFILES
 
 
 MAX_LINES = 500
@@ -16,66 +20,523 @@ REDACT_PATTERNS = [
 BASE64_RE = re.compile(r"[A-Za-z0-9+/=]{20,}")
 
 
+# Memo caches only keep strings up to this length: long ones rarely repeat
+# and would pin their size in the cache
+_MEMO_MAX_LEN = 256
+
+
 def _entropy(s: str) -> float:
-    probs = [s.count(c) / len(s) for c in set(s)]
-    return -sum(p * math.log2(p) for p in probs)
+    """Shannon entropy in bits per character, from one histogram pass."""
+    n = len(s)
+    return -sum([c / n * math.log2(c / n) for c in Counter(s).values()])
 
 
-def sanitize_output(tool_name: str, raw: str) -> str:
-    text = raw
+# Candidates repeat a lot (image digests and hashes recur on every pod of a
+# list), so scores are memoized
+_entropy_memo = lru_cache(maxsize=4096)(_entropy)
+
+
+# -----------------------------
+# Redaction engine
+# -----------------------------
+# One left-to-right pass driven by cheap prefilters instead of one regex
+# substitution per pattern: each keyword pattern is only tried where its
+# literal prefix occurs (str.find), and base64 runs are located with
+# str.find on a copy where every base64 character is "a". Matches are merged
+# in order; a keyword wins over a run starting at the same place, overlapping
+# keyword matches are redacted together, and a run containing a keyword is
+# split around it (its pieces are judged together with the whole run).
+_RUN_CHARS = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/="  # BASE64_RE
+_MIN_RUN = 20
+_RUN_MASK = str.maketrans({c: "a" for c in _RUN_CHARS})
+_RUN_NEEDLE = "a" * _MIN_RUN
+_NOT_RUN_RE = re.compile(r"[^a]")
+
+
+def _literal_prefix(regex: "re.Pattern") -> str:
+    if "|" in regex.pattern:
+        return ""
+    m = re.match(r"[A-Za-z0-9]+(?![?*{])", regex.pattern)
+    return m.group(0) if m else ""
+
+
+def _keyword(regex: "re.Pattern", label: str) -> Tuple["re.Pattern", str, str, "re.Pattern", bool]:
+    """(pattern, replacement, literal prefix, regex finding the prefix, ignore case)"""
+    ignore_case = bool(regex.flags & re.IGNORECASE)
+    prefix = _literal_prefix(regex)
+    prefix_re = re.compile(re.escape(prefix), re.IGNORECASE if ignore_case else 0) if prefix else regex
+    return regex, f"[REDACTED: {label}]", prefix, prefix_re, ignore_case
+
+
+_KEYWORDS = [_keyword(regex, label) for regex, label in REDACT_PATTERNS]
+
+
+def _keyword_matches(text: str) -> List[Tuple[int, int, str]]:
+    """All keyword matches as (start, end, replacement), sorted by start."""
+    lowered = text.lower() if text.isascii() else None
+    found = []
+    for regex, replacement, prefix, prefix_re, ignore_case in _KEYWORDS:
+        if prefix and (lowered is not None or not ignore_case):
+            hay, needle = (lowered, prefix.lower()) if ignore_case else (text, prefix)
+            starts = []
+            p = hay.find(needle)
+            while p != -1:
+                starts.append(p)
+                p = hay.find(needle, p + 1)
+        else:
+            starts = [m.start() for m in prefix_re.finditer(text)]
+        for p in starts:
+            m = regex.match(text, p)
+            if m:
+                found.append((p, m.end(), replacement))
+    found.sort()
+    return found
+
+
+def _base64_runs(text: str) -> List[Tuple[int, int]]:
+    """Maximal runs of base64 characters at least _MIN_RUN long."""
+    masked = text.translate(_RUN_MASK)
+    runs = []
+    p = masked.find(_RUN_NEEDLE)
+    while p != -1:
+        m = _NOT_RUN_RE.search(masked, p + _MIN_RUN)
+        end = m.start() if m else len(masked)
+        runs.append((p, end))
+        p = masked.find(_RUN_NEEDLE, end)
+    return runs
+
+
+def _high_entropy(val: str) -> bool:
+    # Entropy is at most log2(distinct characters), so hex digests and UIDs
+    # (16 symbols) can never exceed 4.0 and are not scored at all
+    if len(val) < _MIN_RUN or len(set(val)) <= 16:
+        return False
+    return (_entropy_memo(val) if len(val) <= _MEMO_MAX_LEN else _entropy(val)) > 4.0
+
 
-    # Pattern redaction
-    for regex, label in REDACT_PATTERNS:
-        text = regex.sub(f"[REDACTED: {label}]", text)
+def _redact_run(text: str, start: int, end: int, run: Tuple[int, int]) -> str:
+    """
+    Redact text[start:end], a piece of the base64 run `run` that keyword
+    matches were cut out of. The piece is also judged together with the rest
+    of its run, as applying the patterns one by one could leave it joined to
+    either side.
+    """
+    if start == end:
+        return ""
+    spans = {(start, end), (run[0], end), (start, run[1]), run}
+    if any(_high_entropy(text[a:b]) for a, b in spans):
+        return "[REDACTED: high-entropy]"
+    return text[start:end]
+
+
+def _keyword_end(keywords: List[Tuple[int, int, str]], i: int) -> int:
+    """
+    End of the redaction for keywords[i], extended over keyword matches that
+    start inside it and run past it ("Bearer Token = x"), so a value is never
+    left behind because another pattern matched first.
+    """
+    end = keywords[i][1]
+    for j in range(i + 1, len(keywords)):
+        start, k_end, _ = keywords[j]
+        if start >= end:
+            break
+        end = max(end, k_end)
+    return end
+
+
+def _redact(text: str) -> str:
+    keywords = _keyword_matches(text)
+    runs = _base64_runs(text)
+    if not keywords and not runs:
+        return text
+
+    out = []
+    pos = ki = ri = 0
+    while True:
+        while ki < len(keywords) and keywords[ki][0] < pos:
+            ki += 1
+        while ri < len(runs) and runs[ri][1] <= pos:
+            ri += 1
+        kw = keywords[ki] if ki < len(keywords) else None
+        run = runs[ri] if ri < len(runs) else None
+
+        if run is not None and run[0] < pos:
+            start = pos  # the rest of a run that a keyword match stopped inside
+        elif kw is not None and (run is None or kw[0] <= run[0]):
+            out.append(text[pos : kw[0]])
+            out.append(kw[2])
+            pos = _keyword_end(keywords, ki)
+            continue
+        elif run is not None:
+            start = run[0]
+        else:
+            break
 
-    # High entropy strings (base64 / secrets)
-    def redact_entropy(match):
-        val = match.group(0)
-        if _entropy(val) > 4.0:
-            return "[REDACTED: high-entropy]"
-        return val
+        out.append(text[pos:start])
+        if kw is not None and kw[0] < run[1]:
+            out.append(_redact_run(text, start, kw[0], run))
+            out.append(kw[2])
+            pos = _keyword_end(keywords, ki)
+        else:
+            out.append(_redact_run(text, start, run[1], run))
+            pos = run[1]
+    out.append(text[pos:])
+    return "".join(out)
 
-    text = BASE64_RE.sub(redact_entropy, text)
 
-    # Truncate noisy outputs (logs)
-    lines = text.splitlines()
-    if len(lines) > MAX_LINES:
+def redact_text(text: str) -> str:
+    """Redact one piece of text (a log line, a message) without truncating it."""
+    return _redact(text)
+
+
+class SanitizedText(str):
+    """
+    Tool output serialized from values that were already redacted one by one
+    (see sanitize_tree). sanitize_output() only truncates it.
+    """
+
+
+def sanitize_output(tool_name: str, raw: str) -> str:
+    # Truncate noisy outputs (logs) first so dropped lines are never scanned
+    lines = raw.splitlines()
+    truncated = len(lines) > MAX_LINES
+    if truncated:
         lines = lines[:MAX_LINES]
-        lines.append("\n[Output truncated]")
 
-    return "\n".join(lines)
+    text = "\n".join(lines)
+    if not isinstance(raw, SanitizedText):
+        text = _redact(text)
+    if truncated:
+        text += "\n\n[Output truncated]"
+    return text
+
+
+# -----------------------------
+# Structure-aware sanitization
+# -----------------------------
+# Paths whose values are identifiers, references or enums and are never
+# inspected ("*" = any key / any list element). Everything else that is a
+# string, including map keys, goes through the redaction engine.
+_CONTAINER_SAFE = {"name": True, "image": True, "imagePullPolicy": True}
+_CONTAINER_STATUS_SAFE = {"name": True, "image": True, "imageID": True, "containerID": True}
+SAFE_PATHS: Dict[str, Any] = {
+    "apiVersion": True,
+    "kind": True,
+    "metadata": {
+        "name": True,
+        "namespace": True,
+        "generateName": True,
+        "uid": True,
+        "resourceVersion": True,
+        "creationTimestamp": True,
+        "deletionTimestamp": True,
+        "ownerReferences": {"*": {"apiVersion": True, "kind": True, "name": True, "uid": True}},
+    },
+    "spec": {
+        "nodeName": True,
+        "serviceAccountName": True,
+        "schedulerName": True,
+        "restartPolicy": True,
+        "dnsPolicy": True,
+        "containers": {"*": _CONTAINER_SAFE},
+        "initContainers": {"*": _CONTAINER_SAFE},
+    },
+    "status": {
+        "phase": True,
+        "podIP": True,
+        "hostIP": True,
+        "qosClass": True,
+        "startTime": True,
+        "conditions": {"*": {"type": True, "status": True, "lastTransitionTime": True}},
+        "containerStatuses": {"*": _CONTAINER_STATUS_SAFE},
+        "initContainerStatuses": {"*": _CONTAINER_STATUS_SAFE},
+    },
+}
 
+# Keywords that can appear in a string too short to hold a base64 run
+_KEYWORD_HINT_RE = (
+    re.compile("|".join(re.escape(k[2]) for k in _KEYWORDS), re.IGNORECASE)
+    if all(k[2] for k in _KEYWORDS)
+    else None
+)
 
-def prune_k8s_object(obj: Dict[str, Any]) -> Dict[str, Any]:
+
+def _redacted_value(s: str) -> Optional[str]:
+    if len(s) < _MIN_RUN and _KEYWORD_HINT_RE is not None and not _KEYWORD_HINT_RE.search(s):
+        return None
+    out = _redact(s)
+    return None if out == s else out
+
+
+# Keys and many values (images, enums, label values) repeat on every object
+# of a list, so results are memoized; long strings (annotations, embedded
+# configs) are not
+_redacted_memo = lru_cache(maxsize=8192)(_redacted_value)
+
+
+def _redacted(s: str) -> Optional[str]:
+    """Redacted copy of `s`, or None when nothing in it needs redacting."""
+    return _redacted_memo(s) if len(s) <= _MEMO_MAX_LEN else _redacted_value(s)
+
+
+def _walk(node: Any, safe: Any) -> Any:
+    if isinstance(node, str):
+        return _redacted(node) or node
+    if isinstance(node, dict):
+        out = None
+        rekey = False
+        for k, v in node.items():
+            child = safe.get(k, safe.get("*")) if safe else None
+            if child is not True and isinstance(v, (str, dict, list)):
+                new_v = _walk(v, child)
+                if new_v is not v:
+                    if out is None:
+                        out = dict(node)
+                    out[k] = new_v
+            if isinstance(k, str) and _redacted(k) is not None:
+                rekey = True
+        if rekey:
+            out = {((_redacted(k) or k) if isinstance(k, str) else k): v for k, v in (out or node).items()}
+        return node if out is None else out
+    if isinstance(node, list):
+        child = safe.get("*") if safe else None
+        if child is True:
+            return node
+        out = None
+        for i, v in enumerate(node):
+            if isinstance(v, (str, dict, list)):
+                new_v = _walk(v, child)
+                if new_v is not v:
+                    if out is None:
+                        out = list(node)
+                    out[i] = new_v
+        return node if out is None else out
+    return node
+
+
+def sanitize_tree(obj: Any) -> Any:
+    """
+    Redact every string value (and map key) of a decoded API object outside
+    SAFE_PATHS. Containers are only copied where something was redacted, so
+    shared inputs (informer stores) are never modified.
+    """
+    return _walk(obj, SAFE_PATHS)
+
+
+# -----------------------------
+# Pruning profiles
+# -----------------------------
+# What prune_k8s_object drops, per profile (each includes the one below it):
+#   full      noise only: managedFields and per-write metadata (uid,
+#             resourceVersion, generation, creationTimestamp, selfLink)
+#   standard  also the last-applied-configuration annotation (a copy of the
+#             whole object), ownerReference uids, status.observedGeneration,
+#             null condition probe times, and pod-template / workload spec
+#             fields left at their API defaults (terminationMessagePath,
+#             dnsPolicy, probe timings, rollout strategy, ...)
+#   minimal   also annotations, ownerReferences, status.conditions and the
+#             volume / toleration plumbing of pod specs
+# Rules are compiled once per profile and kind into a trie of path segments
+# ("*" = every list element). A leaf is _DROP or _Default(value): the field
+# is dropped only while it holds that value. Profile names are
+# constants.PRUNE_PROFILES.
+
+
+class _Default:
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+
+_DROP = True
+_MISSING = object()
+
+_PROBE_DEFAULTS = {"timeoutSeconds": 1, "periodSeconds": 10, "successThreshold": 1, "failureThreshold": 3}
+
+_CONTAINER_DEFAULTS: Dict[Tuple[str, ...], Any] = {
+    ("terminationMessagePath",): "/dev/termination-log",
+    ("terminationMessagePolicy",): "File",
+    ("resources",): {},
+    ("securityContext",): {},
+    ("ports", "*", "protocol"): "TCP",
+    **{(probe, k): v for probe in ("livenessProbe", "readinessProbe", "startupProbe") for k, v in _PROBE_DEFAULTS.items()},
+}
+
+_POD_SPEC_DEFAULTS: Dict[Tuple[str, ...], Any] = {
+    ("dnsPolicy",): "ClusterFirst",
+    ("restartPolicy",): "Always",
+    ("schedulerName",): "default-scheduler",
+    ("securityContext",): {},
+    ("terminationGracePeriodSeconds",): 30,
+    ("enableServiceLinks",): True,
+    ("preemptionPolicy",): "PreemptLowerPriority",
+    ("priority",): 0,
+    # Added to every pod by the DefaultTolerationSeconds admission plugin
+    ("tolerations",): [
+        {"key": f"node.kubernetes.io/{taint}", "operator": "Exists", "effect": "NoExecute", "tolerationSeconds": 300}
+        for taint in ("not-ready", "unreachable")
+    ],
+    **{(c, "*") + path: v for c in ("containers", "initContainers") for path, v in _CONTAINER_DEFAULTS.items()},
+}
+
+_POD_SPEC_NOISE = [("volumes",), ("tolerations",), ("containers", "*", "volumeMounts"), ("initContainers", "*", "volumeMounts")]
+
+# Where each kind keeps its pod spec
+_POD_SPEC_AT = {
+    "Pod": ("spec",),
+    "Deployment": ("spec", "template", "spec"),
+    "ReplicaSet": ("spec", "template", "spec"),
+    "StatefulSet": ("spec", "template", "spec"),
+    "DaemonSet": ("spec", "template", "spec"),
+    "Job": ("spec", "template", "spec"),
+    "CronJob": ("spec", "jobTemplate", "spec", "template", "spec"),
+}
+
+_WORKLOAD_DEFAULTS: Dict[str, Dict[Tuple[str, ...], Any]] = {
+    "Deployment": {
+        ("spec", "progressDeadlineSeconds"): 600,
+        ("spec", "revisionHistoryLimit"): 10,
+        ("spec", "strategy"): {"type": "RollingUpdate", "rollingUpdate": {"maxSurge": "25%", "maxUnavailable": "25%"}},
+    },
+    "StatefulSet": {
+        ("spec", "revisionHistoryLimit"): 10,
+        ("spec", "podManagementPolicy"): "OrderedReady",
+        ("spec", "updateStrategy"): {"type": "RollingUpdate", "rollingUpdate": {"partition": 0}},
+        ("spec", "persistentVolumeClaimRetentionPolicy"): {"whenDeleted": "Retain", "whenScaled": "Retain"},
+    },
+    "DaemonSet": {
+        ("spec", "revisionHistoryLimit"): 10,
+        ("spec", "updateStrategy"): {"type": "RollingUpdate", "rollingUpdate": {"maxSurge": 0, "maxUnavailable": 1}},
+    },
+}
+
+
+def _profile_rules(profile: str, kind: Optional[str]) -> List[Tuple[Tuple[str, ...], Any]]:
+    """(path, _DROP or _Default) rules of `profile` for objects of `kind`, broadest profile last."""
+    rules: List[Tuple[Tuple[str, ...], Any]] = [
+        (("metadata", k), _DROP)
+        for k in ("managedFields", "resourceVersion", "uid", "selfLink", "generation", "creationTimestamp")
+    ]
+    if profile == "full":
+        return rules
+
+    pod_spec = _POD_SPEC_AT.get(kind or "")
+    rules += [
+        (("metadata", "annotations", "kubectl.kubernetes.io/last-applied-configuration"), _DROP),
+        (("metadata", "ownerReferences", "*", "uid"), _DROP),
+        (("metadata", "ownerReferences", "*", "blockOwnerDeletion"), _DROP),
+        (("status", "observedGeneration"), _DROP),
+        (("status", "conditions", "*", "lastProbeTime"), _Default(None)),
+        (("status", "containerStatuses", "*", "lastState"), _Default({})),
+        (("status", "initContainerStatuses", "*", "lastState"), _Default({})),
+    ]
+    rules += [(path, _Default(v)) for path, v in _WORKLOAD_DEFAULTS.get(kind or "", {}).items()]
+    if pod_spec:
+        rules += [(pod_spec + path, _Default(v)) for path, v in _POD_SPEC_DEFAULTS.items()]
+        if len(pod_spec) > 1:
+            rules.append((pod_spec[:-1] + ("metadata", "creationTimestamp"), _Default(None)))
+    if profile == "standard":
+        return rules
+
+    rules += [
+        (("metadata", "annotations"), _DROP),
+        (("metadata", "ownerReferences"), _DROP),
+        (("metadata", "generateName"), _DROP),
+        (("status", "conditions"), _DROP),
+    ]
+    if pod_spec:
+        rules += [(pod_spec + path, _DROP) for path in _POD_SPEC_NOISE]
+        if len(pod_spec) > 1:
+            rules.append((pod_spec[:-1] + ("metadata", "annotations"), _DROP))
+    return rules
+
+
+def _compile_rules(rules: List[Tuple[Tuple[str, ...], Any]]) -> Dict[str, Any]:
+    trie: Dict[str, Any] = {}
+    for path, action in rules:
+        node = trie
+        for seg in path[:-1]:
+            child = node.get(seg)
+            if not isinstance(child, dict):
+                if child is not None:
+                    break  # an enclosing field is dropped already
+                child = node[seg] = {}
+            node = child
+        else:
+            node[path[-1]] = action
+    return trie
+
+
+_PRUNE_KINDS = sorted(set(_POD_SPEC_AT) | set(_WORKLOAD_DEFAULTS))
+_PRUNE_TRIES: Dict[Tuple[str, Optional[str]], Dict[str, Any]] = {
+    (profile, kind): _compile_rules(_profile_rules(profile, kind))
+    for profile in PRUNE_PROFILES
+    for kind in _PRUNE_KINDS + [None]
+}
+
+
+def _prune(node: Any, trie: Dict[str, Any]) -> Any:
+    """`node` without the fields `trie` drops; only the containers on the way to a dropped field are copied."""
+    if isinstance(node, list):
+        child = trie.get("*")
+        if not isinstance(child, dict):
+            return node
+        out = None
+        for i, v in enumerate(node):
+            new_v = _prune(v, child)
+            if new_v is not v:
+                if out is None:
+                    out = list(node)
+                out[i] = new_v
+        return node if out is None else out
+    if not isinstance(node, dict):
+        return node
+
+    out = None
+    for key, rule in trie.items():
+        value = node.get(key, _MISSING)
+        if value is _MISSING:
+            continue
+        if rule is _DROP or (isinstance(rule, _Default) and value == rule.value):
+            new_v = _MISSING
+        elif isinstance(rule, dict):
+            new_v = _prune(value, rule)
+            if new_v is value:
+                continue
+            if isinstance(new_v, dict) and not new_v:
+                new_v = _MISSING  # e.g. annotations holding only last-applied-configuration
+        else:
+            continue
+        if out is None:
+            out = dict(node)
+        if new_v is _MISSING:
+            del out[key]
+        else:
+            out[key] = new_v
+    return node if out is None else out
+
+
+def prune_k8s_object(obj: Dict[str, Any], profile: str = "full") -> Dict[str, Any]:
     """
     Structural normalization for Kubernetes API objects.
-    This is NOT a security boundary. It reduces noise and non-deterministic fields.
-    Used only by k8s_list / k8s_get.
+    Drops the fields of a pruning profile (PRUNE_PROFILES) in one walk, then
+    redacts string values (sanitize_tree) so the serialized result does not
+    need another text scan. Used by k8s_list / k8s_get / k8s_list_events.
     """
     if not isinstance(obj, dict):
-        return obj
-
-    obj = dict(obj)
-
-    # Normalize metadata noise
-    md = obj.get("metadata")
-    if isinstance(md, dict):
-        md = dict(md)
-        # Drop non-deterministic / noisy fields
-        for k in (
-            "managedFields",
-            "resourceVersion",
-            "uid",
-            "selfLink",
-            "generation",
-            "creationTimestamp",
-        ):
-            md.pop(k, None)
-        obj["metadata"] = md
+        return sanitize_tree(obj)
+
+    kind = obj.get("kind")
+    trie = _PRUNE_TRIES.get((profile, kind)) or _PRUNE_TRIES.get((profile, None))
+    if trie is None:
+        raise ValueError(f"Unknown prune profile '{profile}'")
+    obj = _prune(obj, trie)
 
     # If an object ever slips through with Secret kind, redact payloads structurally
     # (Gate should block secrets, but this keeps read outputs robust.)
-    if obj.get("kind") == "Secret":
+    if kind == "Secret":
+        obj = dict(obj)
         data = obj.get("data")
         if isinstance(data, dict):
             obj["data"] = {k: "[REDACTED]" for k in data.keys()}
@@ -83,4 +544,4 @@ def prune_k8s_object(obj: Dict[str, Any]) -> Dict[str, Any]:
         if isinstance(string_data, dict):
             obj["stringData"] = {k: "[REDACTED]" for k in string_data.keys()}
 
-    return obj
\ No newline at end of file
+    return sanitize_tree(obj)
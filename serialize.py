@@ -0,0 +1,140 @@
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+import yaml
+
+import metrics
+import settings
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+logger = logging.getLogger("mcp-k8s-agent")
+
+
+# -----------------------------
+# Tool output serialization
+# -----------------------------
+# json     indented, sorted keys (the historical output)
+# compact  single-line JSON, no whitespace
+# ndjson   one compact object per line; for lists the first line carries the
+#          list envelope (kind, metadata.continue, ...) and each item follows,
+#          so sanitize_output's line-based truncation cuts between objects
+# yaml     block-style YAML
+FORMATS = ("json", "compact", "ndjson", "yaml")
+
+_YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+_default_format = settings.OUTPUT_FORMAT
+if _default_format not in FORMATS:
+    logger.warning("unknown MCP_K8S_OUTPUT_FORMAT %r; using json", _default_format)
+    _default_format = "json"
+
+
+def _json(data: Any, indent: bool, sort_keys: bool) -> str:
+    if orjson is not None:
+        option = (orjson.OPT_INDENT_2 if indent else 0) | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        try:
+            return orjson.dumps(data, option=option).decode("utf-8")
+        except TypeError:
+            pass  # non-str keys, ints beyond 64 bits, ...: let the stdlib handle it
+    if indent:
+        return json.dumps(data, indent=2, sort_keys=sort_keys, ensure_ascii=False)
+    return json.dumps(data, separators=(",", ":"), sort_keys=sort_keys, ensure_ascii=False)
+
+
+def _ndjson(data: Any, sort_keys: bool) -> str:
+    if isinstance(data, dict) and isinstance(data.get("items"), list):
+        envelope = {k: v for k, v in data.items() if k != "items"}
+        lines = [_json(envelope, False, sort_keys)]
+        lines.extend(_json(item, False, sort_keys) for item in data["items"])
+        return "\n".join(lines)
+    return _json(data, False, sort_keys)
+
+
+def dumps(data: Any, fmt: Optional[str] = None, sort_keys: bool = True) -> str:
+    """Serialize tool output in one of FORMATS (default: MCP_K8S_OUTPUT_FORMAT)."""
+    with metrics.phase("serialize"):
+        fmt = fmt or _default_format
+        if fmt == "json":
+            return _json(data, True, sort_keys)
+        if fmt == "compact":
+            return _json(data, False, sort_keys)
+        if fmt == "ndjson":
+            return _ndjson(data, sort_keys)
+        if fmt == "yaml":
+            return yaml.dump(
+                data, Dumper=_YamlDumper, sort_keys=sort_keys, default_flow_style=False, allow_unicode=True
+            )
+        raise ValueError(f"Unknown output format '{fmt}'")
+
+
+# -----------------------------
+# Item-by-item list serialization
+# -----------------------------
+class ListWriter:
+    """
+    Serializes list items one at a time as they arrive (add()); text()
+    returns the whole list like dumps() would, except that the envelope
+    (kind, metadata with continue handle or cursor, ...) comes before
+    "items", so truncating the output never drops it. Only the output text
+    is held, not the items themselves. With max_lines, add() refuses items
+    once the items would take more lines than that (the first one is always
+    taken), and every item after that.
+    """
+
+    def __init__(self, fmt: Optional[str] = None, max_lines: Optional[int] = None):
+        self.fmt = fmt or _default_format
+        if self.fmt not in FORMATS:
+            raise ValueError(f"Unknown output format '{self.fmt}'")
+        self.max_lines = max_lines
+        self.lines = 0
+        self.full = False
+        self._parts: List[str] = []
+
+    def add(self, item: Any) -> bool:
+        """Serialize `item`; False (and nothing added) once the items no longer fit in max_lines."""
+        if self.full:
+            return False
+        with metrics.phase("serialize"):
+            if self.fmt == "json":
+                # Nested two levels deep; JSON strings never contain a raw newline
+                part = "    " + _json(item, True, True).replace("\n", "\n    ")
+            elif self.fmt == "yaml":
+                part = self._yaml([item])
+            else:
+                part = _json(item, False, True)
+        if self.max_lines is not None:
+            lines = len(part.splitlines()) if self.fmt in ("json", "yaml") else 1
+            if self._parts and self.lines + lines > self.max_lines:
+                self.full = True
+                return False
+            self.lines += lines
+        self._parts.append(part)
+        return True
+
+    @staticmethod
+    def _yaml(data: Any) -> str:
+        return yaml.dump(data, Dumper=_YamlDumper, sort_keys=True, default_flow_style=False, allow_unicode=True)
+
+    def text(self, envelope: Dict[str, Any]) -> str:
+        """The whole list: `envelope` (kind, metadata, ...) followed by the items added so far."""
+        with metrics.phase("serialize"):
+            keys = sorted(k for k in envelope if k != "items")
+            parts = self._parts
+            if self.fmt == "ndjson":
+                return "\n".join([_json({k: envelope[k] for k in keys}, False, True)] + parts)
+            if self.fmt == "yaml":
+                head = self._yaml({k: envelope[k] for k in keys}) if keys else ""
+                return head + ("items:\n" + "".join(parts) if parts else "items: []\n")
+            if self.fmt == "compact":
+                out = [f"{_json(k, False, True)}:{_json(envelope[k], False, True)}" for k in keys]
+                out.append('"items":[' + ",".join(parts) + "]")
+                return "{" + ",".join(out) + "}"
+
+            out = [f"  {_json(k, False, True)}: " + _json(envelope[k], True, True).replace("\n", "\n  ") for k in keys]
+            out.append('  "items": ' + ("[\n" + ",\n".join(parts) + "\n  ]" if parts else "[]"))
+            return "{\n" + ",\n".join(out) + "\n}"
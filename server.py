@@ -1,19 +1,59 @@
-from typing import List
+from typing import List, Set
+import asyncio
 import logging
 
+from constants import LOG_LEVELS, PRUNE_PROFILES, WORKLOAD_KINDS
 from sanitize import sanitize_output
 from mcp.server import Server, InitializationOptions
 from mcp.server.stdio import stdio_server
-from mcp.types import Tool, TextContent
+from mcp.types import InitializedNotification, Tool, TextContent
 
-from tools_read import k8s_list, k8s_get, k8s_list_events, k8s_pod_logs
+from tools_read import (
+    k8s_list,
+    k8s_get,
+    k8s_batch_get,
+    k8s_list_events,
+    k8s_pod_logs,
+    k8s_pod_logs_grep,
+    k8s_workload_logs,
+)
 from tools_write import k8s_delete, k8s_patch
 from gate import GateError
+import k8s_async
+import informer
+import metrics
+import settings
+import sessions
+import response_cache
+import singleflight
+from k8s_resource import close_clients, prewarm
+from k8s_executor import run_blocking, shutdown_executor
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("mcp-k8s-agent")
 
-server = Server("mcp-k8s-agent")
+server = Server("mcp-k8s-agent", version="0.2.0")
+
+# Argument schemas shared by the object-reading tools
+_FIELDS_SCHEMA = {
+    "type": "array",
+    "items": {"type": "string"},
+    "description": "Only return these fields of each object, e.g. [\"metadata.name\", \"spec.containers[*].image\"]",
+}
+_OUTPUT_SCHEMA = {
+    "type": "string",
+    "enum": ["json", "compact", "ndjson", "yaml", "summary"],
+    "description": "Response format; summary = kubectl-style table rows instead of objects",
+}
+_PRUNE_SCHEMA = {
+    "type": "string",
+    "enum": list(PRUNE_PROFILES),
+    "description": (
+        "Fields dropped from each object: full (default) only drops managedFields and per-write "
+        "metadata; standard also last-applied-configuration and fields at their API defaults; "
+        "minimal also annotations, ownerReferences, conditions and volume plumbing"
+    ),
+}
 
 
 @server.list_tools()
@@ -21,7 +61,12 @@ async def list_tools() -> List[Tool]:
     return [
         Tool(
             name="k8s_list",
-            description="List namespaced Kubernetes resources (read-only)",
+            description=(
+                "List namespaced Kubernetes resources (read-only). Returns at most `limit` objects; "
+                "pass metadata.continue from the response as `continue` to fetch the next page. "
+                "The last page carries metadata.cursor: pass it as `changes_since` to get only the objects "
+                "added, modified or deleted since then (and a new cursor)."
+            ),
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -30,6 +75,15 @@ async def list_tools() -> List[Tool]:
                     "version": {"type": "string"},
                     "plural": {"type": "string"},
                     "kind": {"type": "string"},
+                    "limit": {"type": "integer", "minimum": 1, "maximum": 500},
+                    "continue": {"type": "string"},
+                    "changes_since": {
+                        "type": "string",
+                        "description": "metadata.cursor of an earlier k8s_list of the same resources",
+                    },
+                    "fields": _FIELDS_SCHEMA,
+                    "output": _OUTPUT_SCHEMA,
+                    "prune": _PRUNE_SCHEMA,
                 },
                 "required": ["namespace", "group", "version", "plural"],
                 "additionalProperties": False,
@@ -47,18 +101,65 @@ async def list_tools() -> List[Tool]:
                     "version": {"type": "string"},
                     "plural": {"type": "string"},
                     "kind": {"type": "string"},
+                    "fields": _FIELDS_SCHEMA,
+                    "output": _OUTPUT_SCHEMA,
+                    "prune": _PRUNE_SCHEMA,
                 },
                 "required": ["namespace", "name", "group", "version", "plural"],
                 "additionalProperties": False,
             },
         ),
+        Tool(
+            name="k8s_batch_get",
+            description=(
+                "Get up to 50 named resources in one call (read-only). Each target is checked like a "
+                "single k8s_get; results or per-target errors are returned together, in order."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "targets": {
+                        "type": "array",
+                        "minItems": 1,
+                        "maxItems": 50,
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "namespace": {"type": "string"},
+                                "group": {"type": "string"},
+                                "version": {"type": "string"},
+                                "plural": {"type": "string"},
+                                "name": {"type": "string"},
+                                "kind": {"type": "string"},
+                            },
+                            "required": ["namespace", "version", "plural", "name"],
+                            "additionalProperties": False,
+                        },
+                    },
+                    "fields": _FIELDS_SCHEMA,
+                    "output": _OUTPUT_SCHEMA,
+                    "prune": _PRUNE_SCHEMA,
+                },
+                "required": ["targets"],
+                "additionalProperties": False,
+            },
+        ),
         Tool(
             name="k8s_list_events",
-            description="List namespaced Kubernetes events",
+            description=(
+                "List namespaced Kubernetes events, optionally filtered by involved object, type and age. "
+                "aggregate=true collapses repeats into one entry with count and first/last seen."
+            ),
             inputSchema={
                 "type": "object",
                 "properties": {
                     "namespace": {"type": "string"},
+                    "involved_kind": {"type": "string", "description": "e.g. Pod"},
+                    "involved_name": {"type": "string"},
+                    "type": {"type": "string", "enum": ["Normal", "Warning"]},
+                    "since_seconds": {"type": "integer", "minimum": 1},
+                    "aggregate": {"type": "boolean"},
+                    "output": _OUTPUT_SCHEMA,
                 },
                 "required": ["namespace"],
                 "additionalProperties": False,
@@ -66,19 +167,79 @@ async def list_tools() -> List[Tool]:
         ),
         Tool(
             name="k8s_pod_logs",
-            description="Read pod logs from a namespaced pod",
+            description=(
+                "Read pod logs from a namespaced pod. Reads at most `limit_bytes` (default 1 MiB) "
+                "and 500 lines; narrow with `tail_lines` or `since_seconds`."
+            ),
             inputSchema={
                 "type": "object",
                 "properties": {
                     "namespace": {"type": "string"},
                     "pod": {"type": "string"},
                     "container": {"type": "string"},
-                    "tail_lines": {"type": "integer"},
+                    "tail_lines": {"type": "integer", "minimum": 1},
+                    "limit_bytes": {"type": "integer", "minimum": 1, "maximum": 10485760},
+                    "since_seconds": {"type": "integer", "minimum": 1},
+                    "timestamps": {"type": "boolean"},
+                    "previous": {"type": "boolean", "description": "Logs of the previous (crashed) container"},
                 },
                 "required": ["namespace", "pod"],
                 "additionalProperties": False,
             },
         ),
+        Tool(
+            name="k8s_pod_logs_grep",
+            description=(
+                "Search a pod's logs and return only matching lines (grep -n style, with optional context). "
+                "Scans up to `limit_bytes` (default 256 MiB) without loading the log into memory. "
+                "Give `pattern` (regex), `level` (that level or more severe), or both."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "namespace": {"type": "string"},
+                    "pod": {"type": "string"},
+                    "container": {"type": "string"},
+                    "pattern": {"type": "string", "maxLength": 256},
+                    "level": {"type": "string", "enum": list(LOG_LEVELS)},
+                    "ignore_case": {"type": "boolean"},
+                    "context": {"type": "integer", "minimum": 0, "maximum": 10},
+                    "max_matches": {"type": "integer", "minimum": 1, "maximum": 200},
+                    "tail_lines": {"type": "integer", "minimum": 1},
+                    "since_seconds": {"type": "integer", "minimum": 1},
+                    "limit_bytes": {"type": "integer", "minimum": 1, "maximum": 1073741824},
+                    "timestamps": {"type": "boolean"},
+                    "previous": {"type": "boolean"},
+                },
+                "required": ["namespace", "pod"],
+                "additionalProperties": False,
+            },
+        ),
+        Tool(
+            name="k8s_workload_logs",
+            description=(
+                "Read the logs of all pods owned by one workload (Deployment, StatefulSet, DaemonSet, "
+                "ReplicaSet or Job), merged in time order with a [pod/<pod>/<container>] prefix per line. "
+                "Defaults to the last 100 lines per container; `limit_bytes` (default 1 MiB) is shared by all pods."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "namespace": {"type": "string"},
+                    "kind": {"type": "string", "enum": list(WORKLOAD_KINDS)},
+                    "name": {"type": "string"},
+                    "container": {"type": "string"},
+                    "max_pods": {"type": "integer", "minimum": 1, "maximum": 50},
+                    "tail_lines": {"type": "integer", "minimum": 1},
+                    "since_seconds": {"type": "integer", "minimum": 1},
+                    "limit_bytes": {"type": "integer", "minimum": 1, "maximum": 10485760},
+                    "timestamps": {"type": "boolean"},
+                    "previous": {"type": "boolean"},
+                },
+                "required": ["namespace", "kind", "name"],
+                "additionalProperties": False,
+            },
+        ),
         Tool(
             name="k8s_delete",
             description="Delete exactly one namespaced Kubernetes resource. Requires approved=true.",
@@ -127,50 +288,144 @@ async def _safe_call(coro):
     try:
         return await coro
     except GateError as e:
+        metrics.set_outcome("blocked")
         return f"BLOCKED: {e}"
     except Exception as e:
+        metrics.set_outcome("error")
         return f"ERROR: {type(e).__name__}: {e}"
 
 
-@server.call_tool()
-async def call_tool(name: str, arguments: dict):
-    if name == "k8s_list":
-        raw = await _safe_call(k8s_list(arguments))
-    elif name == "k8s_get":
-        raw = await _safe_call(k8s_get(arguments))
-    elif name == "k8s_list_events":
-        raw = await _safe_call(k8s_list_events(arguments))
-    elif name == "k8s_pod_logs":
-        raw = await _safe_call(k8s_pod_logs(arguments))
-    elif name == "k8s_delete":
-        raw = await _safe_call(k8s_delete(arguments))
-    elif name == "k8s_patch":
-        raw = await _safe_call(k8s_patch(arguments))
-    else:
+# Read tools whose concurrent identical calls share one execution
+COALESCED_TOOLS = {"k8s_list", "k8s_get", "k8s_batch_get", "k8s_list_events"}
+WRITE_TOOLS = {"k8s_delete", "k8s_patch"}
+
+
+TOOL_HANDLERS = {
+    "k8s_list": k8s_list,
+    "k8s_get": k8s_get,
+    "k8s_batch_get": k8s_batch_get,
+    "k8s_list_events": k8s_list_events,
+    "k8s_pod_logs": k8s_pod_logs,
+    "k8s_pod_logs_grep": k8s_pod_logs_grep,
+    "k8s_workload_logs": k8s_workload_logs,
+    "k8s_delete": k8s_delete,
+    "k8s_patch": k8s_patch,
+}
+
+
+async def _run_tool(name: str, arguments: dict) -> str:
+    handler = TOOL_HANDLERS.get(name)
+    if handler is None:
         raise ValueError(f"Unknown tool: {name}")
+    raw = await _safe_call(handler(arguments))
+
+    with metrics.phase("sanitize"):
+        safe = sanitize_output(tool_name=name, raw=raw)
+    size = len(safe.encode("utf-8"))
+    metrics.set_response_bytes(size)
+    logger.info("%s response: %d bytes (%d before sanitize)", name, size, len(raw.encode("utf-8")))
+    return safe
+
+
+_background: Set[asyncio.Task] = set()
+_prewarm_started = False
+
+
+def _start_prewarm() -> None:
+    # Once per process: over HTTP every new session sends its own "initialized"
+    global _prewarm_started
+    if settings.PREWARM and not _prewarm_started:
+        _prewarm_started = True
+        task = asyncio.get_running_loop().create_task(run_blocking("prewarm", prewarm))
+        _background.add(task)
+        task.add_done_callback(_background.discard)
 
-    safe = sanitize_output(tool_name=name, raw=raw)
+
+async def _on_initialized(_notification: InitializedNotification) -> None:
+    # initialize/list_tools never touch the kubernetes client; load it now,
+    # off the event loop, so the first tool call does not pay for the import
+    _start_prewarm()
+
+
+server.notification_handlers[InitializedNotification] = _on_initialized
+
+
+def _current_session():
+    try:
+        return server.request_context.session
+    except LookupError:
+        return None
+
+
+@server.call_tool()
+async def call_tool(name: str, arguments: dict):
+    # Tool names become metric labels: a client must not be able to add series
+    with metrics.tool_call(name if name in TOOL_HANDLERS else "unknown") as call:
+        # Over HTTP, calls beyond the session's limit wait here ("queue" phase)
+        async with sessions.slot(_current_session()):
+            if name in COALESCED_TOOLS:
+                safe = await singleflight.do(singleflight.key(name, arguments), lambda: _run_tool(name, arguments))
+                # A coalesced caller did not run _safe_call itself; these tools'
+                # successful outputs never start with either prefix
+                if safe.startswith("BLOCKED: "):
+                    call.outcome = "blocked"
+                elif safe.startswith("ERROR: "):
+                    call.outcome = "error"
+            else:
+                safe = await _run_tool(name, arguments)
+                if name in WRITE_TOOLS:
+                    singleflight.forget()
+        if not call.response_bytes:  # coalesced: measured by the call that ran
+            call.response_bytes = len(safe.encode("utf-8"))
     return [TextContent(type="text", text=safe)]
 
 
 if __name__ == "__main__":
-    import asyncio
+    import argparse
+
     from mcp.types import ServerCapabilities
 
+    parser = argparse.ArgumentParser(description="mcp-k8s-agent MCP server")
+    parser.add_argument("--transport", choices=["stdio", "http"], default=settings.TRANSPORT)
+    parser.add_argument("--host", default=settings.HTTP_HOST, help="HTTP listen address (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=settings.HTTP_PORT, help="HTTP listen port (default: %(default)s)")
+    args = parser.parse_args()
+
     async def main():
         logger.info(
             "mcp-k8s-agent started | Phase 4 enabled | "
             "sanitized outputs, bounded logs, approval-gated writes, intent-only patches"
         )
-        async with stdio_server() as (read_stream, write_stream):
-            await server.run(
-                read_stream=read_stream,
-                write_stream=write_stream,
-                initialization_options=InitializationOptions(
-                    server_name="mcp-k8s-agent",
-                    server_version="0.2.0",
-                    capabilities=ServerCapabilities(tools={}),
-                ),
-            )
-
-    asyncio.run(main())
\ No newline at end of file
+        metrics.start_http_server()
+        metrics.start_file_writer()
+        try:
+            if args.transport == "http":
+                import http_transport
+
+                # A long-lived server warms up before the first session arrives
+                _start_prewarm()
+                await http_transport.serve(server, args.host, args.port)
+            else:
+                async with stdio_server() as (read_stream, write_stream):
+                    await server.run(
+                        read_stream=read_stream,
+                        write_stream=write_stream,
+                        initialization_options=InitializationOptions(
+                            server_name="mcp-k8s-agent",
+                            server_version="0.2.0",
+                            capabilities=ServerCapabilities(tools={}),
+                        ),
+                    )
+        finally:
+            logger.info("coalesced reads: %s", singleflight.stats())
+            logger.info("tool calls: %s", metrics.stats())
+            metrics.shutdown()
+            if response_cache.enabled():
+                logger.info("response cache: %s", response_cache.stats())
+            # Pooled API connections and I/O threads live for the whole process
+            informer.stop_informers()
+            await k8s_async.close()
+            shutdown_executor()
+            close_clients()
+
+    asyncio.run(main())
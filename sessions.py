@@ -0,0 +1,55 @@
+import asyncio
+import weakref
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional
+
+import metrics
+import settings
+
+
+# -----------------------------
+# Per-session limits and drain
+# -----------------------------
+# One process may serve many MCP sessions (HTTP transport). Each session may
+# have at most SESSION_MAX_INFLIGHT tool calls running; further calls wait
+# (counted as "queue" time), so one busy agent cannot take every I/O worker
+# from the others. Clients, caches and the connection pool stay shared.
+_slots: "weakref.WeakKeyDictionary[Any, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+_inflight = 0
+
+
+def _semaphore(session: Any) -> asyncio.Semaphore:
+    sem = _slots.get(session)
+    if sem is None:
+        sem = _slots[session] = asyncio.Semaphore(max(1, settings.SESSION_MAX_INFLIGHT))
+    return sem
+
+
+@asynccontextmanager
+async def slot(session: Optional[Any]) -> AsyncIterator[None]:
+    """Hold one of `session`'s call slots (no per-session limit when None)."""
+    global _inflight
+    sem = _semaphore(session) if session is not None else None
+    if sem is not None:
+        with metrics.phase("queue"):
+            await sem.acquire()
+    _inflight += 1
+    try:
+        yield
+    finally:
+        _inflight -= 1
+        if sem is not None:
+            sem.release()
+
+
+def inflight() -> int:
+    return _inflight
+
+
+async def drain(timeout: float) -> int:
+    """Wait up to `timeout` seconds for running tool calls; returns how many are left."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while _inflight and loop.time() < deadline:
+        await asyncio.sleep(0.05)
+    return _inflight
@@ -0,0 +1,216 @@
+import os
+from typing import Dict
+
+
+# -----------------------------
+# Environment helpers
+# -----------------------------
+def _env_int(name: str, default: int) -> int:
+    val = os.environ.get(name)
+    if val is None or not val.strip():
+        return default
+    return int(val)
+
+
+def _env_float(name: str, default: float) -> float:
+    val = os.environ.get(name)
+    if val is None or not val.strip():
+        return default
+    return float(val)
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    val = os.environ.get(name)
+    if val is None or not val.strip():
+        return default
+    return val.strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _env_str(name: str, default: str) -> str:
+    val = os.environ.get(name)
+    if val is None or not val.strip():
+        return default
+    return val.strip()
+
+
+def _env_limits(name: str, default: str) -> Dict[str, int]:
+    """Parse "key=int,key=int" into a dict."""
+    limits = {}
+    for part in _env_str(name, default).split(","):
+        if "=" not in part:
+            continue
+        key, _, limit = part.partition("=")
+        limits[key.strip()] = int(limit)
+    return limits
+
+
+# -----------------------------
+# Kubernetes client
+# -----------------------------
+# Max pooled HTTP connections to the API server (shared by all tools)
+K8S_POOL_MAXSIZE = _env_int("MCP_K8S_POOL_MAXSIZE", 16)
+
+# How often (seconds) the kubeconfig files are re-stat'ed for changes
+KUBECONFIG_RECHECK_SECONDS = _env_float("MCP_K8S_KUBECONFIG_RECHECK_SECONDS", 5.0)
+
+# Load the client, kubeconfig and discovery index in the background once the
+# MCP handshake is done (otherwise on the first tool call)
+PREWARM = _env_bool("MCP_K8S_PREWARM", True)
+
+# -----------------------------
+# Discovery index
+# -----------------------------
+# Group-version discovery results older than this are refetched
+DISCOVERY_TTL_SECONDS = _env_float("MCP_K8S_DISCOVERY_TTL_SECONDS", 600.0)
+
+# A lookup miss refetches its group-version only if the entry is older than this
+DISCOVERY_MISS_REFRESH_SECONDS = _env_float("MCP_K8S_DISCOVERY_MISS_REFRESH_SECONDS", 30.0)
+
+# Where per-cluster discovery indexes are persisted across restarts
+DISCOVERY_CACHE_DIR = _env_str("MCP_K8S_DISCOVERY_CACHE_DIR", "~/.cache/mcp-k8s-agent")
+
+# -----------------------------
+# Blocking I/O executor
+# -----------------------------
+# Worker threads shared by all tools for blocking kubernetes-client calls
+K8S_IO_WORKERS = _env_int("MCP_K8S_IO_WORKERS", 16)
+
+# Max in-flight blocking calls per tool; override per tool with
+# MCP_K8S_TOOL_CONCURRENCY="k8s_pod_logs=4,k8s_list=8". A log search can
+# hold its thread for the whole scan.
+TOOL_CONCURRENCY_DEFAULT = _env_int("MCP_K8S_TOOL_CONCURRENCY_DEFAULT", 8)
+TOOL_CONCURRENCY = _env_limits("MCP_K8S_TOOL_CONCURRENCY", "k8s_pod_logs=4,k8s_pod_logs_grep=2")
+
+# -----------------------------
+# Read transport
+# -----------------------------
+# "client" (kubernetes python client on the I/O pool) or "async" (httpx)
+READ_TRANSPORT = _env_str("MCP_K8S_READ_TRANSPORT", "client").lower()
+
+# Per-request timeout for the async transport
+ASYNC_TIMEOUT_SECONDS = _env_float("MCP_K8S_ASYNC_TIMEOUT_SECONDS", 30.0)
+
+# -----------------------------
+# Informer cache
+# -----------------------------
+# Serve k8s_list / k8s_get from LIST+WATCH backed in-memory stores
+INFORMERS_ENABLED = _env_bool("MCP_K8S_INFORMERS", False)
+
+# A store is only served if its watch was known-good this recently
+INFORMER_MAX_STALENESS_SECONDS = _env_float("MCP_K8S_INFORMER_MAX_STALENESS_SECONDS", 60.0)
+
+# Server-side timeout of each WATCH request (the watch is then resumed)
+INFORMER_WATCH_TIMEOUT_SECONDS = _env_int("MCP_K8S_INFORMER_WATCH_TIMEOUT_SECONDS", 30)
+
+# Watches with no reads for this long are stopped
+INFORMER_IDLE_SECONDS = _env_float("MCP_K8S_INFORMER_IDLE_SECONDS", 600.0)
+
+# Cap on objects held across all informer stores
+INFORMER_MAX_OBJECTS = _env_int("MCP_K8S_INFORMER_MAX_OBJECTS", 20000)
+
+# -----------------------------
+# List paging
+# -----------------------------
+# Page size for k8s_list when the caller gives no limit (max: gate.LIST_MAX_LIMIT)
+LIST_DEFAULT_LIMIT = _env_int("MCP_K8S_LIST_DEFAULT_LIMIT", 100)
+
+# How long issued continue handles stay valid (the API expires tokens after ~5m)
+LIST_CONTINUE_TTL_SECONDS = _env_float("MCP_K8S_LIST_CONTINUE_TTL_SECONDS", 300.0)
+
+# Change cursors (k8s_list changes_since): how long one stays valid and how
+# many are kept; each holds a name -> resourceVersion map of its collection
+LIST_CURSOR_TTL_SECONDS = _env_float("MCP_K8S_LIST_CURSOR_TTL_SECONDS", 1800.0)
+LIST_CURSOR_MAX_ENTRIES = _env_int("MCP_K8S_LIST_CURSOR_MAX_ENTRIES", 128)
+
+# -----------------------------
+# Response cache
+# -----------------------------
+# Opt-in: repeated identical k8s_get / k8s_list calls are answered from the
+# last output for RESPONSE_CACHE_TTL_SECONDS
+RESPONSE_CACHE_ENABLED = _env_bool("MCP_K8S_RESPONSE_CACHE", False)
+RESPONSE_CACHE_TTL_SECONDS = _env_float("MCP_K8S_RESPONSE_CACHE_TTL_SECONDS", 5.0)
+RESPONSE_CACHE_MAX_ENTRIES = _env_int("MCP_K8S_RESPONSE_CACHE_MAX_ENTRIES", 512)
+RESPONSE_CACHE_MAX_BYTES = _env_int("MCP_K8S_RESPONSE_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+
+# After the TTL, k8s_get still reads the object but reuses the cached output
+# when its metadata.resourceVersion is unchanged
+RESPONSE_CACHE_REVALIDATE = _env_bool("MCP_K8S_RESPONSE_CACHE_REVALIDATE", True)
+
+# -----------------------------
+# Batch reads
+# -----------------------------
+# Targets of one k8s_batch_get fetched at once
+BATCH_GET_CONCURRENCY = _env_int("MCP_K8S_BATCH_GET_CONCURRENCY", 8)
+
+# -----------------------------
+# Pod logs
+# -----------------------------
+# Raw log bytes read per k8s_pod_logs call when the caller gives no
+# limit_bytes (max: gate.LOG_MAX_LIMIT_BYTES)
+LOG_DEFAULT_LIMIT_BYTES = _env_int("MCP_K8S_LOG_DEFAULT_LIMIT_BYTES", 1024 * 1024)
+
+# Log bytes k8s_pod_logs_grep scans when no limit_bytes is given
+# (max: gate.LOG_GREP_MAX_SCAN_BYTES)
+LOG_GREP_DEFAULT_SCAN_BYTES = _env_int("MCP_K8S_LOG_GREP_DEFAULT_SCAN_BYTES", 256 * 1024 * 1024)
+
+# Matching lines k8s_pod_logs_grep returns when no max_matches is given
+LOG_GREP_DEFAULT_MAX_MATCHES = _env_int("MCP_K8S_LOG_GREP_DEFAULT_MAX_MATCHES", 100)
+
+# k8s_workload_logs: concurrent log reads per call, pods read when no
+# max_pods is given, and lines per container when neither tail_lines nor
+# since_seconds is given
+WORKLOAD_LOG_CONCURRENCY = _env_int("MCP_K8S_WORKLOAD_LOG_CONCURRENCY", 4)
+WORKLOAD_LOG_DEFAULT_MAX_PODS = _env_int("MCP_K8S_WORKLOAD_LOG_DEFAULT_MAX_PODS", 20)
+WORKLOAD_LOG_DEFAULT_TAIL_LINES = _env_int("MCP_K8S_WORKLOAD_LOG_DEFAULT_TAIL_LINES", 100)
+
+# Longer log lines are cut, so a single huge line cannot grow memory
+LOG_MAX_LINE_BYTES = _env_int("MCP_K8S_LOG_MAX_LINE_BYTES", 16 * 1024)
+
+# -----------------------------
+# Output
+# -----------------------------
+# Default serialization for object-shaped tool output: json, compact, ndjson, yaml
+OUTPUT_FORMAT = _env_str("MCP_K8S_OUTPUT_FORMAT", "json").lower()
+
+# Default pruning profile for k8s_list / k8s_get / k8s_batch_get objects:
+# minimal, standard or full (per call: prune; see constants.PRUNE_PROFILES).
+# full is the pruning done before profiles existed
+PRUNE_PROFILE = _env_str("MCP_K8S_PRUNE_PROFILE", "full").lower()
+
+# -----------------------------
+# MCP transport
+# -----------------------------
+# "stdio" (one session per process) or "http" (streamable HTTP: many
+# sessions share one process, its connection pool and caches)
+TRANSPORT = _env_str("MCP_K8S_TRANSPORT", "stdio").lower()
+
+# Listen address for the HTTP transport. There is no authentication: keep it
+# on loopback unless something in front of it authenticates callers.
+HTTP_HOST = _env_str("MCP_K8S_HTTP_HOST", "127.0.0.1")
+HTTP_PORT = _env_int("MCP_K8S_HTTP_PORT", 8000)
+
+# Open sessions at most, and how long an idle session is kept
+HTTP_MAX_SESSIONS = _env_int("MCP_K8S_HTTP_MAX_SESSIONS", 100)
+HTTP_SESSION_IDLE_SECONDS = _env_float("MCP_K8S_HTTP_SESSION_IDLE_SECONDS", 1800.0)
+
+# On shutdown, running tool calls get this long to finish
+HTTP_DRAIN_SECONDS = _env_float("MCP_K8S_HTTP_DRAIN_SECONDS", 30.0)
+
+# Max concurrent tool calls per session; more calls from the same session wait
+SESSION_MAX_INFLIGHT = _env_int("MCP_K8S_SESSION_MAX_INFLIGHT", 8)
+
+# -----------------------------
+# Metrics and tracing
+# -----------------------------
+# Prometheus text-format metrics (per-tool calls, latency, per-phase time,
+# response size): rewritten to this file every interval, from a background
+# thread, and at exit
+METRICS_FILE = _env_str("MCP_K8S_METRICS_FILE", "")
+METRICS_FILE_INTERVAL_SECONDS = _env_float("MCP_K8S_METRICS_FILE_INTERVAL_SECONDS", 10.0)
+
+# Serve the same metrics on http://127.0.0.1:<port>/metrics (0 = off)
+METRICS_PORT = _env_int("MCP_K8S_METRICS_PORT", 0)
+
+# Emit an OpenTelemetry span per tool call and per phase (needs
+# opentelemetry-api plus an SDK/exporter configured by the host)
+TRACING_ENABLED = _env_bool("MCP_K8S_TRACING", False)
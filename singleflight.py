@@ -0,0 +1,47 @@
+import json
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Mapping
+
+import metrics
+
+# -----------------------------
+# Request coalescing
+# -----------------------------
+# Identical read calls that arrive while one is already running wait for
+# that call and share its (already sanitized) result instead of issuing
+# their own API requests. A finished call is not remembered: only requests
+# that overlap in time are merged.
+_flights: Dict[Hashable, "asyncio.Future[Any]"] = {}
+_stats = {"calls": 0, "coalesced": 0}
+
+
+def key(tool_name: str, arguments: Mapping[str, Any]) -> Hashable:
+    return tool_name, json.dumps(arguments, sort_keys=True, separators=(",", ":"))
+
+
+async def do(flight_key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+    """Result of fn(), shared with every concurrent call using the same key."""
+    _stats["calls"] += 1
+    flight = _flights.get(flight_key)
+    if flight is None or flight.get_loop() is not asyncio.get_running_loop():
+        flight = asyncio.ensure_future(fn())
+        _flights[flight_key] = flight
+        flight.add_done_callback(lambda f: _flights.pop(flight_key, None) if _flights.get(flight_key) is f else None)
+        # shield: one caller giving up does not cancel the call for the others
+        return await asyncio.shield(flight)
+
+    _stats["coalesced"] += 1
+    with metrics.phase("coalesced"):
+        return await asyncio.shield(flight)
+
+
+def forget() -> None:
+    """Make later calls start fresh (after a write, in-flight reads may be stale)."""
+    _flights.clear()
+
+
+def stats() -> Dict[str, int]:
+    return dict(_stats)
+
+
+metrics.register_stats("singleflight", "Coalesced read calls", stats, counters=("calls", "coalesced"))
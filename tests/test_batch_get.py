@@ -0,0 +1,68 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import asyncio
+import json
+import time
+
+import pytest
+
+import tools_read
+from gate import BulkOperationBlocked, RequestContext, enforce
+
+
+def _target(name, plural="pods", **extra):
+    return {"namespace": "default", "version": "v1", "plural": plural, "name": name, **extra}
+
+
+@pytest.fixture
+def fetched(monkeypatch):
+    calls = []
+
+    def fetch_object(namespace, name, api_version, plural):
+        calls.append((plural, name))
+        if name == "gone":
+            raise RuntimeError("pods \"gone\" not found")
+        # Earlier targets answer later, so completion order is reversed
+        time.sleep({"a": 0.03, "b": 0.02, "c": 0.01}.get(name, 0))
+        return {"kind": "Pod", "metadata": {"name": name, "namespace": namespace}}
+
+    monkeypatch.setattr(tools_read, "_fetch_object", fetch_object)
+    return calls
+
+
+def _batch(targets):
+    return json.loads(asyncio.run(tools_read.k8s_batch_get({"targets": targets})))
+
+
+def test_results_follow_request_order_with_errors_in_place(fetched):
+    out = _batch([_target("a"), _target("gone"), _target("b"), _target("c")])
+
+    assert [r["target"] for r in out["items"]] == [f"default/v1/pods/{n}" for n in ("a", "gone", "b", "c")]
+    assert [r["object"]["metadata"]["name"] for r in out["items"] if "object" in r] == ["a", "b", "c"]
+    assert out["items"][1]["error"].startswith("ERROR: ")
+    assert (out["targets"], out["errors"]) == (4, 1)
+
+
+@pytest.mark.parametrize(
+    "forbidden",
+    [_target("creds", plural="secrets"), _target("settings", plural="configmaps"), _target("creds", kind="Secret")],
+)
+def test_each_target_passes_the_gate(fetched, forbidden):
+    out = _batch([_target("a"), forbidden, _target("b")])
+
+    assert out["items"][1]["error"].startswith("BLOCKED: ")
+    assert "object" in out["items"][0] and "object" in out["items"][2]
+    assert sorted(fetched) == [("pods", "a"), ("pods", "b")]  # the forbidden target is never read
+
+
+def test_bulk_arguments_inside_a_target_reject_the_batch():
+    with pytest.raises(BulkOperationBlocked):
+        enforce(
+            RequestContext(
+                tool_name="k8s_batch_get",
+                verb="batch_get",
+                arguments={"targets": [_target("a", label_selector="app=web")]},
+            )
+        )
@@ -0,0 +1,22 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from changes import ADDED, DELETED, MODIFIED, advance, changed, digest_of
+
+
+def _obj(name, rv):
+    return {"metadata": {"name": name, "resourceVersion": rv}}
+
+
+def test_changes_since_digest_and_unreported_changes_carry_over():
+    before = digest_of([_obj("a", "1"), _obj("b", "1"), _obj("c", "1")])
+    now = digest_of([_obj("a", "1"), _obj("b", "2"), _obj("d", "3")])
+
+    diff = changed(before, now)
+    assert diff == [("b", MODIFIED), ("c", DELETED), ("d", ADDED)]
+
+    # Only the first two were shown: "d" is still new relative to the next cursor
+    after = advance(before, {"b": "2", "c": None})
+    assert after == {"a": "1", "b": "2"}
+    assert changed(after, now) == [("d", ADDED)]
@@ -0,0 +1,101 @@
+import sys
+import os
+import json
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+
+import k8s_resource
+import metrics
+from gate import ForbiddenKind
+
+CORE_V1 = {
+    "resources": [
+        {"name": "pods", "singularName": "pod", "kind": "Pod", "namespaced": True, "verbs": ["get", "list"], "shortNames": ["po"]},
+        {"name": "pods/log", "singularName": "", "kind": "Pod", "namespaced": True, "verbs": ["get"]},
+        {"name": "configmaps", "singularName": "configmap", "kind": "ConfigMap", "namespaced": True, "verbs": ["get"], "shortNames": ["cm"]},
+        {"name": "secrets", "singularName": "secret", "kind": "Secret", "namespaced": True, "verbs": ["get"]},
+    ]
+}
+
+
+class _Resp:
+    def __init__(self, body):
+        self.data = json.dumps(body).encode()
+
+
+class FakeDynamic:
+    def __init__(self, host="https://cluster-a"):
+        self.configuration = type("Cfg", (), {"host": host})()
+        self.requests = []
+
+    def request(self, method, path, serialize=False):
+        self.requests.append(path)
+        return _Resp(CORE_V1)
+
+
+@pytest.fixture
+def dyn(tmp_path, monkeypatch):
+    monkeypatch.setattr(k8s_resource.settings, "DISCOVERY_CACHE_DIR", str(tmp_path))
+    with k8s_resource._index_lock:
+        k8s_resource._index_host = None
+        k8s_resource._use_index_of("")
+    return FakeDynamic()
+
+
+@pytest.mark.parametrize("plural", ["cm", "configmap", "ConfigMap", "secret", "Secret"])
+def test_aliases_of_forbidden_resources_are_blocked(dyn, plural):
+    with pytest.raises(ForbiddenKind):
+        k8s_resource.get_resource(dyn, "v1", plural)
+
+
+def test_index_resolves_aliases_from_one_fetch(dyn):
+    by_short = k8s_resource.get_resource(dyn, "v1", "po")
+    by_kind = k8s_resource.get_resource(dyn, "v1", "Pod")
+
+    assert by_short.name == by_kind.name == "pods" and by_short.kind == "Pod"
+    assert "log" in by_short.subresources
+    assert dyn.requests == ["/api/v1"]
+
+
+def test_expired_entries_are_refetched(dyn, monkeypatch):
+    k8s_resource.get_resource(dyn, "v1", "pods")
+    monkeypatch.setattr(k8s_resource.settings, "DISCOVERY_TTL_SECONDS", 0)
+    k8s_resource.get_resource(dyn, "v1", "pods")
+
+    assert dyn.requests == ["/api/v1", "/api/v1"]
+
+
+def test_a_miss_refetches_only_once_the_index_is_old(dyn, monkeypatch):
+    k8s_resource.get_resource(dyn, "v1", "pods")
+    monkeypatch.setattr(k8s_resource.settings, "DISCOVERY_MISS_REFRESH_SECONDS", 3600)
+    assert k8s_resource._resolve_indexed(dyn, "v1", "widgets") is None
+    assert dyn.requests == ["/api/v1"]
+
+    monkeypatch.setattr(k8s_resource.settings, "DISCOVERY_MISS_REFRESH_SECONDS", 0)
+    assert k8s_resource._resolve_indexed(dyn, "v1", "widgets") is None
+    assert dyn.requests == ["/api/v1", "/api/v1"]
+
+
+def test_index_is_persisted_per_cluster(dyn):
+    k8s_resource.get_resource(dyn, "v1", "pods")
+    with k8s_resource._index_lock:  # a new process: empty in-memory index
+        k8s_resource._use_index_of("")
+
+    restarted = FakeDynamic()
+    assert k8s_resource.get_resource(restarted, "v1", "po").name == "pods"
+    assert restarted.requests == []
+
+    other_cluster = FakeDynamic(host="https://cluster-b")
+    k8s_resource.get_resource(other_cluster, "v1", "pods")
+    assert other_cluster.requests == ["/api/v1"]
+
+
+def test_discovery_counters_are_exported(dyn):
+    k8s_resource.get_resource(dyn, "v1", "pods")
+    stats = k8s_resource.discovery_stats()
+    text = metrics.render_prometheus()
+
+    assert stats["indexed_resources"] == 3
+    assert f"mcp_k8s_discovery_refreshes_total {stats['refreshes']}\n" in text
+    assert "mcp_k8s_discovery_indexed_resources 3\n" in text
@@ -0,0 +1,138 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import asyncio
+import json
+import time
+
+import pytest
+from kubernetes.client.exceptions import ApiException
+
+import informer
+
+KEY = ("default", "v1", "pods")
+
+
+def _pod(name, rv="1"):
+    return {"metadata": {"name": name, "resourceVersion": rv}}
+
+
+class _Resp:
+    def __init__(self, body):
+        self.data = json.dumps(body).encode()
+
+
+class StubResource:
+    """LISTs return `items`; each watch() call plays the next script entry."""
+
+    kind = "Pod"
+
+    def __init__(self, items, scripts=()):
+        self.items = items
+        self.scripts = list(scripts)
+        self.lists = 0
+        self.watches = 0
+
+    def get(self, namespace, serialize=False):
+        self.lists += 1
+        return _Resp({"kind": "PodList", "metadata": {"resourceVersion": "1"}, "items": self.items})
+
+    def watch(self, **kwargs):
+        self.watches += 1
+        yield from self.scripts.pop(0)(kwargs)
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    monkeypatch.setattr(informer, "_registry", informer._Registry())
+    monkeypatch.setattr(informer, "load_dynamic_client", lambda: None)
+    return informer._registry
+
+
+def _use(monkeypatch, resource):
+    monkeypatch.setattr(informer, "get_resource", lambda dyn, api_version, plural: resource)
+
+
+def _registered(registry, key=KEY):
+    """An informer past its first LIST, as _informer_for leaves it."""
+    inf = informer._Informer(key)
+    inf.relist()
+    inf.ready.set()
+    registry.informers[key] = inf
+    return inf
+
+
+def test_watch_relists_after_410_gone(registry, monkeypatch):
+    def gone(kwargs):
+        raise ApiException(status=410, reason="Gone")
+        yield
+
+    def added(kwargs):
+        yield {"type": "ADDED", "raw_object": _pod("b", "7")}
+        inf.stop()
+
+    resource = StubResource([_pod("a")], [gone, added])
+    _use(monkeypatch, resource)
+    inf = _registered(registry)
+    inf.run()
+
+    assert resource.lists == 2 and resource.watches == 2
+    assert sorted(inf.store) == ["a", "b"] and inf.resource_version == "7"
+    assert KEY not in registry.informers
+
+
+def test_idle_informer_stops_without_watching(registry, monkeypatch):
+    resource = StubResource([_pod("a")])
+    _use(monkeypatch, resource)
+    monkeypatch.setattr(informer.settings, "INFORMER_IDLE_SECONDS", 1.0)
+    inf = _registered(registry)
+    inf.last_access = time.monotonic() - 5
+    inf.run()
+
+    assert resource.watches == 0 and inf.stopped.is_set()
+    assert KEY not in registry.informers
+
+
+def test_too_large_collections_are_read_from_the_api(registry, monkeypatch):
+    resource = StubResource([_pod("a"), _pod("b")])
+    _use(monkeypatch, resource)
+    monkeypatch.setattr(informer.settings, "INFORMER_MAX_OBJECTS", 1)
+
+    for _ in range(2):
+        assert asyncio.run(informer.read_list("k8s_list", *KEY)) is None
+
+    assert resource.lists == 1  # remembered, not listed again
+    assert KEY in registry.too_large and not registry.informers
+
+
+def test_stale_store_is_bypassed(registry, monkeypatch):
+    _use(monkeypatch, StubResource([_pod("a")]))
+    inf = _registered(registry)
+    assert asyncio.run(informer.read_object("k8s_get", "default", "a", "v1", "pods")) == _pod("a") | {
+        "apiVersion": "v1",
+        "kind": "Pod",
+    }
+
+    inf.synced_at = time.monotonic() - informer.settings.INFORMER_MAX_STALENESS_SECONDS - 1
+    assert not inf.fresh()
+    assert asyncio.run(informer.read_object("k8s_get", "default", "a", "v1", "pods")) is None
+
+
+def test_watch_events_count_against_the_cap(registry, monkeypatch):
+    monkeypatch.setattr(informer.settings, "INFORMER_MAX_OBJECTS", 3)
+    _use(monkeypatch, StubResource([_pod("a"), _pod("b")]))
+    old = _registered(registry, ("default", "v1", "pods"))
+    old.last_access -= 10
+    _use(monkeypatch, StubResource([_pod("x")]))
+    new = _registered(registry, ("other", "v1", "pods"))
+
+    new._apply({"type": "MODIFIED", "raw_object": _pod("x", "2")})  # not a new object
+    assert registry.total_objects() == 3 and old.key in registry.informers
+
+    new._apply({"type": "ADDED", "raw_object": _pod("y", "3")})
+    assert old.stopped.is_set() and list(registry.informers) == [new.key]
+
+    for name in ("z", "w"):  # grows past the cap on its own
+        new._apply({"type": "ADDED", "raw_object": _pod(name, "4")})
+    assert new.stopped.is_set() and new.key in registry.too_large
@@ -0,0 +1,50 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import k8s_async
+
+
+class FakeConfig:
+    host = "https://k8s.example"
+    verify_ssl = False
+
+    def __init__(self):
+        self.threads = []
+
+    def auth_settings(self):
+        self.threads.append(threading.current_thread())
+        return {"BearerToken": {"value": "Bearer t"}}
+
+
+def test_client_setup_runs_off_the_loop_and_closes_replaced_clients(monkeypatch):
+    configs = [SimpleNamespace(configuration=FakeConfig()) for _ in range(2)]
+    current = configs[0]
+    threads = []
+
+    def get_api_client():
+        threads.append(threading.current_thread())
+        return current
+
+    monkeypatch.setattr(k8s_async, "get_api_client", get_api_client)
+    monkeypatch.setattr(k8s_async, "_client", None)
+
+    async def main():
+        nonlocal current
+        first, cfg = await k8s_async._get_client()
+        assert await k8s_async._headers(cfg, "*/*") == {"Accept": "*/*", "Authorization": "Bearer t"}
+        assert (await k8s_async._get_client())[0] is first
+
+        current = configs[1]  # kubeconfig reloaded
+        second, _ = await k8s_async._get_client()
+        assert second is not first and first.is_closed and not second.is_closed
+        await k8s_async.close()
+
+    asyncio.run(main())
+    main_thread = threading.main_thread()
+    assert threads and main_thread not in threads
+    assert main_thread not in configs[0].configuration.threads
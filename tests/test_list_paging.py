@@ -0,0 +1,115 @@
+import sys
+import os
+import asyncio
+import copy
+import json
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+import yaml
+
+import tools_read
+from sanitize import MAX_LINES, sanitize_output
+
+BASE = {"namespace": "ns", "group": "", "version": "v1", "plural": "pods"}
+
+
+def _pod(i, rv="1"):
+    return {
+        "metadata": {"name": f"pod-{i:03d}", "namespace": "ns", "resourceVersion": rv, "labels": {"app": "web"}},
+        "spec": {"containers": [{"name": c, "image": f"web:{i}", "args": ["--a", "--b"]} for c in ("app", "proxy")]},
+        "status": {"phase": "Running", "podIP": f"10.0.0.{i % 250}"},
+    }
+
+
+@pytest.fixture
+def pods(monkeypatch):
+    pods = {p["metadata"]["name"]: p for p in (_pod(i) for i in range(150))}
+
+    def fetch_list(namespace, api_version, plural, limit, token, on_item):
+        names = sorted(pods)
+        start = int(token or 0)
+        envelope = {"apiVersion": "v1", "kind": "PodList", "metadata": {"resourceVersion": "9"}}
+        if start + limit < len(names):
+            envelope["metadata"]["continue"] = str(start + limit)
+        for name in names[start : start + limit]:
+            on_item(copy.deepcopy(pods[name]), envelope)
+        return envelope
+
+    def fetch_list_metadata(namespace, api_version, plural, token):
+        items = [{"metadata": p["metadata"]} for p in pods.values()]
+        return {"kind": "PartialObjectMetadataList", "metadata": {}, "items": items}
+
+    def fetch_object(namespace, name, api_version, plural):
+        return copy.deepcopy(pods[name])
+
+    monkeypatch.setattr(tools_read, "_fetch_list", fetch_list)
+    monkeypatch.setattr(tools_read, "_fetch_list_metadata", fetch_list_metadata)
+    monkeypatch.setattr(tools_read, "_fetch_object", fetch_object)
+    return pods
+
+
+def _call(arguments):
+    """k8s_list as the caller sees it: through the server's output truncation."""
+    out = sanitize_output("k8s_list", asyncio.run(tools_read.k8s_list(arguments)))
+    assert "[Output truncated]" not in out and len(out.splitlines()) <= MAX_LINES
+    return out
+
+
+@pytest.mark.parametrize("output", [None, "yaml", "summary"])
+def test_every_page_keeps_its_continue_handle(pods, output):
+    args = dict(BASE, **({"output": output} if output else {}))
+    names, md = [], {"continue": None}
+    while "continue" in md:
+        page = dict(args, **({"continue": md["continue"]} if md["continue"] else {}))
+        out = _call(page)
+        if output == "summary":
+            rows = out.splitlines()
+            names += [r.split()[0] for r in rows[1:] if r.startswith("pod-")]
+            md = dict(r.split(": ", 1) for r in rows if r.startswith(("continue: ", "cursor: ")))
+        else:
+            data = yaml.safe_load(out) if output == "yaml" else json.loads(out)
+            names += [i["metadata"]["name"] for i in data["items"]]
+            md = data["metadata"]
+
+    assert names == sorted(pods)
+    assert "cursor" in md
+
+
+def test_changes_cursor_survives_a_large_diff(pods):
+    md = {"continue": None}
+    while "continue" in md:
+        md = json.loads(_call(dict(BASE, **({"continue": md["continue"]} if md["continue"] else {}))))["metadata"]
+    for p in pods.values():
+        p["metadata"]["resourceVersion"] = "2"
+
+    reported = []
+    cursor = md["cursor"]
+    while True:
+        data = json.loads(_call(dict(BASE, changes_since=cursor, limit=200)))
+        reported += [e["object"]["metadata"]["name"] for e in data["items"]]
+        cursor = data["metadata"]["cursor"]
+        if not data["items"]:
+            break
+
+    assert sorted(reported) == sorted(pods)
+
+
+def test_summary_changes_report_every_object_once(pods):
+    pods.update((p["metadata"]["name"], p) for p in (_pod(i) for i in range(150, 520)))
+    md = {"continue": None}
+    while "continue" in md:
+        md = json.loads(_call(dict(BASE, limit=500, **({"continue": md["continue"]} if md["continue"] else {}))))["metadata"]
+    for p in pods.values():
+        p["metadata"]["resourceVersion"] = "2"
+
+    reported = []
+    cursor = md["cursor"]
+    while True:
+        rows = _call(dict(BASE, changes_since=cursor, limit=500, output="summary")).splitlines()
+        reported += [r.split()[0] for r in rows if r.startswith("pod-")]
+        cursor = next(r.split(": ", 1)[1] for r in rows if r.startswith("cursor: "))
+        if rows[0] == "No changes":
+            break
+
+    assert sorted(reported) == sorted(pods)
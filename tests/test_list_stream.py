@@ -0,0 +1,35 @@
+import sys
+import os
+import json
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+
+from list_stream import decode_list
+
+
+LIST = {
+    "apiVersion": "v1",
+    "kind": "PodList",
+    "metadata": {"resourceVersion": "12", "continue": "abc"},
+    "items": [{"metadata": {"name": f"p{i}", "labels": {"app": "é"}}, "spec": {"n": i * 1.5}} for i in range(20)],
+}
+BODY = json.dumps(LIST, indent=1, ensure_ascii=False).encode("utf-8")
+
+
+def _chunks(data, size):
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", [1, 7, 64, len(BODY)])
+def test_items_arrive_one_by_one_at_any_chunking(size):
+    items = []
+    envelope = decode_list(_chunks(BODY, size), lambda item, env: items.append(item))
+
+    assert items == LIST["items"]
+    assert envelope == {k: v for k, v in LIST.items() if k != "items"}
+
+
+def test_truncated_body_raises():
+    with pytest.raises(ValueError):
+        decode_list(_chunks(BODY[:-40], 64), lambda item, env: None)
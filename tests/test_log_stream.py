@@ -0,0 +1,69 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+
+import gate
+from log_stream import LogBuffer, LogGrep, compile_matcher
+
+
+def test_lines_split_across_chunks_are_redacted():
+    buf = LogBuffer(budget=1024)
+    for chunk in (b"ok\npass", b"word=hunter2\nlast"):
+        assert buf.feed(chunk)
+    buf.finish()
+
+    assert buf.result() == "ok\n[REDACTED: password]\nlast"
+
+
+def test_stops_at_line_and_byte_budgets():
+    lines = LogBuffer(budget=1024, max_lines=2)
+    assert not lines.feed(b"a\nb\nc\nd\n")
+    assert lines.result() == "a\nb\n\n[Output truncated]"
+
+    size = LogBuffer(budget=5)
+    assert not size.feed(b"abc\ndefgh\n")
+    assert size.result() == "abc\nd\n\n[Output truncated]"
+
+
+def test_long_lines_are_cut():
+    buf = LogBuffer(budget=1024, max_line_bytes=4)
+    for chunk in (b"abcdef", b"gh\nxy\n"):
+        buf.feed(chunk)
+    buf.finish()
+
+    assert buf.result() == "abcd [line truncated]\nxy"
+
+
+def test_grep_context_groups_and_redacted_matching():
+    buf = LogGrep(budget=1024, matcher=compile_matcher("err|hunter", None), context=1)
+    buf.feed(b"a\nerr 1\nb\nc\nd\nerr 2\npassword=hunter2\n")
+    buf.finish()
+
+    assert buf.result().split("\n\n")[0] == "1-a\n2:err 1\n3-b\n--\n5-d\n6:err 2\n7-[REDACTED: password]"
+    assert buf.matches == 2
+
+
+def test_grep_output_keeps_its_stats_within_max_lines():
+    buf = LogGrep(budget=1 << 20, matcher=compile_matcher("x", None), context=2, max_matches=200, max_lines=20)
+    assert not buf.feed(b"".join(b"x %d\na\nb\nc\nd\n" % i for i in range(50)))
+    out = buf.result().splitlines()
+
+    assert len(out) <= 20
+    assert out[-1].startswith(f"[{buf.matches} matching lines") and "later matches omitted" in out[-1]
+    assert out[-2] == ""
+
+
+@pytest.mark.parametrize("pattern", ["(a+)+", "(a|b*)*", r"(\w+\s?){2,}", "x" * 300])
+def test_grep_rejects_costly_patterns(pattern):
+    with pytest.raises(gate.InvalidArgument):
+        gate.validate_log_grep_args({"pattern": pattern})
+
+
+def test_level_matches_that_level_or_worse():
+    matcher = compile_matcher(None, "warn")
+
+    assert matcher('{"level":"error","msg":"x"}')
+    assert matcher("W0102 10:00:00.000 1 main.go:1] slow")
+    assert not matcher("INFO started")
@@ -0,0 +1,71 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import asyncio
+import time
+
+import pytest
+
+import metrics
+
+
+def test_phases_are_exclusive_and_exported():
+    with metrics.tool_call("t_test") as call:
+        with metrics.phase("api"):
+            time.sleep(0.02)
+            with metrics.phase("sanitize"):
+                time.sleep(0.01)
+        metrics.set_outcome("blocked")
+
+    assert 0.015 < call.phases["api"] < 0.03
+    assert call.phases["sanitize"] >= 0.01
+    assert call.phases["other"] < 0.01
+
+    text = metrics.render_prometheus()
+    assert 'mcp_k8s_tool_calls_total{tool="t_test",outcome="blocked"} 1' in text
+    assert 'mcp_k8s_tool_phase_seconds_count{tool="t_test",phase="api"} 1' in text
+
+
+def test_phase_outside_a_call_records_nothing():
+    with metrics.phase("api"):
+        pass
+    metrics.record("queue", 1.0)
+
+
+def test_label_values_are_escaped():
+    with metrics.tool_call('t_"quoted"\\path\nline'):
+        pass
+
+    assert 'tool="t_\\"quoted\\"\\\\path\\nline",outcome="ok"} 1\n' in metrics.render_prometheus()
+
+
+def test_unknown_tools_share_one_series():
+    import server
+
+    for name in ("k8s_bogus", "k8s_other"):
+        with pytest.raises(ValueError):
+            asyncio.run(server.call_tool(name, {}))
+
+    text = metrics.render_prometheus()
+    assert 'mcp_k8s_tool_calls_total{tool="unknown",outcome="error"} 2' in text
+    assert "k8s_bogus" not in text
+
+
+def test_metrics_file_is_written_off_the_loop(tmp_path, monkeypatch):
+    path = tmp_path / "metrics.prom"
+    monkeypatch.setattr(metrics.settings, "METRICS_FILE", str(path))
+    monkeypatch.setattr(metrics.settings, "METRICS_FILE_INTERVAL_SECONDS", 0.01)
+    with metrics.tool_call("t_file"):
+        pass
+
+    metrics.start_file_writer()
+    try:
+        deadline = time.monotonic() + 5
+        while not path.exists():
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+    finally:
+        metrics.shutdown()
+    assert 'mcp_k8s_tool_calls_total{tool="t_file",outcome="ok"} 1' in path.read_text()
+    assert metrics._writer is None
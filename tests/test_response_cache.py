@@ -0,0 +1,47 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import asyncio
+
+import metrics
+import response_cache
+from response_cache import CacheEntry, ResponseCache
+
+
+def test_lru_bounds_and_invalidation():
+    cache = ResponseCache(max_entries=2, max_bytes=1 << 20)
+    scope = ("default", "", "pods")
+    for key, name in (("get-a", "a"), ("get-b", "b"), ("list", None)):
+        cache.put(key, CacheEntry(key, None, scope, name), cache.generation)
+
+    assert cache.get("get-a") is None  # least recently used, evicted
+    generation = cache.generation
+    cache.invalidate(scope, "b")
+
+    assert cache.get("get-b") is None and cache.get("list") is None
+    # A read that started before the write must not repopulate the cache
+    cache.put("get-b", CacheEntry("old", None, scope, "b"), generation)
+    assert cache.get("get-b") is None
+
+
+def test_hits_and_misses_are_exported(monkeypatch):
+    monkeypatch.setattr(response_cache.settings, "RESPONSE_CACHE_ENABLED", True)
+    monkeypatch.setattr(response_cache, "_cache", ResponseCache(max_entries=8, max_bytes=1 << 20))
+    monkeypatch.setattr(response_cache, "_cluster_host", lambda: "https://k8s.example")
+
+    async def fetch():
+        return {"metadata": {"name": "a"}}
+
+    async def main():
+        key = await response_cache.cache_key("k8s_get", {"name": "a", "namespace": "default"})
+        assert key == ("https://k8s.example", "k8s_get", '{"name":"a","namespace":"default"}')
+        for _ in range(2):
+            await response_cache.read_through(key, fetch, str, ("default", "", "pods"), "a")
+
+    asyncio.run(main())
+    text = metrics.render_prometheus()
+    assert "mcp_k8s_response_cache_hits_total 1\n" in text
+    assert "mcp_k8s_response_cache_misses_total 1\n" in text
+    assert "mcp_k8s_response_cache_hit_ratio 0.5\n" in text
+    assert "# TYPE mcp_k8s_response_cache_entries gauge" in text
@@ -1,8 +1,10 @@
 import sys
 import os
+import base64
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from sanitize import sanitize_output
+import sanitize
+from sanitize import SanitizedText, prune_k8s_object, sanitize_output
 
 
 def test_redacts_simple_token():
@@ -44,4 +46,106 @@ def test_deterministic_output():
 
     assert out1 == out2
 
+
+def test_keyword_inside_low_entropy_run():
+    raw = "aaaaaaaaaaaaaaaaaaaaaaaaTOKENapi_key=hunter2"
+    out = sanitize_output(tool_name="k8s_pod_logs", raw=raw)
+
+    assert "hunter2" not in out
+    assert out == "aaaaaaaaaaaaaaaaaaaaaaaaTOKEN[REDACTED: api-key]"
+
+
+def test_overlapping_matches_leave_no_value():
+    raw = "auth: Bearer Token = hunter2"
+    out = sanitize_output(tool_name="k8s_pod_logs", raw=raw)
+
+    assert "hunter2" not in out
+
+
+def test_truncates_before_redacting():
+    raw = "\n".join(["line"] * 600 + ["password=hunter2"])
+    out = sanitize_output(tool_name="k8s_pod_logs", raw=raw)
+
+    assert out.endswith("\n\n[Output truncated]")
+    assert len(out.splitlines()) == 502
+
+
+def test_prune_redacts_string_values_outside_safe_paths():
+    secret = "QWxhZGRpbjpvcGVuIHNlc2FtZQ==" * 2
+    obj = {
+        "kind": "Pod",
+        "metadata": {"name": "x" + secret, "annotations": {"note": secret}},
+        "spec": {"containers": [{"name": "app", "args": ["--token=abc123"]}]},
+    }
+    out = prune_k8s_object(obj)
+
+    assert out["metadata"]["name"] == "x" + secret
+    assert out["metadata"]["annotations"]["note"] == "[REDACTED: high-entropy]"
+    assert out["spec"]["containers"][0]["args"] == ["--[REDACTED: token]"]
+    assert obj["metadata"]["annotations"]["note"] == secret  # input untouched
+
+
+POD = {
+    "kind": "Pod",
+    "metadata": {
+        "name": "web-1",
+        "uid": "u-1",
+        "annotations": {"kubectl.kubernetes.io/last-applied-configuration": "{}"},
+        "ownerReferences": [{"kind": "ReplicaSet", "name": "web", "uid": "u-0"}],
+    },
+    "spec": {
+        "dnsPolicy": "ClusterFirst",
+        "restartPolicy": "Never",
+        "containers": [{"name": "app", "terminationMessagePath": "/dev/termination-log", "resources": {}}],
+    },
+    "status": {"conditions": [{"type": "Ready", "status": "True", "lastProbeTime": None}]},
+}
+
+
+def test_prune_profiles():
+    full = prune_k8s_object(POD, "full")
+    standard = prune_k8s_object(POD, "standard")
+    minimal = prune_k8s_object(POD, "minimal")
+
+    assert "uid" not in full["metadata"] and "annotations" in full["metadata"]
+    assert "annotations" not in standard["metadata"]  # emptied by last-applied-configuration
+    assert standard["metadata"]["ownerReferences"] == [{"kind": "ReplicaSet", "name": "web"}]
+    assert standard["spec"] == {"restartPolicy": "Never", "containers": [{"name": "app"}]}  # non-defaults kept
+    assert standard["status"]["conditions"] == [{"type": "Ready", "status": "True"}]
+    assert "ownerReferences" not in minimal["metadata"] and "status" not in minimal  # emptied by conditions
+    assert POD["metadata"]["annotations"] and POD["spec"]["dnsPolicy"] == "ClusterFirst"  # input untouched
+
+
+def test_prune_shares_untouched_subtrees():
+    obj = {"kind": "Widget", "metadata": {"name": "w", "uid": "u"}, "spec": {"size": {"x": 1}}}
+    out = prune_k8s_object(obj, "standard")
+
+    assert out["spec"] is obj["spec"]
+
+
+def test_sanitized_text_is_only_truncated():
+    raw = SanitizedText("token=abc123")
+    assert sanitize_output(tool_name="k8s_get", raw=raw) == "token=abc123"
+
+
+
+def test_only_short_values_are_memoized():
+    sanitize._redacted_memo.cache_clear()
+    for value in ("token=abc123 " + "x" * 1000, "token=abc123"):
+        for _ in range(2):
+            assert sanitize._redacted(value).startswith("[REDACTED: token]")
+
+    info = sanitize._redacted_memo.cache_info()
+    assert info.currsize == 1 and info.hits == 1
+
+
+def test_only_short_entropy_candidates_are_memoized():
+    sanitize._entropy_memo.cache_clear()
+    short = base64.b64encode(bytes(range(0, 240, 7))).decode()
+    for value in (base64.b64encode(bytes(range(256)) * 2).decode(), short):
+        assert sanitize._high_entropy(value)
+
+    assert sanitize._entropy_memo.cache_info().currsize == 1
+
+
 print("✅ sanitize tests passed")
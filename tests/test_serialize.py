@@ -0,0 +1,58 @@
+import sys
+import os
+import json
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import yaml
+
+from serialize import ListWriter, dumps
+
+
+LIST = {
+    "kind": "PodList",
+    "metadata": {"continue": "page-1"},
+    "items": [{"metadata": {"name": "a"}}, {"metadata": {"name": "b"}}],
+}
+
+
+def test_json_matches_indented_sorted_dumps():
+    assert dumps(LIST, "json") == json.dumps(LIST, indent=2, sort_keys=True)
+
+
+def test_compact_has_no_whitespace():
+    out = dumps(LIST, "compact")
+
+    assert "\n" not in out and ", " not in out
+    assert json.loads(out) == LIST
+
+
+def test_ndjson_envelope_then_one_item_per_line():
+    lines = dumps(LIST, "ndjson").splitlines()
+
+    assert json.loads(lines[0]) == {"kind": "PodList", "metadata": {"continue": "page-1"}}
+    assert [json.loads(line) for line in lines[1:]] == LIST["items"]
+
+
+def test_yaml_round_trips():
+    assert yaml.safe_load(dumps(LIST, "yaml")) == LIST
+
+
+def test_list_writer_puts_envelope_before_items():
+    envelope = {k: v for k, v in LIST.items() if k != "items"}
+    for fmt in ("json", "compact", "yaml"):
+        for items in (LIST["items"], []):
+            writer = ListWriter(fmt)
+            for item in items:
+                writer.add(item)
+            out = writer.text(envelope)
+
+            assert (yaml.safe_load(out) if fmt == "yaml" else json.loads(out)) == {**envelope, "items": items}
+            assert out.index("continue") < out.index("items")
+
+
+def test_list_writer_stops_at_max_lines():
+    writer = ListWriter("json", max_lines=12)
+    added = [writer.add({"metadata": {"name": n}}) for n in ("a", "b", "c", "d")]
+
+    assert added == [True, True, False, False]  # 5 lines each
+    assert len(writer.text({"kind": "PodList"}).splitlines()) == 3 + 2 * 5 + 2  # {, kind, items: [ ... ], }
@@ -0,0 +1,34 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import asyncio
+
+import sessions
+import settings
+
+
+def test_slot_limits_each_session_separately(monkeypatch):
+    monkeypatch.setattr(settings, "SESSION_MAX_INFLIGHT", 2)
+
+    class Session:
+        pass
+
+    a, b = Session(), Session()
+    running = {"a": 0, "b": 0}
+    peak = {"a": 0, "b": 0}
+
+    async def call(session, label):
+        async with sessions.slot(session):
+            running[label] += 1
+            peak[label] = max(peak[label], running[label])
+            await asyncio.sleep(0.01)
+            running[label] -= 1
+
+    async def main():
+        await asyncio.gather(*[call(a, "a") for _ in range(6)], *[call(b, "b") for _ in range(3)])
+        assert await sessions.drain(0.1) == 0
+
+    asyncio.run(main())
+    assert peak == {"a": 2, "b": 2}
+    assert sessions.inflight() == 0
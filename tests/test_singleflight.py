@@ -0,0 +1,76 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import asyncio
+
+import metrics
+import singleflight
+
+
+def test_concurrent_calls_share_one_run(monkeypatch):
+    monkeypatch.setattr(singleflight, "_stats", {"calls": 0, "coalesced": 0})
+    runs = 0
+
+    async def fn():
+        nonlocal runs
+        runs += 1
+        await asyncio.sleep(0.01)
+        return f"result {runs}"
+
+    async def main():
+        k = singleflight.key("k8s_get", {"name": "a"})
+        together = await asyncio.gather(*(singleflight.do(k, fn) for _ in range(3)))
+        later = await singleflight.do(k, fn)  # finished calls are not remembered
+        return together, later
+
+    together, later = asyncio.run(main())
+    assert together == ["result 1"] * 3 and later == "result 2"
+    assert singleflight.stats() == {"calls": 4, "coalesced": 2}
+    text = metrics.render_prometheus()
+    assert "mcp_k8s_singleflight_calls_total 4\n" in text
+    assert "mcp_k8s_singleflight_coalesced_total 2\n" in text
+
+
+def test_a_cancelled_caller_does_not_cancel_the_others():
+    async def main():
+        k = singleflight.key("k8s_list", {"plural": "pods"})
+        release = asyncio.Event()
+
+        async def fn():
+            await release.wait()
+            return "pods"
+
+        first = asyncio.ensure_future(singleflight.do(k, fn))
+        second = asyncio.ensure_future(singleflight.do(k, fn))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        assert await second == "pods"
+        assert first.cancelled()
+
+    asyncio.run(main())
+
+
+def test_forget_starts_later_calls_fresh():
+    async def main():
+        k = singleflight.key("k8s_get", {"name": "b"})
+        release = asyncio.Event()
+        values = iter(("before write", "after write"))
+
+        async def fn():
+            value = next(values)
+            await release.wait()
+            return value
+
+        stale = asyncio.ensure_future(singleflight.do(k, fn))
+        await asyncio.sleep(0)
+        singleflight.forget()  # a write happened while the first read ran
+        fresh = asyncio.ensure_future(singleflight.do(k, fn))
+        await asyncio.sleep(0)
+        release.set()
+        assert await stale == "before write"
+        assert await fresh == "after write"
+
+    asyncio.run(main())
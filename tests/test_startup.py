@@ -0,0 +1,51 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import signal
+import socket
+import subprocess
+import time
+import urllib.request
+
+
+def test_server_import_does_not_load_kubernetes_client():
+    # initialize/list_tools must be answerable before the client is imported
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    out = subprocess.run(
+        [sys.executable, "-c", "import sys, server; print(any(m.split('.')[0] == 'kubernetes' for m in sys.modules))"],
+        cwd=root,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert out.stdout.strip() == "False"
+
+
+def test_http_server_cleans_up_on_sigterm():
+    # main()'s finally block closes the API clients and writes the final metrics
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    proc = subprocess.Popen(
+        [sys.executable, "server.py", "--transport", "http", "--port", str(port)],
+        cwd=root,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        deadline = time.monotonic() + 20
+        while True:
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/healthz", timeout=1)
+                break
+            except OSError:
+                assert time.monotonic() < deadline and proc.poll() is None
+                time.sleep(0.1)
+        proc.send_signal(signal.SIGTERM)
+        _, err = proc.communicate(timeout=20)
+    finally:
+        proc.kill()
+    assert proc.returncode == 0
+    assert "tool calls:" in err
@@ -0,0 +1,70 @@
+import sys
+import os
+from datetime import datetime, timezone
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from views import aggregate_events, compile_fields, events_since, project, summarize
+
+
+POD = {
+    "apiVersion": "v1",
+    "kind": "Pod",
+    "metadata": {"name": "web-1", "creationTimestamp": "2024-01-01T00:00:00Z", "labels": {"app": "web"}},
+    "spec": {"nodeName": "n1", "containers": [{"name": "a", "image": "nginx"}, {"name": "b", "image": "envoy"}]},
+    "status": {"phase": "Running", "containerStatuses": [{"ready": True, "restartCount": 2}, {"ready": False, "restartCount": 1}]},
+}
+
+
+def test_project_keeps_nesting():
+    out = project(POD, compile_fields(["metadata.name", "spec.containers[*].image", "status.phase"]))
+
+    assert out == {
+        "metadata": {"name": "web-1"},
+        "spec": {"containers": [{"image": "nginx"}, {"image": "envoy"}]},
+        "status": {"phase": "Running"},
+    }
+
+
+def test_project_index_and_missing_paths():
+    out = project(POD, compile_fields(["spec.containers[1].name", "spec.missing"]))
+
+    assert out == {"spec": {"containers": [{"name": "b"}]}}
+
+
+def test_invalid_field_path():
+    try:
+        compile_fields(["spec..[x"])
+    except ValueError:
+        return
+    assert False, "expected ValueError"
+
+
+def test_pod_summary_row():
+    now = datetime(2024, 1, 3, tzinfo=timezone.utc)
+    lines = summarize([POD], "Pod", now=now).splitlines()
+
+    assert lines[0].split() == ["NAME", "READY", "STATUS", "RESTARTS", "NODE", "AGE"]
+    assert lines[1].split() == ["web-1", "1/2", "Running", "3", "n1", "2d"]
+
+
+def test_events_aggregated_and_windowed():
+    def ev(name, last, count=1, message="Back-off  restarting"):
+        return {
+            "type": "Warning",
+            "reason": "BackOff",
+            "involvedObject": {"kind": "Pod", "name": name},
+            "message": message,
+            "count": count,
+            "firstTimestamp": "2024-01-01T00:00:00Z",
+            "lastTimestamp": last,
+        }
+
+    events = [ev("a", "2024-01-01T00:05:00Z", 3), ev("a", "2024-01-01T00:09:00Z", 2, "Back-off restarting"), ev("b", "2024-01-01T00:01:00Z")]
+    now = datetime(2024, 1, 1, 0, 10, tzinfo=timezone.utc)
+
+    groups = aggregate_events(events)
+    assert [(g["object"], g["count"], g["lastSeen"]) for g in groups] == [
+        ("pod/b", 1, "2024-01-01T00:01:00Z"),
+        ("pod/a", 5, "2024-01-01T00:09:00Z"),
+    ]
+    assert len(events_since(events, 300, now=now)) == 2
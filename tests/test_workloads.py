@@ -0,0 +1,36 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from workloads import label_selector, merge_logs, owned_by, owner_uids
+
+
+def _obj(name, uid, owner=None):
+    md = {"name": name, "uid": uid}
+    if owner:
+        md["ownerReferences"] = [{"uid": owner}]
+    return {"metadata": md}
+
+
+def test_deployment_pods_resolved_through_replicasets():
+    deploy = {"kind": "Deployment", "metadata": {"uid": "d1"}, "spec": {"selector": {"matchLabels": {"app": "web"}}}}
+    replicasets = [_obj("web-1", "rs1", "d1"), _obj("other", "rs2", "d2")]
+    pods = [_obj("a", "p1", "rs1"), _obj("b", "p2", "rs2"), _obj("c", "p3")]
+
+    assert label_selector(deploy) == "app=web"
+    assert [p["metadata"]["name"] for p in owned_by(pods, owner_uids(deploy, replicasets))] == ["a"]
+
+
+def test_merge_orders_by_timestamp_across_pods():
+    streams = [
+        ("pod/a/app", ["2024-01-01T00:00:01.5Z a2", "2024-01-01T00:00:03Z a3"]),
+        ("pod/b/app", ["2024-01-01T00:00:01.25Z b1", "continued", "2024-01-01T00:00:02Z b2"]),
+    ]
+
+    assert list(merge_logs(streams)) == [
+        "[pod/b/app] b1",
+        "[pod/b/app] continued",
+        "[pod/a/app] a2",
+        "[pod/b/app] b2",
+        "[pod/a/app] a3",
+    ]
@@ -0,0 +1,38 @@
+import time
+import secrets
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Tuple
+
+
+class TokenStore:
+    """
+    Bounded, expiring map from short opaque handles to server-side state
+    (API continue tokens, list cursors).
+
+    Raw API tokens are long base64 strings that the high-entropy redaction in
+    sanitize_output() would (correctly) mangle, so clients only ever see a
+    short handle. Each handle is bound to the scope it was issued for.
+    """
+
+    def __init__(self, prefix: str, max_entries: int, ttl_seconds: float):
+        self._prefix = prefix
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, Hashable, Any]]" = OrderedDict()
+
+    def put(self, scope: Hashable, value: Any) -> str:
+        handle = f"{self._prefix}-{secrets.token_hex(6)}"
+        with self._lock:
+            self._entries[handle] = (time.monotonic(), scope, value)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return handle
+
+    def get(self, scope: Hashable, handle: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(handle)
+            if entry is None or entry[1] != scope or time.monotonic() - entry[0] > self._ttl:
+                raise ValueError(f"Unknown or expired token '{handle}'")
+            return entry[2]
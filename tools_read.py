@@ -1,11 +1,524 @@
 import json
-from typing import Dict, Any
+import asyncio
+import contextlib
+import logging
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from kubernetes import client, config
+import changes
+import k8s_async
+import informer
+import list_stream
+import log_stream
+import metrics
+import response_cache
+import settings
+from gate import LIST_MAX_LIMIT, GateError, RequestContext, enforce
+from tokens import TokenStore
+from views import (
+    aggregate_events,
+    compile_fields,
+    events_since,
+    project,
+    summarize,
+    summarize_event_groups,
+    summary_kind,
+    Trie,
+)
+from constants import PRUNE_PROFILES, WORKLOAD_KINDS
+from serialize import ListWriter, dumps
+from sanitize import MAX_LINES, SanitizedText, prune_k8s_object, redact_text, sanitize_tree
+from workloads import label_selector, merge_logs, owned_by, owner_uids
+from k8s_resource import load_dynamic_client, core_v1_api, api_version_of, get_resource, resource_path
+from k8s_executor import run_blocking
 
-from gate import RequestContext, enforce
-from sanitize import prune_k8s_object
-from k8s_resource import load_dynamic_client, api_version_of, get_resource
+logger = logging.getLogger("mcp-k8s-agent")
+
+_default_prune_profile = settings.PRUNE_PROFILE
+if _default_prune_profile not in PRUNE_PROFILES:
+    logger.warning("unknown MCP_K8S_PRUNE_PROFILE %r; using full", _default_prune_profile)
+    _default_prune_profile = "full"
+
+# Continue handles issued by k8s_list: (source, token, seen, after). source
+# is "api" (token: the API continue token the page is read with) or
+# "informer" (token unused); items named up to `after` were served already
+# (a page cut short by the output line budget is read again from `token`,
+# skipping them); `seen` is the changes.Digest of the pages served so far
+_continue_tokens = TokenStore("page", max_entries=1024, ttl_seconds=settings.LIST_CONTINUE_TTL_SECONDS)
+
+# Change cursors issued by k8s_list once a listing is complete: the
+# changes.Digest of everything the caller has been shown
+_cursors = TokenStore("cursor", max_entries=settings.LIST_CURSOR_MAX_ENTRIES, ttl_seconds=settings.LIST_CURSOR_TTL_SECONDS)
+
+# Asks the API for names and metadata only (PartialObjectMetadataList); plain
+# JSON from servers that cannot
+METADATA_LIST_ACCEPT = "application/json;as=PartialObjectMetadataList;g=meta.k8s.io;v=v1,application/json"
+
+# Called with each list item and the list envelope read so far
+ItemHandler = Callable[[Dict[str, Any], Dict[str, Any]], None]
+
+# Output lines kept free of list items for the envelope, summary header and
+# trailer: a page stops short of sanitize's MAX_LINES truncation, so the
+# continue handle / cursor always reaches the caller, and the next page
+# resumes after the last item actually shown
+_LIST_RESERVED_LINES = 20
+LIST_ITEM_LINES = MAX_LINES - _LIST_RESERVED_LINES
+
+
+# -----------------------------
+# kubernetes-client transport (runs on the I/O pool)
+# -----------------------------
+def _fetch_list(
+    namespace: str, api_version: str, plural: str, limit: int, token: Optional[str], on_item: ItemHandler
+) -> Dict[str, Any]:
+    # The raw body is decoded item by item as it arrives (no ResourceInstance
+    # or to_dict() copy of the whole page); on_item prunes each one
+    dyn = load_dynamic_client()
+    resource = get_resource(dyn, api_version, plural)
+    with metrics.phase("api"):
+        resp = resource.get(namespace=namespace, limit=limit, _continue=token, serialize=False, _preload_content=False)
+        done = False
+        try:
+            envelope = list_stream.decode_list(resp.stream(list_stream.CHUNK_BYTES), on_item)
+            done = True
+        finally:
+            if done:
+                resp.release_conn()
+            else:
+                resp.close()
+    return envelope
+
+
+def _fetch_list_metadata(namespace: str, api_version: str, plural: str, token: Optional[str]) -> Dict[str, Any]:
+    dyn = load_dynamic_client()
+    resource = get_resource(dyn, api_version, plural)
+    with metrics.phase("api"):
+        resp = resource.get(
+            namespace=namespace,
+            limit=LIST_MAX_LIMIT,
+            _continue=token,
+            serialize=False,
+            header_params={"Accept": METADATA_LIST_ACCEPT},
+        )
+        return json.loads(resp.data)
+
+
+def _fetch_object(namespace: str, name: str, api_version: str, plural: str) -> Dict[str, Any]:
+    dyn = load_dynamic_client()
+    resource = get_resource(dyn, api_version, plural)
+    with metrics.phase("api"):
+        return resource.get(name=name, namespace=namespace).to_dict()
+
+
+def _fetch_selected(namespace: str, api_version: str, plural: str, selector: Optional[str]) -> Dict[str, Any]:
+    dyn = load_dynamic_client()
+    resource = get_resource(dyn, api_version, plural)
+    with metrics.phase("api"):
+        return resource.get(namespace=namespace, label_selector=selector).to_dict()
+
+
+def _fetch_events(namespace: str, field_selector: Optional[str]) -> Dict[str, Any]:
+    # Raw API JSON (not the generated model's to_dict()) so the output shape
+    # matches the async transport and contains no datetime objects.
+    api = core_v1_api()
+    with metrics.phase("api"):
+        resp = api.list_namespaced_event(namespace=namespace, field_selector=field_selector, _preload_content=False)
+        return json.loads(resp.data)
+
+
+# -----------------------------
+# Source selection: informer store, async transport, or kubernetes client
+# -----------------------------
+class _PageCut:
+    """How a page ended: the last item shown and how many read items did not fit."""
+
+    def __init__(self):
+        self.last: Optional[str] = None
+        self.dropped = 0
+
+
+def _item_handler(
+    seen: changes.Digest, consume: Callable[[Dict[str, Any]], bool], after: Optional[str]
+) -> Tuple[ItemHandler, _PageCut]:
+    """
+    Per-item step of a listing: skip items served already (named up to
+    `after`), fill in the item type, pass it on and note it for the cursor.
+    Once consume() refuses an item, the rest of the page is only counted.
+    """
+    cut = _PageCut()
+
+    def handle(item: Dict[str, Any], envelope: Dict[str, Any]) -> None:
+        name = (item.get("metadata") or {}).get("name") or ""
+        if after is not None and name <= after:
+            return
+        if cut.dropped:
+            cut.dropped += 1
+            return
+        # REST list items omit apiVersion/kind; the dynamic client used to fill them in
+        kind = envelope.get("kind", "")
+        if kind.endswith("List"):
+            item.setdefault("apiVersion", envelope.get("apiVersion"))
+            item.setdefault("kind", kind[: -len("List")])
+        if not consume(item):
+            cut.dropped = 1
+            return
+        seen.update(changes.digest_of((item,)))
+        cut.last = name
+
+    return handle, cut
+
+
+def _issue_cursor(data: Dict[str, Any], scope: Tuple[str, str, str], seen: changes.Digest) -> None:
+    """The last page of a listing carries a cursor for a later changes_since call."""
+    if not isinstance(data.get("metadata"), dict):
+        data["metadata"] = {}
+    # Copied: an earlier page's continue handle may still add to `seen`
+    data["metadata"]["cursor"] = _cursors.put(scope, dict(seen))
+
+
+def _page_from_snapshot(
+    data: Dict[str, Any],
+    scope: Tuple[str, str, str],
+    limit: int,
+    after: Optional[str],
+    seen: changes.Digest,
+    on_item: ItemHandler,
+    cut: _PageCut,
+) -> Dict[str, Any]:
+    """Paginate an informer snapshot (items sorted by name) like the API would."""
+    items = data.pop("items")
+    if after is not None:
+        items = [i for i in items if i["metadata"]["name"] > after]
+    for item in items[:limit]:
+        on_item(item, data)
+    shown = min(len(items), limit) - cut.dropped
+    if len(items) > shown:
+        data["metadata"]["continue"] = _continue_tokens.put(scope, ("informer", None, seen, cut.last))
+        data["metadata"]["remainingItemCount"] = len(items) - shown
+    else:
+        _issue_cursor(data, scope, seen)
+    return data
+
+
+def _issue_continue(
+    data: Dict[str, Any], scope: Tuple[str, str, str], seen: changes.Digest, token: Optional[str], cut: _PageCut
+) -> Dict[str, Any]:
+    """
+    Swap the API continue token for a short handle (or, on the last page,
+    issue a cursor). A page cut short is continued by reading it again.
+    """
+    if not isinstance(data.get("metadata"), dict):
+        data["metadata"] = {}
+    md = data["metadata"]
+    next_token = md.pop("continue", None)
+    if cut.dropped:
+        md["continue"] = _continue_tokens.put(scope, ("api", token, seen, cut.last))
+        if md.get("remainingItemCount") is not None:
+            md["remainingItemCount"] += cut.dropped
+    elif next_token:
+        md["continue"] = _continue_tokens.put(scope, ("api", next_token, seen, None))
+    else:
+        _issue_cursor(data, scope, seen)
+    return data
+
+
+async def _read_list(
+    tool_name: str,
+    namespace: str,
+    group: str,
+    version: str,
+    plural: str,
+    limit: int,
+    page: Optional[Tuple[str, Optional[str], changes.Digest, Optional[str]]],
+    consume: Callable[[Dict[str, Any]], bool],
+) -> Dict[str, Any]:
+    """
+    One page of a listing. Items are handed to consume() one at a time as
+    they are read, until it refuses one; the list envelope (kind, metadata
+    with continue handle or cursor) is returned.
+    """
+    api_version = api_version_of(group, version)
+    scope = (namespace, api_version, plural)
+    source, token, seen, after = page if page else (None, None, {}, None)
+    on_item, cut = _item_handler(seen, consume, after)
+
+    if informer.enabled() and source in (None, "informer"):
+        cached = await informer.read_list(tool_name, namespace, api_version, plural)
+        if cached is not None:
+            return _page_from_snapshot(cached, scope, limit, after, seen, on_item, cut)
+        if page is not None:
+            raise ValueError("Continue token no longer valid; list again without 'continue'")
+
+    if k8s_async.enabled():
+        path = resource_path(group, version, namespace, plural)
+        params = {"limit": limit, "continue": token}
+        with metrics.phase("api"):
+            async with contextlib.aclosing(k8s_async.stream_bytes(path, params, accept="application/json")) as chunks:
+                data = await list_stream.decode_list_async(chunks, on_item)
+    else:
+        data = await run_blocking(tool_name, _fetch_list, namespace, api_version, plural, limit, token, on_item)
+    return _issue_continue(data, scope, seen, token, cut)
+
+
+async def _read_current(
+    tool_name: str, namespace: str, group: str, version: str, plural: str
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Every object of a collection, as (items, complete). From an informer
+    store the items are whole objects; from the API they are metadata only
+    (complete=False) unless the server ignored the metadata-only request.
+    """
+    api_version = api_version_of(group, version)
+    if informer.enabled():
+        cached = await informer.read_list(tool_name, namespace, api_version, plural)
+        if cached is not None:
+            return cached["items"], True
+
+    items: List[Dict[str, Any]] = []
+    token = None
+    while True:
+        if k8s_async.enabled():
+            data = await k8s_async.get_json(
+                resource_path(group, version, namespace, plural),
+                {"limit": LIST_MAX_LIMIT, "continue": token},
+                accept=METADATA_LIST_ACCEPT,
+            )
+        else:
+            data = await run_blocking(tool_name, _fetch_list_metadata, namespace, api_version, plural, token)
+        items.extend(data.get("items") or [])
+        token = (data.get("metadata") or {}).get("continue")
+        if not token:
+            return items, data.get("kind") != "PartialObjectMetadataList"
+
+
+async def _read_changes(
+    tool_name: str, namespace: str, group: str, version: str, plural: str, before: changes.Digest, limit: int
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Watch-style events for what changed since `before`: at most `limit` of
+    them, and how many changes are left.
+    """
+    items, complete = await _read_current(tool_name, namespace, group, version, plural)
+    now = changes.digest_of(items)
+    diff = changes.changed(before, now)
+    shown, remaining = diff[:limit], max(0, len(diff) - limit)
+
+    objects = {i["metadata"]["name"]: i for i in items} if complete else {}
+    sem = asyncio.Semaphore(max(1, settings.BATCH_GET_CONCURRENCY))
+
+    async def event(name: str, change: str) -> Optional[Dict[str, Any]]:
+        if change == changes.DELETED:
+            return {"type": change, "object": {"metadata": {"name": name}}}
+        obj = objects.get(name)
+        if obj is None:
+            try:
+                async with sem:
+                    obj = await _read_object(tool_name, namespace, name, group, version, plural)
+            except Exception as e:
+                if getattr(e, "status", None) == 404:
+                    return None  # gone since the listing; reported on the next poll
+                raise
+        return {"type": change, "object": obj}
+
+    events = [e for e in await asyncio.gather(*(event(n, c) for n, c in shown)) if e is not None]
+    return events, remaining
+
+
+def _shown_digest(events: List[Dict[str, Any]]) -> Dict[str, Optional[str]]:
+    """What the caller has been shown by `events`, for changes.advance()."""
+    return {
+        e["object"]["metadata"]["name"]: (
+            None if e["type"] == changes.DELETED else e["object"]["metadata"].get("resourceVersion") or ""
+        )
+        for e in events
+    }
+
+
+async def _read_object(tool_name: str, namespace: str, name: str, group: str, version: str, plural: str) -> Dict[str, Any]:
+    if informer.enabled():
+        cached = await informer.read_object(tool_name, namespace, name, api_version_of(group, version), plural)
+        if cached is not None:
+            return cached
+    if k8s_async.enabled():
+        return await k8s_async.get_json(resource_path(group, version, namespace, plural, name=name))
+    return await run_blocking(tool_name, _fetch_object, namespace, name, api_version_of(group, version), plural)
+
+
+async def _read_selected(
+    tool_name: str, namespace: str, group: str, version: str, plural: str, selector: Optional[str]
+) -> List[Dict[str, Any]]:
+    """Objects matching a workload's own selector; callers still check ownership."""
+    api_version = api_version_of(group, version)
+    if informer.enabled():
+        cached = await informer.read_list(tool_name, namespace, api_version, plural)
+        if cached is not None:
+            return cached["items"]
+    if k8s_async.enabled():
+        data = await k8s_async.get_json(resource_path(group, version, namespace, plural), {"labelSelector": selector})
+    else:
+        data = await run_blocking(tool_name, _fetch_selected, namespace, api_version, plural, selector)
+    return data.get("items") or []
+
+
+async def _read_events(tool_name: str, namespace: str, field_selector: Optional[str]) -> Dict[str, Any]:
+    if k8s_async.enabled():
+        return await k8s_async.get_json(resource_path("", "v1", namespace, "events"), {"fieldSelector": field_selector})
+    return await run_blocking(tool_name, _fetch_events, namespace, field_selector)
+
+
+def _event_field_selector(arguments: Dict[str, Any]) -> Optional[str]:
+    """Event filters as an API field selector (values are checked by the gate)."""
+    terms = [
+        f"{field}={arguments[key]}"
+        for key, field in (
+            ("involved_kind", "involvedObject.kind"),
+            ("involved_name", "involvedObject.name"),
+            ("type", "type"),
+        )
+        if arguments.get(key)
+    ]
+    return ",".join(terms) or None
+
+
+async def _read_pod_logs(
+    tool_name: str, namespace: str, pod: str, options: Dict[str, Any], buf: log_stream.LogBuffer
+) -> SanitizedText:
+    # Streamed into `buf` line by line; reading stops once it wants no more
+    if k8s_async.enabled():
+        return await log_stream.read_pod_logs_async(namespace, pod, options, buf)
+    return await run_blocking(tool_name, log_stream.read_pod_logs, namespace, pod, options, buf)
+
+
+# -----------------------------
+# Rendering
+# -----------------------------
+def _prune_profile(arguments: Dict[str, Any]) -> str:
+    """The call's `prune` profile; fields selected explicitly are only normalized unless one is given."""
+    if arguments.get("prune"):
+        return arguments["prune"]
+    return "full" if arguments.get("fields") else _default_prune_profile
+
+
+def _list_consumer(
+    output: Optional[str], trie: Optional[Trie], profile: str
+) -> Tuple[Any, Callable[[Dict[str, Any]], bool]]:
+    """
+    Where list items go as they are read: (collector, consume). The summary
+    view is computed from whole objects, so they are collected as is (one
+    row each); every other output prunes and serializes each item at once
+    into a ListWriter, so only the output text is held, not the raw
+    collection. consume() returns False once LIST_ITEM_LINES are used up.
+    """
+    if output == "summary":
+        items: List[Dict[str, Any]] = []
+
+        def collect(item: Dict[str, Any]) -> bool:
+            if len(items) >= LIST_ITEM_LINES:
+                return False
+            items.append(item)
+            return True
+
+        return items, collect
+
+    writer = ListWriter(output, max_lines=LIST_ITEM_LINES)
+
+    def write(item: Dict[str, Any]) -> bool:
+        # Structural pruning (and value redaction) in one traversal
+        with metrics.phase("prune"):
+            item = prune_k8s_object(project(item, trie) if trie else item, profile)
+        return writer.add(item)
+
+    return writer, write
+
+
+def _render_list(envelope: Dict[str, Any], collected: Any, output: Optional[str]) -> str:
+    if output == "summary":
+        text = summarize(collected, summary_kind(envelope))
+        md = envelope.get("metadata") or {}
+        if md.get("continue"):
+            return f"{text}\n\ncontinue: {md['continue']}"
+        return f"{text}\n\ncursor: {md['cursor']}" if md.get("cursor") else text
+
+    with metrics.phase("prune"):
+        envelope = sanitize_tree(envelope)
+    return SanitizedText(collected.text(envelope))
+
+
+def _render_changes(
+    events: List[Dict[str, Any]],
+    before: changes.Digest,
+    scope: Tuple[str, str, str],
+    remaining: int,
+    output: Optional[str],
+    trie: Optional[Trie],
+    profile: str,
+) -> str:
+    """
+    Render change events, as many as fit in LIST_ITEM_LINES; the new cursor
+    only covers the events shown, so the rest are reported on the next poll.
+    """
+    if output == "summary":
+        if len(events) > LIST_ITEM_LINES:
+            remaining += len(events) - LIST_ITEM_LINES
+            events = events[:LIST_ITEM_LINES]
+        cursor = _cursors.put(scope, changes.advance(before, _shown_digest(events)))
+        sections = []
+        for change in (changes.ADDED, changes.MODIFIED):
+            objs = [e["object"] for e in events if e["type"] == change]
+            if objs:
+                sections.append(f"{change}:\n{summarize(objs, summary_kind(objs[0]))}")
+        deleted = [e["object"]["metadata"]["name"] for e in events if e["type"] == changes.DELETED]
+        if deleted:
+            sections.append(f"{changes.DELETED}: {', '.join(deleted)}")
+        if remaining:
+            sections.append(f"({remaining} more changes; poll again with the new cursor)")
+        sections.append(f"cursor: {cursor}")
+        return "\n\n".join(sections if events else ["No changes"] + sections)
+
+    writer = ListWriter(output, max_lines=LIST_ITEM_LINES)
+    shown = 0
+    for e in events:
+        if e["type"] != changes.DELETED:
+            with metrics.phase("prune"):
+                obj = prune_k8s_object(project(e["object"], trie) if trie else e["object"], profile)
+            e = {"type": e["type"], "object": obj}
+        if not writer.add(e):
+            break
+        shown += 1
+    remaining += len(events) - shown
+    md: Dict[str, Any] = {"cursor": _cursors.put(scope, changes.advance(before, _shown_digest(events[:shown])))}
+    if remaining:
+        md["remainingChanges"] = remaining
+    return SanitizedText(writer.text({"metadata": md}))
+
+
+def _render_object(obj: Dict[str, Any], output: Optional[str], trie: Optional[Trie], profile: str) -> str:
+    if output == "summary":
+        return summarize([obj], summary_kind(obj))
+    with metrics.phase("prune"):
+        if trie:
+            obj = project(obj, trie)
+
+        # Structural pruning and value redaction in one traversal
+        obj = prune_k8s_object(obj, profile)
+
+    return SanitizedText(dumps(obj, output))
+
+
+def _error_message(e: Exception) -> str:
+    # API errors carry the API's Status object as their body; their str()
+    # adds response headers and a traceback
+    try:
+        message = json.loads(getattr(e, "body", None) or "{}").get("message")
+    except (TypeError, ValueError, AttributeError):
+        message = None
+    message = message or getattr(e, "reason", None)
+    status = getattr(e, "status", None)
+    return f"({status}) {message}" if status and message else str(e).strip()
+
+
+def _log_options(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: arguments.get(key) for key in ("container", "tail_lines", "since_seconds", "timestamps", "previous")}
 
 
 async def k8s_list(arguments: Dict[str, Any]) -> str:
@@ -22,20 +535,40 @@ async def k8s_list(arguments: Dict[str, Any]) -> str:
         arguments=arguments,
     )
     enforce(ctx)
+    trie = compile_fields(arguments["fields"]) if arguments.get("fields") else None
 
-    dyn = load_dynamic_client()
-    api_version = api_version_of(group, version)
-    resource = get_resource(dyn, api_version, plural)
+    # Server-side paging: at most `limit` objects per call, with a continue
+    # handle in metadata.continue for the next page
+    limit = arguments.get("limit") or settings.LIST_DEFAULT_LIMIT
+    scope = (namespace, api_version_of(group, version), plural)
 
-    items = resource.get(namespace=namespace).to_dict()
+    # Incremental mode: only what changed since the cursor of an earlier
+    # listing (at most `limit` changes), plus a new cursor. Never cached: every
+    # call issues its own cursor.
+    if arguments.get("changes_since"):
+        before = _cursors.get(scope, arguments["changes_since"])
+        events, remaining = await _read_changes(ctx.tool_name, namespace, group, version, plural, before, limit)
+        return _render_changes(
+            events, before, scope, remaining, arguments.get("output"), trie, _prune_profile(arguments)
+        )
 
-    # Structural pruning only on object-shaped outputs
-    if isinstance(items, dict) and isinstance(items.get("items"), list):
-        pruned = dict(items)
-        pruned["items"] = [prune_k8s_object(i) for i in items["items"]]
-        items = pruned
+    page = None
+    if arguments.get("continue"):
+        page = _continue_tokens.get(scope, arguments["continue"])
 
-    return json.dumps(items, indent=2, sort_keys=True)
+    async def fetch() -> Dict[str, Any]:
+        collected, consume = _list_consumer(arguments.get("output"), trie, _prune_profile(arguments))
+        envelope = await _read_list(ctx.tool_name, namespace, group, version, plural, limit, page, consume)
+        return {"envelope": envelope, "collected": collected}
+
+    def render(listing: Dict[str, Any]) -> str:
+        return _render_list(listing["envelope"], listing["collected"], arguments.get("output"))
+
+    if response_cache.enabled():
+        key = await response_cache.cache_key(ctx.tool_name, arguments)
+        scope = response_cache.scope_of(namespace, group, plural)
+        return await response_cache.read_through(key, fetch, render, scope)
+    return render(await fetch())
 
 
 async def k8s_get(arguments: Dict[str, Any]) -> str:
@@ -54,17 +587,73 @@ async def k8s_get(arguments: Dict[str, Any]) -> str:
         arguments=arguments,
     )
     enforce(ctx)
+    trie = compile_fields(arguments["fields"]) if arguments.get("fields") else None
+
+    async def fetch() -> Dict[str, Any]:
+        return await _read_object(ctx.tool_name, namespace, name, group, version, plural)
+
+    def render(obj: Dict[str, Any]) -> str:
+        return _render_object(obj, arguments.get("output"), trie, _prune_profile(arguments))
+
+    if response_cache.enabled():
+        key = await response_cache.cache_key(ctx.tool_name, arguments)
+        scope = response_cache.scope_of(namespace, group, plural)
+        return await response_cache.read_through(
+            key, fetch, render, scope, name, revalidate=settings.RESPONSE_CACHE_REVALIDATE
+        )
+    return render(await fetch())
 
-    dyn = load_dynamic_client()
-    api_version = api_version_of(group, version)
-    resource = get_resource(dyn, api_version, plural)
 
-    obj = resource.get(name=name, namespace=namespace).to_dict()
+async def k8s_batch_get(arguments: Dict[str, Any]) -> str:
+    ctx = RequestContext(tool_name="k8s_batch_get", verb="batch_get", arguments=arguments)
+    enforce(ctx)
+    trie = compile_fields(arguments["fields"]) if arguments.get("fields") else None
+    output = arguments.get("output")
+    sem = asyncio.Semaphore(max(1, settings.BATCH_GET_CONCURRENCY))
+
+    async def get_one(target: Dict[str, Any]) -> Dict[str, Any]:
+        group = target.get("group", "")
+        label = "/".join(p for p in (target["namespace"], group, target["version"], target["plural"], target["name"]) if p)
+        try:
+            # Every target passes the same policy as a single k8s_get
+            enforce(
+                RequestContext(
+                    tool_name=ctx.tool_name,
+                    verb="get",
+                    kind=target.get("kind"),
+                    namespace=target["namespace"],
+                    name=target["name"],
+                    arguments=target,
+                )
+            )
+            async with sem:
+                obj = await _read_object(
+                    ctx.tool_name, target["namespace"], target["name"], group, target["version"], target["plural"]
+                )
+        except GateError as e:
+            return {"target": label, "error": redact_text(f"BLOCKED: {e}")}
+        except Exception as e:
+            return {"target": label, "error": redact_text(f"ERROR: {_error_message(e)}")}
+        return {"target": label, "object": obj}
 
-    # Structural pruning only on object-shaped outputs
-    obj = prune_k8s_object(obj)
+    results = await asyncio.gather(*(get_one(t) for t in arguments["targets"]))
+    errors = [r for r in results if "error" in r]
 
-    return json.dumps(obj, indent=2, sort_keys=True)
+    if output == "summary":
+        by_kind: Dict[str, List[Dict[str, Any]]] = {}
+        for r in results:
+            if "object" in r:
+                by_kind.setdefault(summary_kind(r["object"]), []).append(r["object"])
+        sections = [summarize(objs, kind) for kind, objs in by_kind.items()]
+        sections.extend(f"{r['target']}: {r['error']}" for r in errors)
+        return "\n\n".join(sections)
+
+    profile = _prune_profile(arguments)
+    for r in results:
+        if "object" in r:
+            r["object"] = prune_k8s_object(project(r["object"], trie) if trie else r["object"], profile)
+    out = {"targets": len(results), "errors": len(errors), "items": results}
+    return SanitizedText(dumps(out, output))
 
 
 async def k8s_list_events(arguments: Dict[str, Any]) -> str:
@@ -78,10 +667,26 @@ async def k8s_list_events(arguments: Dict[str, Any]) -> str:
     )
     enforce(ctx)
 
-    config.load_kube_config()
-    v1 = client.CoreV1Api()
-    events = v1.list_namespaced_event(namespace=namespace).to_dict()
-    return json.dumps(events, indent=2, sort_keys=True)
+    # Object and type filters run server-side; event times are not
+    # selectable fields, so the since window is applied here
+    events = await _read_events(ctx.tool_name, namespace, _event_field_selector(arguments))
+    items = events.get("items") or []
+    if arguments.get("since_seconds"):
+        items = events_since(items, arguments["since_seconds"])
+
+    if arguments.get("aggregate"):
+        groups = aggregate_events(items)
+        if arguments.get("output") == "summary":
+            return summarize_event_groups(groups)
+        out = {"events": len(items), "groups": len(groups), "items": groups}
+        return SanitizedText(dumps(sanitize_tree(out), arguments.get("output")))
+
+    if arguments.get("output") == "summary":
+        return summarize(items, "Event")
+    with metrics.phase("prune"):
+        pruned = sanitize_tree({k: v for k, v in events.items() if k != "items"})
+        pruned["items"] = [prune_k8s_object(ev) for ev in items]
+    return SanitizedText(dumps(pruned, arguments.get("output")))
 
 
 async def k8s_pod_logs(arguments: Dict[str, Any]) -> str:
@@ -98,12 +703,114 @@ async def k8s_pod_logs(arguments: Dict[str, Any]) -> str:
     )
     enforce(ctx)
 
-    config.load_kube_config()
-    v1 = client.CoreV1Api()
-    logs = v1.read_namespaced_pod_log(
+    # Without limit_bytes, reads are still capped (a full container log can
+    # be gigabytes)
+    buf = log_stream.LogBuffer(arguments.get("limit_bytes") or settings.LOG_DEFAULT_LIMIT_BYTES)
+    return await _read_pod_logs(ctx.tool_name, namespace, pod, _log_options(arguments), buf)
+
+
+async def k8s_pod_logs_grep(arguments: Dict[str, Any]) -> str:
+    namespace = arguments["namespace"]
+    pod = arguments["pod"]
+
+    ctx = RequestContext(
+        tool_name="k8s_pod_logs_grep",
+        verb="pod_logs",
+        kind="Pod",
+        namespace=namespace,
         name=pod,
+        arguments=arguments,
+    )
+    enforce(ctx)
+
+    matcher = log_stream.compile_matcher(
+        arguments.get("pattern"), arguments.get("level"), arguments.get("ignore_case", False)
+    )
+    buf = log_stream.LogGrep(
+        arguments.get("limit_bytes") or settings.LOG_GREP_DEFAULT_SCAN_BYTES,
+        matcher,
+        context=arguments.get("context") or 0,
+        max_matches=arguments.get("max_matches") or settings.LOG_GREP_DEFAULT_MAX_MATCHES,
+    )
+    return await _read_pod_logs(ctx.tool_name, namespace, pod, _log_options(arguments), buf)
+
+
+async def k8s_workload_logs(arguments: Dict[str, Any]) -> str:
+    namespace = arguments["namespace"]
+    kind = arguments["kind"]
+    name = arguments["name"]
+
+    ctx = RequestContext(
+        tool_name="k8s_workload_logs",
+        verb="workload_logs",
+        kind=kind,
         namespace=namespace,
-        container=arguments.get("container"),
-        tail_lines=arguments.get("tail_lines"),
+        name=name,
+        arguments=arguments,
     )
-    return logs
+    enforce(ctx)
+
+    # Pods owned by the workload (Deployments own them through ReplicaSets)
+    group, version, plural = WORKLOAD_KINDS[kind]
+    workload = await _read_object(ctx.tool_name, namespace, name, group, version, plural)
+    workload.setdefault("kind", kind)
+    selector = label_selector(workload)
+    replicasets = []
+    if kind == "Deployment":
+        replicasets = await _read_selected(ctx.tool_name, namespace, "apps", "v1", "replicasets", selector)
+    pods = owned_by(
+        await _read_selected(ctx.tool_name, namespace, "", "v1", "pods", selector),
+        owner_uids(workload, replicasets),
+    )
+    if not pods:
+        return f"No pods found for {kind} '{name}'"
+    pods.sort(key=lambda p: p["metadata"]["name"])
+    max_pods = arguments.get("max_pods") or settings.WORKLOAD_LOG_DEFAULT_MAX_PODS
+    shown = pods[:max_pods]
+
+    streams = [
+        (pod["metadata"]["name"], container)
+        for pod in shown
+        for container in (
+            [arguments["container"]]
+            if arguments.get("container")
+            else [c["name"] for c in (pod.get("spec") or {}).get("containers") or []]
+        )
+    ]
+
+    # One byte budget for the whole call, split evenly across containers
+    budget = arguments.get("limit_bytes") or settings.LOG_DEFAULT_LIMIT_BYTES
+    per_stream = max(1, budget // max(1, len(streams)))
+    options = _log_options(arguments)
+    options["timestamps"] = True  # merge key
+    if not options["tail_lines"] and not options["since_seconds"]:
+        options["tail_lines"] = settings.WORKLOAD_LOG_DEFAULT_TAIL_LINES
+
+    sem = asyncio.Semaphore(max(1, settings.WORKLOAD_LOG_CONCURRENCY))
+
+    async def read(pod: str, container: str) -> Tuple[str, List[str], Optional[str]]:
+        prefix = f"pod/{pod}/{container}"
+        buf = log_stream.LogBuffer(per_stream)
+        async with sem:
+            try:
+                await _read_pod_logs(ctx.tool_name, namespace, pod, {**options, "container": container}, buf)
+            except Exception as e:
+                # One unreadable container (not started yet, gone) does not fail the call
+                return prefix, buf.lines, redact_text(f"[{prefix}] ERROR: {_error_message(e)}")
+        return prefix, buf.lines, None
+
+    results = await asyncio.gather(*(read(pod, container) for pod, container in streams))
+
+    # Time-ordered, newest lines kept when over the output line limit
+    errors = [err for _, _, err in results if err]
+    total = 0
+    tail: deque = deque(maxlen=max(1, MAX_LINES - 2 - len(errors)))
+    for line in merge_logs([(prefix, lines) for prefix, lines, _ in results], bool(arguments.get("timestamps"))):
+        total += 1
+        tail.append(line)
+
+    stats = f"{total} lines from {len(streams)} containers in {len(shown)} of {len(pods)} pods"
+    if total > len(tail):
+        stats += f"; {total - len(tail)} earlier lines omitted"
+    tail.extend(errors)
+    return SanitizedText("\n".join(tail) + f"\n\n[{stats}]")
@@ -1,9 +1,11 @@
-import json
 from typing import Dict, Any
 from datetime import datetime, timezone
 
+import response_cache
 from gate import RequestContext, enforce
+from serialize import dumps
 from k8s_resource import load_dynamic_client, api_version_of, get_resource
+from k8s_executor import run_blocking
 
 
 def _kind_for_plural(plural: str) -> str:
@@ -36,14 +38,16 @@ async def k8s_delete(arguments: Dict[str, Any]) -> str:
     )
     enforce(ctx)
 
-    dyn = load_dynamic_client()
-    api_version = api_version_of(group, version)
-    resource = get_resource(dyn, api_version, plural)
+    def delete() -> None:
+        dyn = load_dynamic_client()
+        resource = get_resource(dyn, api_version_of(group, version), plural)
+        resource.delete(name=name, namespace=namespace)
 
-    resource.delete(name=name, namespace=namespace)
+    await run_blocking(ctx.tool_name, delete)
+    response_cache.invalidate(namespace, group, plural, name)
 
     # Minimal response (no raw object dumps)
-    return json.dumps(
+    return dumps(
         {
             "result": "deleted",
             "target": {
@@ -55,7 +59,7 @@ async def k8s_delete(arguments: Dict[str, Any]) -> str:
             },
             "explain": f"Deleted {plural} {namespace}/{name}.",
         },
-        indent=2,
+        sort_keys=False,
     )
 
 
@@ -80,10 +84,6 @@ async def k8s_patch(arguments: Dict[str, Any]) -> str:
     )
     enforce(ctx)
 
-    dyn = load_dynamic_client()
-    api_version = api_version_of(group, version)
-    resource = get_resource(dyn, api_version, plural)
-
     kind = _kind_for_plural(plural)
 
     if action == "scale":
@@ -127,13 +127,20 @@ async def k8s_patch(arguments: Dict[str, Any]) -> str:
         # Gate should have blocked unknown actions; keep fail-closed anyway
         raise ValueError(f"Unsupported action: {action}")
 
-    # Apply patch using strategic merge patch content type
-    resource.patch(
-        name=name,
-        namespace=namespace,
-        body=patch,
-        content_type="application/strategic-merge-patch+json",
-    )
+    def apply() -> None:
+        dyn = load_dynamic_client()
+        resource = get_resource(dyn, api_version_of(group, version), plural)
+
+        # Apply patch using strategic merge patch content type
+        resource.patch(
+            name=name,
+            namespace=namespace,
+            body=patch,
+            content_type="application/strategic-merge-patch+json",
+        )
+
+    await run_blocking(ctx.tool_name, apply)
+    response_cache.invalidate(namespace, group, plural, name)
 
     # Minimal response (no objects, no patch echo)
     out = {
@@ -157,4 +164,4 @@ async def k8s_patch(arguments: Dict[str, Any]) -> str:
         out["container"] = arguments["container"]
         out["image"] = arguments["image"]
 
-    return json.dumps(out, indent=2)
+    return dumps(out, sort_keys=False)
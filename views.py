@@ -0,0 +1,394 @@
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Union
+
+
+# -----------------------------
+# Field projection
+# -----------------------------
+# JSONPath-like field selectors: "metadata.name", "status.phase",
+# "spec.containers[*].image", "status.containerStatuses[0].restartCount".
+# A leading "$." or "." is accepted. Paths are compiled once into a trie and
+# applied in one walk over each object, keeping the original nesting.
+Trie = Dict[Union[str, int], Any]  # child tries; LEAF marks "take whole value"
+LEAF = True
+
+_SEGMENT_RE = re.compile(r"([^.\[\]]+)|\[(\*|\d+)\]")
+
+
+def _parse_path(path: str) -> List[Union[str, int]]:
+    p = path.strip()
+    if p.startswith("$"):
+        p = p[1:]
+    p = p.lstrip(".")
+    if not p:
+        raise ValueError(f"Invalid field path: '{path}'")
+
+    segments: List[Union[str, int]] = []
+    pos = 0
+    while pos < len(p):
+        if p[pos] == ".":
+            pos += 1
+            continue
+        m = _SEGMENT_RE.match(p, pos)
+        if not m:
+            raise ValueError(f"Invalid field path: '{path}'")
+        if m.group(1) is not None:
+            segments.append(m.group(1))
+        else:
+            idx = m.group(2)
+            segments.append("*" if idx == "*" else int(idx))
+        pos = m.end()
+    return segments
+
+
+def compile_fields(fields: List[str]) -> Trie:
+    trie: Trie = {}
+    for path in fields:
+        node = trie
+        segments = _parse_path(path)
+        for i, seg in enumerate(segments):
+            if i == len(segments) - 1:
+                node[seg] = LEAF
+                break
+            child = node.get(seg)
+            if child is LEAF:
+                break  # a shorter path already selects the whole subtree
+            if child is None:
+                child = node[seg] = {}
+            node = child
+    return trie
+
+
+def _merge(a: Any, b: Any) -> Any:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if a is LEAF or b is LEAF:
+        return LEAF
+    out = dict(a)
+    for k, v in b.items():
+        out[k] = _merge(out.get(k), v)
+    return out
+
+
+def _project(node: Any, trie: Any) -> Any:
+    if trie is LEAF:
+        return node
+    if isinstance(node, dict):
+        out = {}
+        for key, child in trie.items():
+            if isinstance(key, str) and key != "*" and key in node:
+                val = _project(node[key], _merge(child, trie.get("*")))
+                if val is not None:
+                    out[key] = val
+        if "*" in trie:
+            for key, val in node.items():
+                if key not in trie:
+                    val = _project(val, trie["*"])
+                    if val is not None:
+                        out[key] = val
+        return out
+    if isinstance(node, list):
+        out_list = []
+        for i, el in enumerate(node):
+            child = _merge(trie.get("*"), trie.get(i))
+            if child is not None:
+                out_list.append(_project(el, child))
+        return out_list
+    return None
+
+
+def project(obj: Dict[str, Any], trie: Trie) -> Dict[str, Any]:
+    """Keep only the selected fields of a Kubernetes object."""
+    if not isinstance(obj, dict):
+        return obj
+    return _project(obj, trie)
+
+
+# -----------------------------
+# Summary (kubectl-style) rows
+# -----------------------------
+def _parse_ts(ts: Any) -> Optional[datetime]:
+    """RFC3339 timestamps and MicroTime (eventTime) values."""
+    if not isinstance(ts, str):
+        return None
+    try:
+        return datetime.fromisoformat(ts.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def _since(ts: Any, now: datetime) -> str:
+    created = _parse_ts(ts)
+    if created is None:
+        return "<unknown>"
+    secs = max(0, int((now - created).total_seconds()))
+    if secs < 120:
+        return f"{secs}s"
+    if secs < 7200:
+        return f"{secs // 60}m"
+    if secs < 172800:
+        return f"{secs // 3600}h"
+    return f"{secs // 86400}d"
+
+
+def _age(md: Dict[str, Any], now: datetime) -> str:
+    return _since(md.get("creationTimestamp"), now)
+
+
+def _get(obj: Any, *path: Union[str, int], default: Any = None) -> Any:
+    for seg in path:
+        if isinstance(seg, int):
+            if not isinstance(obj, list) or seg >= len(obj):
+                return default
+        elif not isinstance(obj, dict) or seg not in obj:
+            return default
+        obj = obj[seg]
+    return obj
+
+
+def _n(val: Any) -> str:
+    return "0" if val is None else str(val)
+
+
+def _pod_status(pod: Dict[str, Any]) -> str:
+    if _get(pod, "metadata", "deletionTimestamp"):
+        return "Terminating"
+    reason = _get(pod, "status", "reason") or _get(pod, "status", "phase") or "Unknown"
+    for cs in _get(pod, "status", "initContainerStatuses", default=[]) or []:
+        waiting = _get(cs, "state", "waiting", "reason")
+        if waiting:
+            return f"Init:{waiting}"
+    for cs in _get(pod, "status", "containerStatuses", default=[]) or []:
+        waiting = _get(cs, "state", "waiting", "reason")
+        terminated = _get(cs, "state", "terminated", "reason")
+        if waiting:
+            reason = waiting
+        elif terminated:
+            reason = terminated
+    return reason
+
+
+def _pod_row(o: Dict[str, Any]) -> List[str]:
+    statuses = _get(o, "status", "containerStatuses", default=[]) or []
+    ready = sum(1 for cs in statuses if cs.get("ready"))
+    total = len(_get(o, "spec", "containers", default=[]) or []) or len(statuses)
+    restarts = sum(int(cs.get("restartCount") or 0) for cs in statuses)
+    return [f"{ready}/{total}", _pod_status(o), str(restarts), _get(o, "spec", "nodeName") or "<none>"]
+
+
+def _deployment_row(o: Dict[str, Any]) -> List[str]:
+    s = o.get("status") or {}
+    return [
+        f"{_n(s.get('readyReplicas'))}/{_n(_get(o, 'spec', 'replicas'))}",
+        _n(s.get("updatedReplicas")),
+        _n(s.get("availableReplicas")),
+    ]
+
+
+def _replicaset_row(o: Dict[str, Any]) -> List[str]:
+    s = o.get("status") or {}
+    return [_n(_get(o, "spec", "replicas")), _n(s.get("replicas")), _n(s.get("readyReplicas"))]
+
+
+def _statefulset_row(o: Dict[str, Any]) -> List[str]:
+    return [f"{_n(_get(o, 'status', 'readyReplicas'))}/{_n(_get(o, 'spec', 'replicas'))}"]
+
+
+def _daemonset_row(o: Dict[str, Any]) -> List[str]:
+    s = o.get("status") or {}
+    return [
+        _n(s.get("desiredNumberScheduled")),
+        _n(s.get("currentNumberScheduled")),
+        _n(s.get("numberReady")),
+        _n(s.get("updatedNumberScheduled")),
+        _n(s.get("numberAvailable")),
+    ]
+
+
+def _service_row(o: Dict[str, Any]) -> List[str]:
+    ports = []
+    for p in _get(o, "spec", "ports", default=[]) or []:
+        port = f"{p.get('port')}"
+        if p.get("nodePort"):
+            port += f":{p['nodePort']}"
+        ports.append(f"{port}/{p.get('protocol', 'TCP')}")
+    return [
+        _get(o, "spec", "type") or "ClusterIP",
+        _get(o, "spec", "clusterIP") or "<none>",
+        ",".join(ports) or "<none>",
+    ]
+
+
+def _job_row(o: Dict[str, Any]) -> List[str]:
+    return [f"{_n(_get(o, 'status', 'succeeded'))}/{_n(_get(o, 'spec', 'completions') or 1)}"]
+
+
+def _cronjob_row(o: Dict[str, Any]) -> List[str]:
+    return [
+        _get(o, "spec", "schedule") or "",
+        str(bool(_get(o, "spec", "suspend"))),
+        str(len(_get(o, "status", "active", default=[]) or [])),
+        _get(o, "status", "lastScheduleTime") or "<none>",
+    ]
+
+
+def _pvc_row(o: Dict[str, Any]) -> List[str]:
+    return [
+        _get(o, "status", "phase") or "",
+        _get(o, "spec", "volumeName") or "",
+        _get(o, "status", "capacity", "storage") or "",
+        ",".join(_get(o, "spec", "accessModes", default=[]) or []),
+    ]
+
+
+def _ingress_row(o: Dict[str, Any]) -> List[str]:
+    hosts = [r.get("host") for r in _get(o, "spec", "rules", default=[]) or [] if r.get("host")]
+    return [",".join(hosts) or "*"]
+
+
+def _hpa_row(o: Dict[str, Any]) -> List[str]:
+    ref = _get(o, "spec", "scaleTargetRef", default={}) or {}
+    return [
+        f"{ref.get('kind', '')}/{ref.get('name', '')}",
+        _n(_get(o, "spec", "minReplicas") or 1),
+        _n(_get(o, "spec", "maxReplicas")),
+        _n(_get(o, "status", "currentReplicas")),
+    ]
+
+
+def _pdb_row(o: Dict[str, Any]) -> List[str]:
+    return [
+        str(_get(o, "spec", "minAvailable", default="N/A")),
+        str(_get(o, "spec", "maxUnavailable", default="N/A")),
+        _n(_get(o, "status", "disruptionsAllowed")),
+    ]
+
+
+def _event_row(o: Dict[str, Any]) -> List[str]:
+    obj = o.get("involvedObject") or {}
+    return [
+        o.get("type") or "",
+        o.get("reason") or "",
+        f"{(obj.get('kind') or '').lower()}/{obj['name']}" if obj.get("name") else "",
+        " ".join((o.get("message") or "").split()),
+    ]
+
+
+# kind -> (extra column headers, row builder); NAME and AGE are always added
+SUMMARY_COLUMNS: Dict[str, Any] = {
+    "Pod": (["READY", "STATUS", "RESTARTS", "NODE"], _pod_row),
+    "Deployment": (["READY", "UP-TO-DATE", "AVAILABLE"], _deployment_row),
+    "ReplicaSet": (["DESIRED", "CURRENT", "READY"], _replicaset_row),
+    "StatefulSet": (["READY"], _statefulset_row),
+    "DaemonSet": (["DESIRED", "CURRENT", "READY", "UP-TO-DATE", "AVAILABLE"], _daemonset_row),
+    "Service": (["TYPE", "CLUSTER-IP", "PORT(S)"], _service_row),
+    "Job": (["COMPLETIONS"], _job_row),
+    "CronJob": (["SCHEDULE", "SUSPEND", "ACTIVE", "LAST SCHEDULE"], _cronjob_row),
+    "PersistentVolumeClaim": (["STATUS", "VOLUME", "CAPACITY", "ACCESS MODES"], _pvc_row),
+    "Ingress": (["HOSTS"], _ingress_row),
+    "HorizontalPodAutoscaler": (["REFERENCE", "MINPODS", "MAXPODS", "REPLICAS"], _hpa_row),
+    "PodDisruptionBudget": (["MIN AVAILABLE", "MAX UNAVAILABLE", "ALLOWED DISRUPTIONS"], _pdb_row),
+    "Event": (["TYPE", "REASON", "OBJECT", "MESSAGE"], _event_row),
+}
+
+
+def summarize(items: List[Dict[str, Any]], kind: str, now: Optional[datetime] = None) -> str:
+    """Render objects of one kind as a kubectl-style table."""
+    now = now or datetime.now(timezone.utc)
+    headers, row_fn = SUMMARY_COLUMNS.get(kind, ([], None))
+    rows = [["NAME"] + headers + ["AGE"]]
+    for obj in items:
+        md = obj.get("metadata") or {}
+        extra: List[str] = row_fn(obj) if row_fn else []
+        rows.append([md.get("name", "")] + extra + [_age(md, now)])
+    return _table(rows)
+
+
+def _table(rows: List[List[str]]) -> str:
+    widths = [max(len(r[i]) for r in rows) for i in range(len(rows[0]))]
+    return "\n".join(
+        "   ".join(cell.ljust(w) for cell, w in zip(r, widths)).rstrip() for r in rows
+    )
+
+
+def summary_kind(data: Dict[str, Any]) -> str:
+    kind = data.get("kind") or ""
+    return kind[: -len("List")] if kind.endswith("List") else kind
+
+
+# -----------------------------
+# Event filtering and aggregation
+# -----------------------------
+def _event_last_seen(ev: Dict[str, Any]) -> Any:
+    return (
+        _get(ev, "series", "lastObservedTime")
+        or ev.get("lastTimestamp")
+        or ev.get("eventTime")
+        or _get(ev, "metadata", "creationTimestamp")
+    )
+
+
+def _event_first_seen(ev: Dict[str, Any]) -> Any:
+    return ev.get("firstTimestamp") or ev.get("eventTime") or _get(ev, "metadata", "creationTimestamp")
+
+
+def _ts_key(ts: Any) -> datetime:
+    return _parse_ts(ts) or datetime.min.replace(tzinfo=timezone.utc)
+
+
+def events_since(items: List[Dict[str, Any]], seconds: int, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """Events last seen within the past `seconds` (undated events are kept)."""
+    now = now or datetime.now(timezone.utc)
+    out = []
+    for ev in items:
+        seen = _parse_ts(_event_last_seen(ev))
+        if seen is None or (now - seen).total_seconds() <= seconds:
+            out.append(ev)
+    return out
+
+
+def aggregate_events(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Collapse events with the same type, reason, object and message into one
+    entry with the summed count and first/last seen, oldest first.
+    """
+    groups: Dict[tuple, Dict[str, Any]] = {}
+    for ev in items:
+        obj = ev.get("involvedObject") or {}
+        target = f"{(obj.get('kind') or '').lower()}/{obj['name']}" if obj.get("name") else ""
+        message = " ".join((ev.get("message") or "").split())
+        key = (ev.get("type") or "", ev.get("reason") or "", target, message)
+        count = _get(ev, "series", "count") or ev.get("count") or 1
+        first, last = _event_first_seen(ev), _event_last_seen(ev)
+
+        group = groups.get(key)
+        if group is None:
+            groups[key] = {
+                "type": key[0],
+                "reason": key[1],
+                "object": target,
+                "message": message,
+                "count": count,
+                "firstSeen": first,
+                "lastSeen": last,
+            }
+            continue
+        group["count"] += count
+        if first and (not group["firstSeen"] or _ts_key(first) < _ts_key(group["firstSeen"])):
+            group["firstSeen"] = first
+        if last and (not group["lastSeen"] or _ts_key(last) > _ts_key(group["lastSeen"])):
+            group["lastSeen"] = last
+
+    return sorted(groups.values(), key=lambda g: _ts_key(g["lastSeen"]))
+
+
+def summarize_event_groups(groups: List[Dict[str, Any]], now: Optional[datetime] = None) -> str:
+    """kubectl get events style table of aggregate_events() output."""
+    now = now or datetime.now(timezone.utc)
+    rows = [["LAST SEEN", "TYPE", "REASON", "OBJECT", "COUNT", "MESSAGE"]]
+    for g in groups:
+        rows.append([_since(g["lastSeen"], now), g["type"], g["reason"], g["object"], str(g["count"]), g["message"]])
+    return _table(rows)
@@ -0,0 +1,80 @@
+import heapq
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from constants import WORKLOAD_KINDS
+
+# -----------------------------
+# Workload -> pods
+# -----------------------------
+# Pods are found through ownerReferences, never through a caller-supplied
+# selector: the workload's own spec.selector only narrows the LIST, and
+# every pod is then checked to be owned by the workload (Deployments through
+# their ReplicaSets). The supported kinds are constants.WORKLOAD_KINDS.
+
+
+def label_selector(workload: Dict[str, Any]) -> Optional[str]:
+    """spec.selector of a workload as a labelSelector query string."""
+    sel = (workload.get("spec") or {}).get("selector") or {}
+    terms = [f"{k}={v}" for k, v in sorted((sel.get("matchLabels") or {}).items())]
+    for expr in sel.get("matchExpressions") or []:
+        key, op, values = expr.get("key"), expr.get("operator"), expr.get("values") or []
+        if op == "In":
+            terms.append(f"{key} in ({','.join(values)})")
+        elif op == "NotIn":
+            terms.append(f"{key} notin ({','.join(values)})")
+        elif op == "Exists":
+            terms.append(key)
+        elif op == "DoesNotExist":
+            terms.append(f"!{key}")
+    return ",".join(terms) or None
+
+
+def _uid(obj: Dict[str, Any]) -> Optional[str]:
+    return (obj.get("metadata") or {}).get("uid")
+
+
+def owned_by(objs: List[Dict[str, Any]], owner_uids: Set[str]) -> List[Dict[str, Any]]:
+    return [
+        o
+        for o in objs
+        if any(ref.get("uid") in owner_uids for ref in (o.get("metadata") or {}).get("ownerReferences") or [])
+    ]
+
+
+def owner_uids(workload: Dict[str, Any], replicasets: List[Dict[str, Any]]) -> Set[str]:
+    """UIDs that directly own the workload's pods."""
+    uid = _uid(workload)
+    if workload.get("kind") == "Deployment":
+        return {u for u in (_uid(rs) for rs in owned_by(replicasets, {uid})) if u}
+    return {uid} if uid else set()
+
+
+# -----------------------------
+# Time-ordered merge
+# -----------------------------
+def _sort_key(ts: str) -> str:
+    # RFC3339Nano drops trailing zeros from the fraction; pad it so the
+    # timestamps compare as strings
+    base, _, frac = ts.rstrip("Z").partition(".")
+    return f"{base}.{frac:0<9}"
+
+
+def _timestamped(prefix: str, lines: List[str]) -> Iterator[Tuple[str, str, str]]:
+    """(timestamp, prefix, message) for `timestamps=true` log lines."""
+    ts = ""
+    for line in lines:
+        head, sep, rest = line.partition(" ")
+        if sep and head[:1].isdigit() and head.endswith("Z"):
+            ts, line = _sort_key(head), rest
+        # Continuation lines (no timestamp of their own) sort with the previous one
+        yield ts, prefix, line
+
+
+def merge_logs(streams: List[Tuple[str, List[str]]], keep_timestamps: bool = False) -> Iterator[str]:
+    """
+    Merge per-container logs read with timestamps=true into one stream
+    ordered by time, each line prefixed with "[pod/<pod>/<container>]".
+    """
+    merged = heapq.merge(*(_timestamped(prefix, lines) for prefix, lines in streams), key=lambda e: e[0])
+    for ts, prefix, line in merged:
+        yield f"[{prefix}] {ts}Z {line}" if keep_timestamps and ts else f"[{prefix}] {line}"